@@ -0,0 +1,63 @@
+"""APIFitsAsync 构造开销的微基准：对比每次重新解析 api_list.json 与复用进程内注册表
+
+用法: PYTHONPATH=src python benchmarks/bench_api_registry.py [-n 2000]
+"""
+import argparse
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+from lazy.load_config import api_registry as registry_module
+from lazy.load_config import load_config
+from lazy.zjuAPI import zju_api
+
+API_LIST_PATH = Path(__file__).resolve().parent.parent / "data" / "api_list.json"
+
+def make_api_list_config()->load_config.apiListConfig:
+    config = load_config.apiListConfig()
+    config.config_path = API_LIST_PATH
+    return config
+
+API_FACTORIES = [
+    lambda: zju_api.coursePreviewAPIFits(None, 1),
+    lambda: zju_api.assignmentViewAPIFits(None, 1),
+    lambda: zju_api.resourcesListAPIFits(None, "keyword"),
+]
+
+def build_apis():
+    for factory in API_FACTORIES:
+        factory()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not API_LIST_PATH.exists():
+        sys.exit(f"{API_LIST_PATH} 不存在")
+
+    # 屏蔽每次加载配置时的日志输出，避免干扰计时
+    logging.disable(logging.CRITICAL)
+
+    def cold():
+        # 模拟旧实现：每次构造前都重新读取并解析 api_list.json
+        for factory in API_FACTORIES:
+            zju_api.api_registry._config_file = make_api_list_config()
+            zju_api.api_registry.reload()
+            factory()
+
+    zju_api.api_registry._config_file = make_api_list_config()
+    zju_api.api_registry.reload()
+
+    cold_time = timeit.timeit(cold, number=args.number)
+    warm_time = timeit.timeit(build_apis, number=args.number)
+    template_info = registry_module.compile_url_template.cache_info()
+
+    print(f"cold: {cold_time / args.number * 1e6:9.1f} us/iter")
+    print(f"warm: {warm_time / args.number * 1e6:9.1f} us/iter")
+    print(f"speedup: {cold_time / warm_time:.1f}x")
+    print(f"url template cache: {template_info}")
+
+if __name__ == "__main__":
+    main()
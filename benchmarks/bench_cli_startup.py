@@ -0,0 +1,72 @@
+"""CLI 冷启动基准：测量常用命令的启动耗时，并列出累计导入耗时最高的模块
+
+命令组按需导入后，`lazy --help` 不应再导入 keyring、httpx、lxml 等网络与解析依赖。
+
+用法: PYTHONPATH=src python benchmarks/bench_cli_startup.py [--repeat 5] [--top 10]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+COMMANDS = (
+    ("--help",),
+    ("course", "--help"),
+    ("course", "list", "--help"),
+    ("resource", "download", "--help"),
+)
+
+HEAVY_MODULES = ("keyring", "httpx", "lxml", "aiofiles", "lazy.login.login")
+
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def run_cli(args: tuple, importtime: bool = False)->subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "lazy", *args]
+    return subprocess.run(command, capture_output=True, text=True, env=os.environ.copy())
+
+def wall_time(args: tuple, repeat: int)->float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_cli(args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def top_level_imports(args: tuple)->list[tuple[int, str]]:
+    """返回各顶层导入的 (累计耗时us, 模块名)"""
+    imports = []
+    for line in run_cli(args, importtime=True).stderr.splitlines():
+        matched = IMPORTTIME_PATTERN.match(line)
+        if matched is None:
+            continue
+        _self_us, cumulative_us, indent, module = matched.groups()
+        if len(indent) == 1:
+            imports.append((int(cumulative_us), module))
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for command in COMMANDS:
+        label = " ".join(("lazy", *command))
+        imports = top_level_imports(command)
+        imported_names = {module for _cumulative_us, module in imports}
+        heavy = [module for module in HEAVY_MODULES if module in imported_names]
+
+        print(f"{label:<36} 最短耗时 {wall_time(command, args.repeat) * 1000:7.1f} ms")
+        print(f"  已导入的重型依赖: {', '.join(heavy) if heavy else '无'}")
+        for cumulative_us, module in sorted(imports, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
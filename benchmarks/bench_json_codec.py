@@ -0,0 +1,127 @@
+"""JSON 解码基准：比较各后端解码列表响应并转换为模型的耗时与峰值内存
+
+默认使用生成的课程、活动列表；--fixtures 可指定录制的响应目录，目录中可以是原始JSON文件，
+也可以是响应缓存条目（~/.lazy_cli_cache 下的文件），按其中包含的列表键选择对应的模型。
+
+用法: PYTHONPATH=src python benchmarks/bench_json_codec.py [--fixtures ~/.lazy_cli_cache] [--count 5000] [--repeat 5]
+"""
+import argparse
+import importlib.util
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench_models import make_activities_page, make_courses_page
+
+from lazy.load_config.json_codec import JsonCodec
+from lazy.zjuAPI.models import (
+    Activity,
+    Classroom,
+    Course,
+    Exam,
+    Module,
+    Rollcall,
+    Todo,
+    Upload,
+)
+
+# 列表键 -> 模型
+ITEMS_MODELS = {
+    "courses": Course,
+    "activities": Activity,
+    "exams": Exam,
+    "classrooms": Classroom,
+    "modules": Module,
+    "uploads": Upload,
+    "todo_list": Todo,
+    "rollcalls": Rollcall,
+}
+
+
+def load_fixtures(fixtures_dir: Path)->list[tuple[str, bytes, str]]:
+    """返回 (名称, 响应体, 列表键)"""
+    fixtures = []
+    for path in sorted(fixtures_dir.glob("*.json")):
+        try:
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            continue
+
+        name = path.stem[:12]
+        # 响应缓存条目
+        if isinstance(data, dict) and isinstance(data.get("body"), str) and "url" in data:
+            name = data["url"].split("?")[0].rsplit("/", 1)[-1] or name
+            body = data["body"].encode("utf-8")
+            try:
+                data = json.loads(body)
+            except ValueError:
+                continue
+        else:
+            body = path.read_bytes()
+
+        if not isinstance(data, dict):
+            continue
+
+        items_key = next((key for key in ITEMS_MODELS if isinstance(data.get(key), list) and data[key]), None)
+        if items_key is not None:
+            fixtures.append((name, body, items_key))
+
+    return fixtures
+
+def measure(codec: JsonCodec, body: bytes, items_key: str, with_schema: bool, repeat: int)->tuple[float, float]:
+    """返回 (最短耗时 ms, 峰值内存 MiB)"""
+    model = ITEMS_MODELS[items_key]
+    schema = model.page_schema(items_key) if with_schema else None
+
+    def decode():
+        return model.decode_list(codec.loads(body, schema).get(items_key))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    decode()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings) * 1000, peak / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.fixtures is not None:
+        fixtures = load_fixtures(args.fixtures.expanduser())
+        if not fixtures:
+            print(f"{args.fixtures} 中没有可用的列表响应")
+            return
+    else:
+        fixtures = [
+            ("courses", make_courses_page(args.count).encode("utf-8"), "courses"),
+            ("activities", make_activities_page(args.count).encode("utf-8"), "activities"),
+        ]
+
+    variants = [("json", False)]
+    for backend in ("orjson", "msgspec"):
+        if importlib.util.find_spec(backend) is not None:
+            variants.append((backend, False))
+    if importlib.util.find_spec("msgspec") is not None:
+        variants.append(("msgspec", True))
+
+    for name, body, items_key in fixtures:
+        print(f"{name} ({items_key}, {len(body) / 1024:.0f} KiB)")
+        for backend, with_schema in variants:
+            elapsed, peak = measure(JsonCodec(backend), body, items_key, with_schema, args.repeat)
+            label = f"{backend}+schema" if with_schema else backend
+            print(f"  {label:<16} {elapsed:8.2f} ms  峰值 {peak:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""登录基准：在模拟的统一身份认证服务上测量 ZjuAsyncClient.login 的耗时
+
+每个请求按 --latency 模拟网络往返延迟，登录页跳转链、获取公钥、提交表单与登录后的落地页各计一次往返。
+模拟的公钥接口在请求不带会话时新建会话，提交表单时会话与登录页不一致则登录失败。
+
+用法: PYTHONPATH=src python benchmarks/bench_login.py [--latency 0.05] [--repeat 5]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from lazy.login.login import ZjuAsyncClient
+
+COURSES_INDEX = "https://courses.zju.edu.cn/user/index"
+CAS_LOGIN = "https://zjuam.zju.edu.cn/cas/login"
+CAS_PUBKEY = "https://zjuam.zju.edu.cn/cas/v2/getPubKey"
+# 512 位模数，仅用于模拟
+MODULUS = "c5f6d2d1a3b8e4f7a9c0b1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b5"
+
+def make_transport(latency: float)->httpx.MockTransport:
+    async def handler(request: httpx.Request)->httpx.Response:
+        await asyncio.sleep(latency)
+        url = f"{request.url.scheme}://{request.url.host}{request.url.path}"
+
+        if url == COURSES_INDEX and "ticket" in request.url.params:
+            return httpx.Response(200, text='<html><title>学在浙大</title><span id="userId" value="114514"></span></html>')
+
+        if url == COURSES_INDEX:
+            return httpx.Response(302, headers={"Location": f"{CAS_LOGIN}?service={COURSES_INDEX}"})
+
+        if url == CAS_LOGIN and request.method == "GET":
+            return httpx.Response(200, text='<input name="execution" value="e1s1">', headers={"Set-Cookie": "JSESSIONID=login; Path=/cas"})
+
+        if url == CAS_PUBKEY:
+            headers = {"Set-Cookie": "JSESSIONID=pubkey; Path=/cas"} if "JSESSIONID" not in request.headers.get("cookie", "") else {}
+            return httpx.Response(200, json={"modulus": MODULUS, "exponent": "10001"}, headers=headers)
+
+        if url == CAS_LOGIN and request.method == "POST":
+            if "JSESSIONID=login" not in request.headers.get("cookie", ""):
+                return httpx.Response(200, text="<html>execution 已失效</html>")
+            return httpx.Response(302, headers={"Location": f"{COURSES_INDEX}?ticket=ST-1"})
+
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+async def measure(latency: float, repeat: int)->list[float]:
+    timings = []
+    for _ in range(repeat):
+        async with httpx.AsyncClient(transport=make_transport(latency)) as session:
+            client = ZjuAsyncClient(session=session)
+            start = time.perf_counter()
+            if not await client.login("3200000000", "password"):
+                raise RuntimeError("模拟登录失败")
+            timings.append(time.perf_counter() - start)
+
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = asyncio.run(measure(args.latency, args.repeat))
+    print(f"往返延迟 {args.latency * 1000:.0f} ms  登录耗时 最短 {min(timings) * 1000:.0f} ms  平均 {sum(timings) / len(timings) * 1000:.0f} ms  ({len(timings)} 次)")
+
+
+if __name__ == "__main__":
+    main()
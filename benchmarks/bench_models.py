@@ -0,0 +1,77 @@
+"""响应模型基准：比较保留原始响应与解码为 __slots__ 模型后的内存占用，以及解码耗时
+
+用法: PYTHONPATH=src python benchmarks/bench_models.py [--count 5000] [--repeat 5]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from lazy.zjuAPI.models import Activity, Course
+
+
+def make_courses_page(count: int)->str:
+    return json.dumps({"total": count, "pages": 1, "courses": [
+        {
+            "id": index,
+            "name": f"课程{index}",
+            "course_code": f"CODE{index:06d}",
+            "academic_year_id": 12,
+            "course_attributes": {"teaching_class_name": "周一第1-2节;周三第3-4节", "data": {"student_count": 120}},
+            "department": {"id": 3, "name": "数学科学学院"},
+            "instructors": [{"id": 100 + index, "name": "张三", "avatar_big_url": "https://example.invalid/a.png"}],
+            "academic_year": {"id": 12, "name": "2024-2025"},
+            "start_date": "2024-09-09",
+            "url": f"https://courses.zju.edu.cn/course/{index}"
+        } for index in range(count)
+    ]}, ensure_ascii=False)
+
+def make_activities_page(count: int)->str:
+    return json.dumps({"activities": [
+        {
+            "id": index,
+            "title": f"活动{index}",
+            "type": "homework",
+            "module_id": index % 16,
+            "completion_criterion_key": "submitted",
+            "start_time": "2024-09-09T00:00:00Z",
+            "end_time": "2024-12-31T15:59:59Z",
+            "is_started": True,
+            "is_closed": False,
+            "data": {"description": "<p>" + "说明" * 40 + "</p>"},
+            "uploads": [{"id": index * 10 + n, "name": f"附件{n}.pdf", "size": 1024 * n, "updated_at": "2024-09-09T00:00:00Z", "key": "x" * 32} for n in range(2)]
+        } for index in range(count)
+    ]}, ensure_ascii=False)
+
+def measure(label: str, payload: str, items_key: str, model, repeat: int):
+    # 内存：解析后保留原始条目 vs 解码后仅保留模型
+    tracemalloc.start()
+    raw_items = json.loads(payload)[items_key]
+    raw_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    models = model.decode_list(json.loads(payload)[items_key])
+    model_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.decode_list(raw_items)
+        timings.append(time.perf_counter() - start)
+
+    print(f"{label:<12} 条目 {len(models):>6}  原始 {raw_size / 1024 / 1024:7.2f} MiB  模型 {model_size / 1024 / 1024:7.2f} MiB  解码 {min(timings) * 1000:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    measure("courses", make_courses_page(args.count), "courses", Course, args.repeat)
+    measure("activities", make_activities_page(args.count), "activities", Activity, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""分段下载基准：从本地支持 Range 的测试服务器下载同一文件，对比不同分段数的耗时
+
+测试服务器对每个连接限速，以模拟单条 TCP 流的吞吐上限。
+
+用法: PYTHONPATH=src python benchmarks/bench_segmented_download.py [--size-mb 64] [--per-stream-mbps 16] [--segments 1 2 4 8]
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+from lazy.zjuAPI import zju_api
+
+WRITE_CHUNK_SIZE = 64 * 1024
+
+class RangeFileHandler(BaseHTTPRequestHandler):
+    """返回内存中的测试文件，支持单段 Range 请求并按连接限速"""
+    protocol_version = "HTTP/1.1"
+    payload: bytes = b""
+    bytes_per_second: float = 0
+
+    def do_GET(self):
+        start, end = 0, len(self.payload) - 1
+        status = 200
+        range_match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if range_match:
+            start = int(range_match.group(1))
+            end = int(range_match.group(2)) if range_match.group(2) else end
+            status = 206
+
+        body = memoryview(self.payload)[start:end + 1]
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Disposition", 'attachment; filename="lecture.mp4"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.payload)}")
+        self.end_headers()
+
+        started = time.perf_counter()
+        for offset in range(0, len(body), WRITE_CHUNK_SIZE):
+            try:
+                self.wfile.write(body[offset:offset + WRITE_CHUNK_SIZE])
+            except (BrokenPipeError, ConnectionResetError):
+                # 客户端提前关闭连接
+                self.close_connection = True
+                return
+            # 按连接限速
+            expected = (offset + WRITE_CHUNK_SIZE) / self.bytes_per_second
+            delay = expected - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+    def log_message(self, format, *args):
+        pass
+
+async def download(port: int, segments: int, output_path: Path)->tuple[bool, float]:
+    async with httpx.AsyncClient(timeout=None) as client:
+        downloader = zju_api.resourcesDownloadAPIFits(client, output_path=output_path, resource_id=1, segments=segments)
+        downloader.apis_name = ["download"]
+        downloader.apis_config = {"download": {"url": f"http://127.0.0.1:{port}/api/uploads/<placeholder>/blob", "method": "GET"}}
+
+        start = time.perf_counter()
+        success = await downloader.download()
+        return success, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--per-stream-mbps", type=float, default=16.0, help="每个连接的限速，单位 MB/s")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    RangeFileHandler.payload = bytes(range(256)) * (args.size_mb * 4096)
+    RangeFileHandler.bytes_per_second = args.per_stream_mbps * 1024**2
+    expected_digest = hashlib.sha256(RangeFileHandler.payload).hexdigest()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeFileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"file size: {args.size_mb} MB, per-stream limit: {args.per_stream_mbps} MB/s")
+    for segments in args.segments:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            success, elapsed = asyncio.run(download(server.server_port, segments, Path(tmp_dir)))
+            file_path = Path(tmp_dir) / "lecture.mp4"
+            verified = success and hashlib.sha256(file_path.read_bytes()).hexdigest() == expected_digest
+            print(f"segments={segments:<2d}  {elapsed:6.2f} s  {args.size_mb / elapsed:7.1f} MB/s  verified={verified}")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""上传内存占用基准：向本地的模拟上传服务器上传一个稀疏大文件，检查进程峰值内存
+
+用法: PYTHONPATH=src python benchmarks/bench_upload_memory.py [--size-gb 2] [--ceiling-mb 64]
+
+峰值内存增量超过上限时以非零状态码退出
+"""
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+from lazy.zjuAPI import zju_api
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+class StandInUploadHandler(BaseHTTPRequestHandler):
+    """模拟学在浙大的两段式上传：POST 申请上传地址，PUT 上传文件内容"""
+    received_bytes = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"upload_url": f"http://127.0.0.1:{self.server.server_port}/upload"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        remaining = int(self.headers["Content-Length"])
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            StandInUploadHandler.received_bytes += len(chunk)
+
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def peak_rss_mb()->float:
+    # Linux 下 ru_maxrss 的单位为 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def upload(file_path: Path, port: int)->tuple[bool, int]:
+    callbacks = 0
+
+    def on_progress(uploaded: int, total: int, filename: str):
+        nonlocal callbacks
+        callbacks += 1
+
+    async with httpx.AsyncClient(timeout=None) as client:
+        uploader = zju_api.resourceUploadAPIFits(client)
+        uploader.apis_name = ["upload"]
+        uploader.apis_config = {
+            "upload": {"url": f"http://127.0.0.1:{port}/api/uploads", "method": "POST", "data": {}}
+        }
+        success = await uploader.upload(file_path, on_progress)
+
+    return success, callbacks
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--ceiling-mb", type=float, default=64.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInUploadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "sparse.mp4"
+        file_size = int(args.size_gb * 1024**3)
+        with open(file_path, "wb") as f:
+            f.truncate(file_size)
+
+        baseline_mb = peak_rss_mb()
+        start = time.perf_counter()
+        success, callbacks = asyncio.run(upload(file_path, server.server_port))
+        elapsed = time.perf_counter() - start
+        growth_mb = peak_rss_mb() - baseline_mb
+
+    server.shutdown()
+
+    print(f"file size:        {file_size / 1024**2:.0f} MB")
+    print(f"uploaded:         {success}, server received {StandInUploadHandler.received_bytes / 1024**2:.0f} MB")
+    print(f"progress updates: {callbacks}")
+    print(f"elapsed:          {elapsed:.1f} s")
+    print(f"peak RSS growth:  {growth_mb:.1f} MB (ceiling {args.ceiling_mb:.0f} MB)")
+
+    if not success or growth_mb > args.ceiling_mb:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
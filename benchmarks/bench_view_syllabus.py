@@ -0,0 +1,100 @@
+"""view_syllabus -A 分组开销的合成基准：对比逐章节扫描与按 module_id 预分组
+
+章节数与活动数同比例放大，预分组的耗时应近似线性增长，逐章节扫描则近似平方增长。
+
+用法: PYTHONPATH=src python benchmarks/bench_view_syllabus.py [--scales 1 2 4 8]
+"""
+import argparse
+import timeit
+
+from lazy.CLI.command.course import courseContent
+
+
+def make_course(modules: int, items_per_module: int)->tuple:
+    activities, exams, classrooms, reads, homeworks = [], [], [], [], []
+    item_id = 0
+    for module_id in range(modules):
+        for _ in range(items_per_module):
+            item_id += 1
+            activities.append({"id": item_id, "module_id": module_id, "type": "homework" if item_id % 3 == 0 else "material"})
+            homeworks.append({"id": item_id, "status": "已交" if item_id % 2 else "未交"})
+        exams.append({"id": item_id, "module_id": module_id})
+        classrooms.append({"id": item_id, "module_id": module_id})
+        reads.append({"activity_id": item_id, "activity_type": "classroom_activity"})
+
+    return (
+        {"activities": activities},
+        {"exams": exams},
+        {"classrooms": classrooms},
+        {"activity_reads": reads},
+        {"homework_activities": homeworks},
+        {"exam_ids": [exam["id"] for exam in exams[::2]]}
+    )
+
+def legacy_syllabus(modules_id, raw_activities, raw_exams, raw_classrooms, raw_reads, raw_homeworks, raw_exam_ids):
+    """原先的实现：每个章节都重新扫描全部条目并重建完成状态列表"""
+    nodes = []
+    for module_id in modules_id:
+        course_activities = raw_activities.get("activities", [])
+        course_exams = raw_exams.get("exams", [])
+        course_classrooms = raw_classrooms.get("classrooms", [])
+        exams_completeness = raw_exam_ids.get("exam_ids", [])
+        activities_completeness = [activity.get("id") for activity in raw_homeworks.get("homework_activities", {}) if activity.get("status") == "已交"]
+        classrooms_completeness = [read for read in raw_reads.get("activity_reads") if read.get("activity_type") == "classroom_activity"]
+
+        activities_list = [activity for activity in course_activities if activity.get("module_id") == module_id]
+        exams_list = [exam for exam in course_exams if exam.get("module_id") == module_id]
+        classrooms_list = [classroom for classroom in course_classrooms if classroom.get("module_id") == module_id]
+
+        # 渲染阶段的完成状态查询
+        for activity in activities_list:
+            _ = activity.get("id") in activities_completeness
+        for exam in exams_list:
+            _ = exam.get("id") in exams_completeness
+        for classroom in classrooms_list:
+            _ = any(read.get("activity_id") == classroom.get("id") for read in classrooms_completeness)
+
+        nodes.append((activities_list, exams_list, classrooms_list))
+
+    return nodes
+
+def indexed_syllabus(modules_id, *raw_course):
+    course_content = courseContent(*raw_course)
+    nodes = []
+    for module_id in modules_id:
+        activities_list, exams_list, classrooms_list = course_content.module_items(module_id)
+
+        for activity in activities_list:
+            _ = activity.get("id") in course_content.activities_completeness
+        for exam in exams_list:
+            _ = exam.get("id") in course_content.exams_completeness
+        for classroom in classrooms_list:
+            _ = classroom.get("id") in course_content.classrooms_completeness
+
+        nodes.append((activities_list, exams_list, classrooms_list))
+
+    return nodes
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--base-modules", type=int, default=16)
+    parser.add_argument("--items-per-module", type=int, default=20)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'modules':>8} {'items':>8} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8}")
+    for scale in args.scales:
+        modules = args.base_modules * scale
+        raw_course = make_course(modules, args.items_per_module)
+        modules_id = list(range(modules))
+
+        assert legacy_syllabus(modules_id, *raw_course) == indexed_syllabus(modules_id, *raw_course)
+
+        legacy_time = timeit.timeit(lambda modules_id=modules_id, raw_course=raw_course: legacy_syllabus(modules_id, *raw_course), number=args.number) / args.number
+        indexed_time = timeit.timeit(lambda modules_id=modules_id, raw_course=raw_course: indexed_syllabus(modules_id, *raw_course), number=args.number) / args.number
+        items = modules * (args.items_per_module + 2)
+        print(f"{modules:>8} {items:>8} {legacy_time * 1e3:>10.2f} {indexed_time * 1e3:>11.2f} {legacy_time / indexed_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
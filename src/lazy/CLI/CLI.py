@@ -1,38 +1,69 @@
 import logging
 import sys
-from functools import partial
+import time
 from typing import Optional
 
-import keyring
 import typer
-from asyncer import syncify
-from lxml import etree
 from rich import print as rprint
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from typing_extensions import Annotated
 
-from ..login.login import CredentialManager, ZjuAsyncClient
-from .command import assignment, config, course, log, resource, rollcall
+from .lazy_group import LazyTyperGroup, lazy_syncify
 from .state import state
 
-KEYRING_SERVICE_NAME = "lazy"
 KEYRING_STUDENTID_NAME = "studentid"
 KEYRING_PASSWORD_NAME = "password"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
 
 logger = logging.getLogger(__name__)
 
+# --- 注册命令组 ---
+# 命令组在执行时才导入，httpx、keyring、lxml 等依赖不会拖慢 --help 与补全
+class lazyCommandGroup(LazyTyperGroup):
+    lazy_subcommands = {
+        # 课程命令组
+        "course": (f"{__package__}.command.course", "管理学在浙大课程信息与章节"),
+        # 资源命令组
+        "resource": (f"{__package__}.command.resource", "管理学在浙大云盘资源"),
+        # 任务命令组
+        "assignment": (f"{__package__}.command.assignment", "管理学在浙大活动任务"),
+        # 签到命令组
+        "rollcall": (f"{__package__}.command.rollcall", "处理学在浙大签到任务"),
+        # 配置命令组
+        "config": (f"{__package__}.command.config", "配置相关命令组"),
+        # 日志命令组
+        "log": (f"{__package__}.command.log", "日志相关命令组"),
+        # 后台进程命令组
+        "daemon": (f"{__package__}.command.daemon", "管理 LAZY CLI 常驻后台进程"),
+    }
+
 # 初始化主app对象
-app = typer.Typer(help="LAZY CLI - 学在浙大第三方客户端的命令行工具", no_args_is_help=True)
+app = typer.Typer(cls=lazyCommandGroup, help="LAZY CLI - 学在浙大第三方客户端的命令行工具", no_args_is_help=True)
 
 # --- 全局回调，检验登录状态 ---
 @app.callback()
-@partial(syncify, raise_sync_error=False)
+@lazy_syncify
 async def main_callback(
     ctx: typer.Context,
     no_proxy: Annotated[Optional[bool], typer.Option(
         "--no-proxy",
         help="启用此选项，禁用 lazy 使用系统代理"
+    )] = False,
+    no_cache: Annotated[Optional[bool], typer.Option(
+        "--no-cache",
+        help="启用此选项，不读取也不写入接口响应缓存"
+    )] = False,
+    refresh: Annotated[Optional[bool], typer.Option(
+        "--refresh",
+        help="启用此选项，忽略缓存有效期，向服务端重新验证"
+    )] = False,
+    offline: Annotated[Optional[bool], typer.Option(
+        "--offline",
+        help="启用此选项，不发起网络请求，仅使用缓存内容"
+    )] = False,
+    stale: Annotated[Optional[bool], typer.Option(
+        "--stale",
+        help="启用此选项，先显示缓存内容，再在前台联网刷新，刷新完成前命令不会退出"
     )] = False
 ):
 
@@ -40,11 +71,36 @@ async def main_callback(
     if "--help" in sys.argv or "-h" in sys.argv:
         return 
     
-    if ctx.invoked_subcommand in ["login", "whoami", "config"]:
+    if ctx.invoked_subcommand in ["login", "whoami", "config", "daemon"]:
         return
 
     state.trust_env = not no_proxy
 
+    from ..login.credential_broker import credential_broker
+    from ..login.login import (
+        CookiesSaveError,
+        CredentialManager,
+        session_manager,
+        session_validation_cache,
+    )
+    from ..zjuAPI.response_cache import response_cache
+
+    if offline and no_cache:
+        rprint("[red]--offline 与 --no-cache 不能同时使用！[/red]")
+        raise typer.Exit(code=1)
+
+    # 缓存按账号隔离
+    response_cache.configure(
+        enabled=not no_cache,
+        refresh=refresh,
+        offline=offline,
+        namespace=credential_broker.get(KEYRING_STUDENTID_NAME) or ""
+    )
+    state.stale_while_revalidate = bool(stale) and not no_cache
+
+    # 离线时不检查登录状态；先显示缓存时也跳过检查，会话失效由刷新请求触发自动重新登录
+    if offline or state.stale_while_revalidate:
+        return
     
     with Progress(
         SpinnerColumn(),
@@ -54,12 +110,34 @@ async def main_callback(
         task = progress.add_task(description="检查登录状态中...", total=2)
         
         # 如果会话存在且有效，则无需登录
-        cookies = CredentialManager().load_cookies()
-        async with ZjuAsyncClient(
+        cookie_jar = CredentialManager().load_cookie_jar()
+        cookies = cookie_jar.to_cookies() if cookie_jar is not None else None
+        # 登录Cookie带有过期时间时在本地判断会话是否有效，否则为 None
+        remaining = session_manager.cookie_remaining(cookie_jar) if cookie_jar is not None else None
+
+        if cookies and remaining is not None and remaining > 0:
+            # 临近过期时在后台提前重新登录，命令照常使用当前的Cookies
+            if remaining < session_manager.get_setting("refresh_ahead"):
+                logger.info(f"登录Cookie将在 {remaining:.0f} 秒后过期，在后台提前刷新会话")
+                session_manager.schedule_refresh(state.trust_env)
+            else:
+                logger.info(f"登录Cookie在有效期内（剩余 {remaining:.0f} 秒），跳过登录状态检查")
+            progress.update(task, description="登录有效", completed=2)
+            return
+
+        # 会话在有效期内验证过时跳过探测，失效由后续请求触发自动重新登录
+        if cookies and remaining is None and session_validation_cache.is_fresh(session_manager.get_setting("validation_ttl")):
+            logger.info("会话验证缓存有效，跳过登录状态检查")
+            progress.update(task, description="登录有效", completed=2)
+            return
+
+        async with session_manager.client(
             cookies=cookies,
             trust_env=state.trust_env
         ) as client:
-            if cookies and await client.is_valid_session():
+            # 登录Cookie已过期时无需探测
+            if cookies and remaining is None and await client.is_valid_session():
+                session_validation_cache.mark_valid()
                 progress.update(task, description="登录有效", completed=2)
                 return 
 
@@ -68,8 +146,8 @@ async def main_callback(
 
             progress.update(task, description="会话失效！重新登录中...")
             
-            studentid = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_STUDENTID_NAME)
-            password = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_PASSWORD_NAME)
+            studentid = credential_broker.get(KEYRING_STUDENTID_NAME)
+            password = credential_broker.get(KEYRING_PASSWORD_NAME)
             
             if not studentid or not password:
                 logger.error("未能找到登录凭据！")
@@ -77,13 +155,17 @@ async def main_callback(
                 progress.advance(task)
                 raise typer.Exit(code=1)
             
-            if await client.login(studentid, password):
-                if CredentialManager().save_cookies(dict(client.session.cookies)):
-                    progress.advance(task)
-                else:
-                    rprint("Cookies保存失败！")
-                    logger.error("Cookies保存失败！")
-                    raise typer.Exit(code=1)
+            # 其他进程同时在重新登录时等待其完成并使用它保存的Cookies
+            relogin_start = time.perf_counter()
+            try:
+                logged_in = await session_manager.login(client, studentid, password)
+            except CookiesSaveError:
+                rprint("Cookies保存失败！")
+                logger.error("Cookies保存失败！")
+                raise typer.Exit(code=1) from None
+            logger.info(f"会话失效后重新登录耗时 {time.perf_counter() - relogin_start:.2f} 秒")
+            if logged_in:
+                progress.advance(task)
             else:
                 rprint("[red]登录失败！[/red]请运行'login'命令尝试手动登录。")
                 progress.advance(task)
@@ -91,15 +173,17 @@ async def main_callback(
 
 # --- 开发者检查测试 ---
 @app.command()
-@partial(syncify, raise_sync_error=False)
+@lazy_syncify
 async def check(
     url: Annotated[str, typer.Argument()]
 ):
     """
     开发者网址测试检查工具，检验网页返回。
     """
+    from ..login.login import CredentialManager, session_manager
+
     cookies = CredentialManager().load_cookies()
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as temp_client:
+    async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as temp_client:
         try:
             response = await temp_client.session.get(url)
             response.raise_for_status()
@@ -111,10 +195,13 @@ async def check(
 
 # --- 手动登录 --- 
 @app.command()
-@partial(syncify, raise_sync_error=False)
+@lazy_syncify
 async def login():
     """引导手动登录并自动更新登录凭据和本地会话。
     """    
+    from ..login.credential_broker import credential_broker
+    from ..login.login import CookiesSaveError, session_manager
+
     studentid = typer.prompt("请输入学号")
     password = typer.prompt("请输入密码", hide_input=True)
 
@@ -127,32 +214,31 @@ async def login():
         TextColumn("[progress.description]{task.description}"),
         transient=True
     ) as progress:
-        async with ZjuAsyncClient(trust_env=state.trust_env) as client:
+        async with session_manager.client(trust_env=state.trust_env) as client:
             task = progress.add_task(description="登录中...", total=1)
 
-            if await client.login(studentid, password):
-                if CredentialManager().save_cookies(dict(client.session.cookies)):
-                    keyring.set_password(KEYRING_SERVICE_NAME, KEYRING_STUDENTID_NAME, studentid)
-                    keyring.set_password(KEYRING_SERVICE_NAME, KEYRING_PASSWORD_NAME, password)
-                    logger.info("已更新凭据与本地会话")
-                    progress.advance(task)
-                    rprint("[green]登录成功！[/green]")
-                else:
-                    rprint("Cookies保存失败！")
-                    logger.error("Cookies保存失败！")
-                    raise typer.Exit(code=1)
-                
-                # 更新学在浙大studentid
-                response = await client.session.get(url="https://courses.zju.edu.cn/user/index")
-                html = etree.HTML(response.text)
-                laz_studentid = html.xpath(r'//span[@id="userId"]/@value')
+            # 手动登录的凭据可能已经变化，不使用其他进程保存的Cookies
+            try:
+                logged_in = await session_manager.login(client, studentid, password, force=True)
+            except CookiesSaveError:
+                rprint("Cookies保存失败！")
+                logger.error("Cookies保存失败！")
+                raise typer.Exit(code=1) from None
 
-                if not laz_studentid:
+            if logged_in:
+                credential_broker.set(KEYRING_STUDENTID_NAME, studentid)
+                credential_broker.set(KEYRING_PASSWORD_NAME, password)
+                logger.info("已更新凭据与本地会话")
+                progress.advance(task)
+                rprint("[green]登录成功！[/green]")
+                
+                # 更新学在浙大studentid，登录时已从落地页中获取
+                if not client.laz_studentid:
                     logger.error("学在浙大ID获取失败！")
                     rprint("[red]学在浙大ID获取失败，请将此问题上报给开发者！[/red]")
                     raise typer.Exit(code=1)
                 
-                keyring.set_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME, laz_studentid[0])
+                credential_broker.set(KEYRING_LAZ_STUDENTID_NAME, client.laz_studentid)
             else:
                 rprint("登录失败，请检查你的学号与密码是否正确。")
                 raise typer.Exit(code=1)
@@ -163,10 +249,12 @@ def whoami():
     """
     Who am I ?
     """
+    from ..login.credential_broker import credential_broker
+
     authorization_password = typer.prompt("请输入密码", hide_input=True)
     
-    if authorization_password == keyring.get_password("lazy", "password"):
-        rprint(f"{keyring.get_password('lazy', 'studentid')}")
+    if authorization_password == credential_broker.get(KEYRING_PASSWORD_NAME):
+        rprint(f"{credential_broker.get(KEYRING_STUDENTID_NAME)}")
         return 
     
     rprint("[red]密码错误[/red]")
@@ -183,22 +271,3 @@ def easter_egg(ctx: typer.Context):
 
     if ctx.command.name == "hachimi":
         print("哈基米哦南北绿豆~")
-
-# --- 注册命令组 ---
-# 课程命令组
-app.add_typer(course.app, name="course", help="管理学在浙大课程信息与章节")
-
-# 资源命令组
-app.add_typer(resource.app, name="resource", help="管理学在浙大云盘资源")
-
-# 任务命令组
-app.add_typer(assignment.app, name="assignment", help="管理学在浙大活动任务")
-
-# 签到命令组
-app.add_typer(rollcall.app, name="rollcall", help="处理学在浙大签到任务")
-
-# 配置命令组
-app.add_typer(config.app, name="config", help="配置相关命令组")
-
-# 日志命令组
-app.add_typer(log.app, name="log", help="日志相关命令组")
\ No newline at end of file
@@ -0,0 +1,79 @@
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+import typer
+from rich import print as rprint
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from ..zjuAPI.response_cache import response_cache
+from .state import state
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+def format_age(seconds: float)->str:
+    if seconds < 60:
+        return f"{int(seconds)} 秒"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} 分钟"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} 小时"
+    return f"{int(seconds // 86400)} 天"
+
+async def render_cached_first(fetch: Callable[[], Awaitable[T]], render: Callable[[T], None], description: str = "获取数据中..."):
+    """按缓存模式获取数据并渲染
+
+    - 默认：联网获取后渲染
+    - 离线模式 (--offline)：只使用缓存渲染，并标注数据的存在时长
+    - 先显示缓存再刷新 (--stale)：立即以缓存渲染，随后联网刷新，数据发生变化时才重新渲染。
+      刷新在前台进行，命令要等刷新完成后才退出，只是无需等待网络即可先看到内容
+
+    Parameters
+    ----------
+    fetch : Callable[[], Awaitable[T]]
+        获取数据的协程函数，会在只读缓存与联网两种模式下各调用一次
+    render : Callable[[T], None]
+        渲染数据的函数
+    description : str, optional
+        联网获取数据时显示的提示, by default "获取数据中..."
+    """
+    cached_data = None
+
+    if response_cache.offline or state.stale_while_revalidate:
+        with response_cache.cache_only() as scope:
+            cached_data = await fetch()
+
+        if response_cache.offline:
+            if not scope.served:
+                rprint("[red]离线模式下没有可用的缓存数据！[/red]")
+                raise typer.Exit(code=1)
+
+            missing_text = "，部分内容缺失" if scope.missing else ""
+            rprint(f"[dim]离线模式，以下为 {format_age(scope.age)} 前的缓存数据{missing_text}[/dim]")
+            render(cached_data)
+            return
+
+        # 缓存不完整时直接联网获取
+        if scope.served and not scope.missing:
+            rprint(f"[dim]以下为 {format_age(scope.age)} 前的缓存数据，正在刷新...[/dim]")
+            render(cached_data)
+        else:
+            cached_data = None
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True
+    ) as progress:
+        progress.add_task(description=description, total=None)
+        data = await fetch()
+
+    if cached_data is not None:
+        if data == cached_data:
+            logger.info("刷新完成，数据没有变化")
+            return
+
+        rprint("[yellow]数据已更新：[/yellow]")
+
+    render(data)
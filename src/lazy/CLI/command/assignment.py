@@ -1,13 +1,10 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
-from functools import partial
 from textwrap import dedent
 from typing import List, Optional, Tuple
 
-import keyring
 import typer
-from asyncer import syncify
 from lxml import html
 from lxml.html import HtmlElement
 from rich import filesize
@@ -22,11 +19,14 @@ from rich.table import Table
 from rich.text import Text
 from typing_extensions import Annotated
 
-from ...login.login import CredentialManager, ZjuAsyncClient
+from ...login.credential_broker import credential_broker
+from ...login.login import CredentialManager, session_manager
 from ...zjuAPI import zju_api
+from ...zjuAPI.models import Todo
+from ...zjuAPI.response_cache import response_cache
+from ..cached_render import render_cached_first
 from ..state import state
 
-KEYRING_SERVICE_NAME = "lazy"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
 
 # assignment 命令组
@@ -192,7 +192,7 @@ async def guess_assignment_type(assignment_id: int)->Tuple[bool, bool, bool]:
             raise typer.Exit(code=1)
         task = progress.add_task(description="正在猜测任务类型...",total=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             raw_activity, raw_exam, raw_classroom = await asyncio.gather(*[
                 zju_api.assignmentViewAPIFits(client.session, assignment_id).get_api_data(),
                 zju_api.assignmentExamViewAPIFits(client.session, assignment_id, apis_name=["exam"]).get_api_data(),
@@ -232,7 +232,7 @@ async def view_exam(exam_id: int, type_map: dict, preview: bool):
             raise typer.Exit(code=1)
         
         # --- 请求阶段 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             raw_exam, raw_exam_submission_list, raw_exam_distribute = await zju_api.assignmentExamViewAPIFits(client.session, exam_id).get_api_data()
         
             if not raw_exam:
@@ -426,7 +426,7 @@ async def view_classroom(classroom_id: int, type_map: dict, preview: bool):
             raise typer.Exit(code=1)
         
         # --- 请求阶段 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             # 请求classroom与classroom submission数据
             classroom_message, raw_classroom_submissions_list, raw_classroom_subjects_result, raw_classroom_subjects = await zju_api.assignmentClassroomViewAPIFits(client.session, classroom_id).get_api_data()
 
@@ -569,12 +569,12 @@ async def view_activity(activity_id: int, type_map: dict):
             logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             # --- 请求阶段 ---
             # 请求预览数据
             # raw_activity_read: dict = (await zju_api.assignmentPreviewAPIFits(client.session, activity_id).post_api_data())[0]
             
-            student_id = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME)
+            student_id = credential_broker.get(KEYRING_LAZ_STUDENTID_NAME)
             
             if not student_id:
                 logger.error(f"{activity_id} 缺少'laz_studentid'参数，请将此问题上报给开发者！")
@@ -776,7 +776,7 @@ async def view_activity(activity_id: int, type_map: dict):
             (查看ID为'114514'的测试内容，并预览其测试题目)
     """),
     no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def view_assignment(
     assignment_id: Annotated[int, typer.Argument(help="任务id")],
     exam: Annotated[Optional[bool], typer.Option("--exam", "-e", help="启用此选项，将查询对应的考试")] = False,
@@ -824,6 +824,140 @@ async def view_assignment(
     rprint(f"任务 {assignment_id} 不存在！")
     return 
 
+def render_todo_list(raw_todo_list: dict, amount: int, page_index: int, reverse: bool, all: bool):
+    """按分页与排序条件渲染待办事项清单
+    """
+    type_map = {
+        "material": "资料",
+        "online_video": "视频",
+        "homework": "作业",
+        "questionnaire": "问卷",
+        "exam": "测试"
+    }
+    todo_panel_list = []
+
+    raw_todos = raw_todo_list.get("todo_list", [])
+    
+    if type(raw_todos) != list:
+        logger.error("todo_list存在错误，请将此日志上报给开发者！")
+        print("待办事项清单解析存在异常！")
+        raise typer.Exit(code=1)
+
+    todo_list: List[Todo] = Todo.decode_list(raw_todos)
+    
+    # 总任务数量
+    total = len(todo_list)
+    
+    if total == 0:
+        print("当前没有待办任务哦~")
+        return 
+    
+    if not all:
+        total_pages = int(total / amount) + 1
+        if page_index > total_pages:
+            print(f"页面索引超限！共 {total} 页，你都索引到第 {page_index} 页啦！")
+            raise typer.Exit(code=1)
+    else:
+        amount = total
+        page_index = 1
+        total_pages = 1
+
+    # 依照截止时间排序
+    todo_list = sorted(todo_list, key=lambda todo: datetime.fromisoformat(todo.end_time.replace('Z', '+00:00') if todo.end_time else "3000-01-01T00:00:00+00:00"), reverse=reverse)
+
+    start = amount * (page_index - 1)
+    todo_list = todo_list[start:]
+
+    for index, todo in enumerate(todo_list):
+        if index > amount - 1:
+            amount = index
+            break
+
+        title = todo.title or "null"
+        course_name = todo.course_name or "null"
+        course_id = todo.course_id or "null"
+        todo_id = todo.id or "null"
+        end_time = datetime.fromisoformat(todo.end_time.replace('Z', '+00:00')) if todo.end_time else None
+        todo_type = type_map.get(todo.type, todo.type or "null")
+
+        # 创建标题内容
+        title_text = Text.assemble(
+            (title, "bold bright_magenta"),
+            (" [ID: ", "bright_white"),
+            (f"{todo_id}", "green"),
+            ("]", "bright_white"),
+            "\n",
+            (f"{course_name} {course_id}", "dim")
+        )
+
+        # 创建时间描述文本
+        if end_time:
+            time_to_ddl = end_time - datetime.now(timezone.utc)
+            if time_to_ddl.days < 1:
+                remaining_time_text = f" ({time_to_ddl.seconds // 3600} 小时 {time_to_ddl.seconds % 3600 // 60} 分钟)"
+                style = "red"
+            elif time_to_ddl.days < 3:
+                remaining_time_text = f" ({time_to_ddl.days} 天 {time_to_ddl.seconds // 3600} 小时)"
+                style = "yellow"
+            elif time_to_ddl.days < 7:
+                remaining_time_text = f" ({time_to_ddl.days} 天 {time_to_ddl.seconds // 3600} 小时)"
+                style = "blue"
+            else:
+                remaining_time_text = f" ({time_to_ddl.days} 天)"
+                style = "green"
+        else:
+            remaining_time_text = "无截止日期"
+            style = "dim"
+            total_pages = 1
+
+        if end_time:
+            local_end_time = end_time.astimezone()
+
+            end_time_text = Text.assemble(
+                ("截止时间: ", "cyan"),
+                (local_end_time.strftime("%Y-%m-%d %H:%M:%S"), "bright_white"),
+                (remaining_time_text, style)
+            )
+        else: 
+            end_time_text = Text.assemble(
+                ("截止时间: ", "cyan"),
+                (remaining_time_text, style)
+            )
+
+        # 构建跳转链接文本
+        url_jump = make_jump_url(course_id, todo_id, todo.type or "null")
+        url_jump_text = Text.assemble(
+            ("跳转链接: ", "cyan"),
+            (url_jump, "bright_white")
+        )
+
+        # 组装panel
+        content_renderables = []
+        content_renderables.append(title_text)
+        content_renderables.append(end_time_text)
+        content_renderables.append(url_jump_text)
+
+        panel_title = f"[white][{todo_type}][/white]"
+        
+        panel_border_style = "bright_" + style if style != "dim" else "dim"
+
+        todo_panel = Panel(
+            Group(*content_renderables),
+            title=panel_title,
+            border_style=panel_border_style,
+            expand=True,
+            padding=(1, 2)
+        )
+
+        todo_panel_list.append(todo_panel)
+    else:
+        amount = index + 1
+
+
+    rprint(*todo_panel_list)
+
+    print(f"本页共 {amount} 个结果，第 {page_index}/{total_pages} 页")
+
 @app.command(
     "td",
     help="Alias for 'todo'",
@@ -852,7 +986,7 @@ async def view_assignment(
           $ lazy assignment todo -r       
             (反转排序顺序查看待办事项清单)
     """))
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def todo_assignment(
     amount: Annotated[Optional[int], typer.Option("--amount", "-a", help="显示待办任务数量", callback=is_todo_show_amount_valid)] = 10,
     page_index: Annotated[Optional[int], typer.Option("--page", "-p", help="待办任务页面索引")] = 1,
@@ -868,155 +1002,21 @@ async def todo_assignment(
     默认以任务截止时间作为排序依据，越早截止，排序越靠前，使用 -r 来反转任务清单排序结果。
     """
 
-    type_map = {
-        "material": "资料",
-        "online_video": "视频",
-        "homework": "作业",
-        "questionnaire": "问卷",
-        "exam": "测试"
-    }
-    todo_panel_list = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True
-    ) as progress:
-        
-        task = progress.add_task(description="获取待办事项信息中...", total=1)
-        
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            raw_todo_list: dict = (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
-        progress.advance(task, advance=1)
-
-        task = progress.add_task(description="加载内容中...", total=1)
-
-        todo_list: List[dict] = raw_todo_list.get("todo_list", [])
-        
-        if type(todo_list) != list:
-            logger.error("todo_list存在错误，请将此日志上报给开发者！")
-            print("待办事项清单解析存在异常！")
-            raise typer.Exit(code=1)
-        
-        # 总任务数量
-        total = len(todo_list)
-        
-        if total == 0:
-            print("当前没有待办任务哦~")
-            return 
-        
-        if not all:
-            total_pages = int(total / amount) + 1
-            if page_index > total_pages:
-                print(f"页面索引超限！共 {total} 页，你都索引到第 {page_index} 页啦！")
-                raise typer.Exit(code=1)
-        else:
-            amount = total
-            page_index = 1
-            total_pages = 1
-
-        # 依照截止时间排序
-        todo_list = sorted(todo_list, key=lambda todo: datetime.fromisoformat(todo.get("end_time").replace('Z', '+00:00') if todo.get("end_time") else "3000-01-01T00:00:00+00:00"), reverse=reverse)
-
-        start = amount * (page_index - 1)
-        todo_list = todo_list[start:]
-
-        for index, todo in enumerate(todo_list):
-            if index > amount - 1:
-                amount = index
-                break
-
-            title = todo.get("title", "null")
-            course_name = todo.get("course_name", "null")
-            course_id = todo.get("course_id", "null")
-            todo_id = todo.get("id", "null")
-            end_time = datetime.fromisoformat(todo.get("end_time").replace('Z', '+00:00')) if todo.get("end_time") else None
-            todo_type = type_map.get(todo.get("type", "null"), todo.get("type", "null"))
-
-            # 创建标题内容
-            title_text = Text.assemble(
-                (title, "bold bright_magenta"),
-                (" [ID: ", "bright_white"),
-                (f"{todo_id}", "green"),
-                ("]", "bright_white"),
-                "\n",
-                (f"{course_name} {course_id}", "dim")
-            )
-
-            # 创建时间描述文本
-            if end_time:
-                time_to_ddl = end_time - datetime.now(timezone.utc)
-                if time_to_ddl.days < 1:
-                    remaining_time_text = f" ({time_to_ddl.seconds // 3600} 小时 {time_to_ddl.seconds % 3600 // 60} 分钟)"
-                    style = "red"
-                elif time_to_ddl.days < 3:
-                    remaining_time_text = f" ({time_to_ddl.days} 天 {time_to_ddl.seconds // 3600} 小时)"
-                    style = "yellow"
-                elif time_to_ddl.days < 7:
-                    remaining_time_text = f" ({time_to_ddl.days} 天 {time_to_ddl.seconds // 3600} 小时)"
-                    style = "blue"
-                else:
-                    remaining_time_text = f" ({time_to_ddl.days} 天)"
-                    style = "green"
-            else:
-                remaining_time_text = "无截止日期"
-                style = "dim"
-                total_pages = 1
-
-            if end_time:
-                local_end_time = end_time.astimezone()
-
-                end_time_text = Text.assemble(
-                    ("截止时间: ", "cyan"),
-                    (local_end_time.strftime("%Y-%m-%d %H:%M:%S"), "bright_white"),
-                    (remaining_time_text, style)
-                )
-            else: 
-                end_time_text = Text.assemble(
-                    ("截止时间: ", "cyan"),
-                    (remaining_time_text, style)
-                )
-
-            # 构建跳转链接文本
-            url_jump = make_jump_url(course_id, todo_id, todo.get("type", "null"))
-            url_jump_text = Text.assemble(
-                ("跳转链接: ", "cyan"),
-                (url_jump, "bright_white")
-            )
-
-            # 组装panel
-            content_renderables = []
-            content_renderables.append(title_text)
-            content_renderables.append(end_time_text)
-            content_renderables.append(url_jump_text)
-
-            panel_title = f"[white][{todo_type}][/white]"
-            
-            panel_border_style = "bright_" + style if style != "dim" else "dim"
-
-            todo_panel = Panel(
-                Group(*content_renderables),
-                title=panel_title,
-                border_style=panel_border_style,
-                expand=True,
-                padding=(1, 2)
-            )
-
-            todo_panel_list.append(todo_panel)
-        else:
-            amount = index + 1
-
-        progress.advance(task, advance=1)
+    cookies = CredentialManager().load_cookies()
+    if not cookies and not response_cache.offline:
+        rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
 
-    rprint(*todo_panel_list)
+    async def fetch_todo_list()->dict:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            return (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
 
-    print(f"本页共 {amount} 个结果，第 {page_index}/{total_pages} 页")
+    await render_cached_first(
+        fetch_todo_list,
+        lambda raw_todo_list: render_todo_list(raw_todo_list, amount, page_index, reverse, all),
+        description="获取待办事项信息中..."
+    )
 
 @app.command(
     "sm",
@@ -1045,7 +1045,7 @@ async def todo_assignment(
             (向ID为'114514'的任务提交附件ID为'2333'和'6666'的作业)
     """),
     no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def submit_assignment(
     activity_id: Annotated[int, typer.Argument(help="待提交任务ID")],
     text: Annotated[Optional[str], typer.Option("--text", "-t", help="待提交的文本内容")] = "",
@@ -1068,7 +1068,7 @@ async def submit_assignment(
         logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
         if await zju_api.assignmentSubmitAPIFits(client.session, activity_id, text, files_id).submit():
             rprint("[green]提交成功！[/green]")
         else:
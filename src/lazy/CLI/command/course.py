@@ -1,29 +1,45 @@
+import asyncio
+import json
 import logging
+import os
+import re
+from collections import Counter
 from datetime import datetime
-from functools import partial
+from pathlib import Path
 from textwrap import dedent
-from typing import List, Optional, Tuple
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
 
-import keyring
 import typer
-from asyncer import syncify
 from rich import filesize
 from rich import print as rprint
 from rich.console import Group
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeRemainingColumn,
+)
 from rich.table import Table
 from rich.text import Text
 from rich.tree import Tree
 from typing_extensions import Annotated
 
-from ...login.login import CredentialManager, ZjuAsyncClient
+from ...login.credential_broker import credential_broker
+from ...login.login import CredentialManager, session_manager
 from ...zjuAPI import zju_api
+from ...zjuAPI.models import Activity, Classroom, Course, Exam, Module, Rollcall, Upload
+from ...zjuAPI.projection import FieldProjection
+from ...zjuAPI.response_cache import response_cache
+from ..cached_render import render_cached_first
 from ..state import state
+from .resource import HumanReadableTransferColumn
 
-KEYRING_SERVICE_NAME = "lazy"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
 
+T = TypeVar("T")
+
 # course 命令组
 app = typer.Typer(help="""
                         管理学在浙大课程信息与章节
@@ -117,21 +133,78 @@ def parse_indices(indices: str|None)->List[int]:
     # 去重，排序
     return sorted(list(set(result)))
 
-def extract_modules(modules: List[dict], indices: List[int], modules_id: List[int], last: bool)->List[Tuple[int, dict]]:
+def extract_modules(modules: List[Module], indices: List[int], modules_id: List[int], last: bool)->List[Tuple[int, Module]]:
     result = []
     
-    safe_indices = indices if indices is not None else []
-    safe_modules_id = modules_id if modules_id is not None else []
+    safe_indices = set(indices) if indices is not None else set()
+    safe_modules_id = set(modules_id) if modules_id is not None else set()
 
     for index, module in enumerate(modules):
-        if index in safe_indices or module.get("id") in safe_modules_id:
-            result.append((module.get("id"), module))
+        if index in safe_indices or module.id in safe_modules_id:
+            result.append((module.id, module))
 
-    if last and modules[-1] not in result:
-        result.append((modules[-1].get("id"), modules[-1]))
+    if last and modules and (modules[-1].id, modules[-1]) not in result:
+        result.append((modules[-1].id, modules[-1]))
 
     return result
 
+class courseContent:
+    """课程内容模型，将活动、测试与课堂任务按 module_id 一次性分组
+
+    完成状态以集合保存，渲染时的查询均为常数时间
+    """
+    def __init__(self,
+                 raw_activities: dict,
+                 raw_exams: dict,
+                 raw_classrooms: dict,
+                 raw_activities_reads: dict,
+                 raw_homework_completeness: dict,
+                 raw_exam_completeness: dict
+                 ):
+        self.activities: dict[int, List[Activity]] = group_by_module(Activity.decode_list(raw_activities.get("activities", [])))
+        self.exams: dict[int, List[Exam]]           = group_by_module(Exam.decode_list(raw_exams.get("exams", [])))
+        self.classrooms: dict[int, List[Classroom]] = group_by_module(Classroom.decode_list(raw_classrooms.get("classrooms", [])))
+
+        self.activities_completeness: set = {
+            homework_activity.get("id")
+            for homework_activity in raw_homework_completeness.get("homework_activities", [])
+            if homework_activity.get("status") == "已交"
+        }
+        self.exams_completeness: set = set(raw_exam_completeness.get("exam_ids", []))
+        self.classrooms_completeness: set = {
+            activity_read.get("activity_id")
+            for activity_read in raw_activities_reads.get("activity_reads", []) or []
+            if activity_read.get("activity_type") == "classroom_activity"
+        }
+
+    def module_items(self,
+                     module_id: int,
+                     with_activities: bool = True,
+                     with_exams: bool = True,
+                     with_classrooms: bool = True,
+                     only_homework: bool = False
+                     )->Tuple[List[Activity], List[Exam], List[Classroom]]:
+        """返回指定章节下的活动、测试与课堂任务，顺序与接口返回一致
+        """
+        activities_list: List[Activity] = []
+        if with_activities:
+            activities_list = [
+                activity for activity in self.activities.get(module_id, [])
+                if not only_homework or activity.type == "homework"
+            ]
+
+        exams_list: List[Exam] = list(self.exams.get(module_id, [])) if with_exams else []
+        classrooms_list: List[Classroom] = list(self.classrooms.get(module_id, [])) if with_classrooms else []
+
+        return activities_list, exams_list, classrooms_list
+
+def group_by_module(items: list)->dict[int, list]:
+    grouped: dict[int, list] = {}
+    for item in items:
+        grouped.setdefault(item.module_id, []).append(item)
+
+    return grouped
+
 # 注册课程列举命令
 @app.command(
         "ls",
@@ -164,7 +237,7 @@ def extract_modules(modules: List[dict], indices: List[int], modules_id: List[in
               $ lazy course list -p 2 -a 5  
                 (查看第 2 页，每页显示 5 个结果)
         """))
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def list_courses(
     keyword: Annotated[Optional[str], typer.Option("--name", "-n", help="课程搜索关键字")] = None,
     amount: Annotated[Optional[int], typer.Option("--amount", "-a", help="显示课程的数量")] = 10,
@@ -194,102 +267,454 @@ async def list_courses(
 
         task = progress.add_task(description="拉取课程信息中...", total=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            # 启用--all时先请求首页获取总数，再并发拉取剩余页面；否则仅请求指定页
             if all:
-                pre_results = (await zju_api.coursesListAPIFits(client.session, keyword, 1, 1).get_api_data())[0]
-                amount = pre_results.get("total", 0)
                 page_index = 1
+                pagination = {}
+            else:
+                pagination = {"page_size": amount, "start_page": page_index, "max_pages": 1}
+
+            courses_paginator = zju_api.apiPaginator(
+                lambda page, page_size: zju_api.coursesListAPIFits(client.session, keyword, page, page_size),
+                items_key="courses",
+                model=Course,
+                # quiet 模式只需要课程id
+                projection=FieldProjection("id", "courses") if quiet else Course.projection("courses"),
+                **pagination
+            )
+
+            results = await courses_paginator.first_page()
+
+            progress.advance(task, 1)
+            task = progress.add_task(description="渲染课程信息中...", total=1)
+
+            total_pages = 1 if all else results.get("pages", 0)
+            if page_index > total_pages and total_pages > 0:
+                print(f"页面索引超限！共 {total_pages} 页，你都索引到第 {page_index} 页啦！")
+                raise typer.Exit(code=1)
+
+            total_results_amount = results.get("total", 0)
+
+            # 如果搜索没有结果，则直接退出
+            if total_results_amount == 0:
+                print("啊呀！没有找到课程呢。")
+                return
+            
+            # quiet 模式仅打印课程id，并且不换行；各页到达后即输出
+            if quiet:
+                course_ids = [str(course.id or "") async for course in courses_paginator.items()]
+                print(" ".join(course_ids))
+                return 
+            
+            courses_list_table = Table(
+                title=f"课程列表 (第 {page_index} / {total_pages} 页)",
+                border_style="bright_black",
+                show_header=True,
+                header_style="bold magenta",
+                expand=True
+            )
+
+            # short模式仅显示课程ID与课程名称
+            if short:
+                courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=8)
+                courses_list_table.add_column("课程名称", style="bright_yellow", ratio=1)
+            else:
+                courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=6)
+                courses_list_table.add_column("课程名称", style="bright_yellow", ratio=6)
+                courses_list_table.add_column("授课教师", ratio=3)
+                courses_list_table.add_column("上课时间", ratio=3)
+                courses_list_table.add_column("开课院系", ratio=4)
+                courses_list_table.add_column("开课学年", style="white", width=9)
+
+            # 各页到达后即逐条加入表格，无需等待最后一页
+            shown_amount = 0
+            async for course in courses_paginator.items():
+                if shown_amount:
+                    courses_list_table.add_row()
+                shown_amount += 1
+
+                course_id = str(course.id or "N/A")
+                course_name = course.name or "N/A"
+
+                # short 模式仅按表单格式打印课程名与课程id
+                if short:
+                    courses_list_table.add_row(course_id, course_name)
+                    continue
+
+                course_time = course.teaching_class_name or "N/A"
+
+                course_time = ", ".join(course_time.split(";"))
+
+                teachers_name = ', '.join(course.instructors) or "N/A"
+
+                course_department_name = course.department_name or "N/A"
+
+                if len(course_department_name) > 10:
+                    if "与" in course_department_name:
+                        course_department_name = course_department_name.split("与")[0] + "与\n" + course_department_name.split("与")[1]
+                    else:
+                        course_department_name = course_department_name[:11] + "\n" + course_department_name[11:]
+                    
+                course_academic_year_name = course.academic_year_name or "N/A"
+                
+                courses_list_table.add_row(
+                    course_id,
+                    course_name,
+                    teachers_name,
+                    course_time,
+                    course_department_name,
+                    course_academic_year_name
+                )
 
-            results = (await zju_api.coursesListAPIFits(client.session, keyword, page_index, amount).get_api_data())[0]
+        courses_list_table.caption = f"共找到 {total_results_amount} 个结果，本页显示 {shown_amount} 个。"
+        if courses_paginator.failed_pages:
+            courses_list_table.caption += f"第 {', '.join(map(str, courses_paginator.failed_pages))} 页拉取失败。"
 
         progress.advance(task, 1)
-        task = progress.add_task(description="渲染课程信息中...", total=1)
 
-        total_pages = results.get("pages", 0)
-        if page_index > total_pages and total_pages > 0:
-            print(f"页面索引超限！共 {total_pages} 页，你都索引到第 {page_index} 页啦！")
-            raise typer.Exit(code=1)
+    rprint(courses_list_table)
 
-        courses_list = results.get("courses", [])
-        total_results_amount = results.get("total", 0)
+async def render_in_order(
+    fetches: List[Awaitable[T]],
+    render: Callable[[int, T], None],
+    on_complete: Callable[[int, int], None]|None = None
+):
+    """并发等待所有协程，并按列表顺序渲染结果
+
+    某个结果之前的结果都已渲染时立即渲染该结果，无需等待所有协程完成；
+    `on_complete`按完成顺序以 (索引, 已完成数量) 调用，可用于更新进度
+
+    Parameters
+    ----------
+    fetches : List[Awaitable[T]]
+        获取数据的协程
+    render : Callable[[int, T], None]
+        以 (索引, 结果) 渲染单个结果
+    on_complete : Callable[[int, int], None] | None, optional
+        单个协程完成时的回调, by default None
+    """
+    async def indexed(index: int, fetch: Awaitable[T])->tuple[int, T]:
+        return index, await fetch
+
+    tasks = [asyncio.ensure_future(indexed(index, fetch)) for index, fetch in enumerate(fetches)]
+    results: dict[int, T] = {}
+    next_index = 0
+    try:
+        for completed, finished in enumerate(asyncio.as_completed(tasks), start=1):
+            index, result = await finished
+            results[index] = result
+            if on_complete is not None:
+                on_complete(index, completed)
+
+            while next_index in results:
+                render(next_index, results.pop(next_index))
+                next_index += 1
+    finally:
+        for pending_task in tasks:
+            if not pending_task.done():
+                pending_task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def render_syllabus(
+    course_id: int,
+    raw_course_preview: list,
+    raw_course_view: list|None,
+    modules_id: List[int]|None,
+    indices,
+    last: bool,
+    all: bool,
+    only_activity: bool,
+    only_classroom: bool,
+    only_exam: bool,
+    only_homework: bool
+):
+    """渲染课程目录，`raw_course_view`为None时只显示折叠的章节列表
+    """
+    course_messages, raw_course_modules = raw_course_preview
+    course_name = course_messages.get("name", "null")
+    course_modules: List[Module] = Module.decode_list(raw_course_modules.get("modules", []))
 
-        # 如果搜索没有结果，则直接退出
-        if total_results_amount == 0:
-            print("啊呀！没有找到课程呢。")
-            return
+    if not course_modules:
+        rprint(f"课程{course_name} (ID: {course_id}) 无章节内容")
+        return
+    
+    if all:
+        indices = list(range(0, len(course_modules)))
+    
+    if modules_id or indices or last:
+        # --- 筛选目标modules ---
+        modules_list = extract_modules(course_modules, indices, modules_id, last)
+        course_modules_node_list: List[Tuple[Module, List[Activity], List[Exam], List[Classroom]]] = []
         
-        # quiet 模式仅打印课程id，并且不换行
-        if quiet:
-            course_ids = [str(course.get("id", "")) for course in courses_list]
-            print(" ".join(course_ids))
+        if not modules_list:
+            logger.error(f"{course_name}(ID: {course_id})中你要查询的章节不存在！")
+            rprint("未找到章节！")
             return 
-        
-        courses_list_table = Table(
-            title=f"课程列表 (第 {page_index} / {total_pages} 页)",
-            caption=f"共找到 {total_results_amount} 个结果，本页显示 {len(courses_list)} 个。",
-            border_style="bright_black",
-            show_header=True,
-            header_style="bold magenta",
-            expand=True
-        )
 
-        # short模式仅显示课程ID与课程名称
-        if short:
-            courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=8)
-            courses_list_table.add_column("课程名称", style="bright_yellow", ratio=1)
-        else:
-            courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=6)
-            courses_list_table.add_column("课程名称", style="bright_yellow", ratio=6)
-            courses_list_table.add_column("授课教师", ratio=3)
-            courses_list_table.add_column("上课时间", ratio=3)
-            courses_list_table.add_column("开课院系", ratio=4)
-            courses_list_table.add_column("开课学年", style="white", width=9)
-
-        # short 模式仅按表单格式打印课程名与课程id
-        for course in courses_list:
-            course_id = str(course.get("id", "N/A"))
-            course_name = course.get("name", "N/A")
+        raw_course_activities, raw_course_exams, raw_course_classrooms, raw_course_activities_reads, raw_homework_completeness, raw_exam_completeness = raw_course_view
 
-            if short:
-                courses_list_table.add_row(course_id, course_name)
+        # 一次遍历按 module_id 分组，避免对每个章节重复扫描全部活动
+        course_content = courseContent(raw_course_activities, raw_course_exams, raw_course_classrooms, raw_course_activities_reads, raw_homework_completeness, raw_exam_completeness)
+
+        for module_id, module in modules_list:
+            # 筛选目标activities, exams 和 classrooms
+            activities_list, exams_list, classrooms_list = course_content.module_items(
+                module_id,
+                with_activities = not (only_classroom or only_exam),
+                with_exams      = not (only_classroom or only_activity or only_homework),
+                with_classrooms = not (only_exam or only_activity or only_homework),
+                only_homework   = only_homework
+            )
+
+            if len(activities_list) == 0 and len(exams_list) == 0 and len(classrooms_list) == 0:
+                rprint(f"章节 {module_id} 无内容")
                 continue
+            
+            course_modules_node_list.append((module, activities_list, exams_list, classrooms_list))
+
+        if not course_modules_node_list:
+            return
+    else:
+        modules_list = course_modules
+
+    # 装填树状图
+    course_tree = Tree(f"[bold yellow]{course_name}[/bold yellow][dim] 课程ID: {course_id}[/dim]")
+    
+    if modules_id or indices or last:
+        # _index is unused, thus named with a prefix "_"
+        for _index, (module, activities_list, exams_list, classrooms_list) in enumerate(course_modules_node_list):
+            module_name = module.name or "null"
+            module_tree = course_tree.add(f"[green]{module_name}[/green][dim] 章节ID: {module.id or 'null'}[/dim]")
+            type_map = {
+                "material": "资料",
+                "online_video": "视频",
+                "homework": "作业",
+                "questionnaire": "问卷",
+                "exam": "测试",
+                "page": "页面",
+                "classroom": "课堂任务"
+            }
+
+            # --- 加载活动内容 ---
+            for activity in activities_list:
+                # 标题、类型与ID
+                activity_title = activity.title or "null"
+                activity_type = type_map.get(activity.type, activity.type or "null")
+                activity_id = activity.id or "null"
+                activity_completion_criterion_key = activity.completion_criterion_key or "none"
+                completion_status = activity_id in course_content.activities_completeness
+                # 活动的start_time和end_time都可能是null值，必须多做一次判断
+                # is_started 和 is_closed 来判断活动是否开始或者截止
+                # 开放日期
+                activity_start_time = transform_time(activity.start_time)
+                
+                activity_is_started: bool = activity.is_started
+                
+                # 截止日期
+                activity_end_time = transform_time(activity.end_time)
 
-            course_attributes = course.get("course_attributes")
-            course_time = course_attributes.get("teaching_class_name", "N/A") if course_attributes.get("teaching_class_name", "N/A") else "N/A"
+                activity_is_closed: bool = activity.is_closed
 
-            course_time = ", ".join(course_time.split(";"))
+                # 创建状态描述文本和截止时间富文本
+                status_text = get_status_text(activity_is_started, activity_is_closed)
+                start_time_text = Text.assemble(
+                    ("开放时间: ", "cyan"),
+                    (activity_start_time, "bright_white")
+                )
+                end_time_text = Text.assemble(
+                    ("截止时间: ", "cyan"),
+                    (activity_end_time, "bright_white")
+                )
+                # 跳转链接
+                url_jump = make_jump_url(course_id, activity_id, activity.type or "null")
+                url_jump_text = Text.assemble(
+                    ("跳转链接: ", "cyan"),
+                    (url_jump, "bright_white")
+                )
 
-            teachers = course.get("instructors", [])
-            teachers_name = ', '.join([t.get("name", "") for t in teachers]) or "N/A"
+                # 任务完成状态
+                completion_text = get_completion_text(completion_status, activity_completion_criterion_key)
+
+                # --- 准备Panel内容 ---
+                content_renderables = []
+                title_line = Text.assemble(
+                    (f"{activity_title}", "bold bright_magenta"),
+                    (" [ID: ", "bright_white"),
+                    (f"{activity_id}", "green"),
+                    ("]", "bright_white"),
+                    "\n",
+                    completion_text,
+                    status_text
+                )
+                content_renderables.append(title_line)
+                content_renderables.append(start_time_text)
+                content_renderables.append(end_time_text)
+                if url_jump:
+                    content_renderables.append(url_jump_text)
 
-            department = course.get("department")
-            course_department_name = department.get("name", "N/A") if department else "N/A"
+                # 附件
+                activity_uploads: List[Upload] = activity.uploads
+                if activity_uploads:
+                    content_renderables.append("[cyan]附件: [/cyan]")
+
+                for upload in activity_uploads:
+                    file_name = upload.name or "null"
+                    file_id = upload.id or "null"
+                    file_size = filesize.decimal(upload.size or 0)
+
+                    upload_table = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
+                    upload_table.add_column("Name", no_wrap=True)
+                    upload_table.add_column("Info", justify="right")
+
+                    upload_table.add_row(
+                        f"{file_name}",
+                        f"大小: {file_size} | 文件ID: {file_id}"
+                    )
+                    
+                    content_renderables.append(upload_table)
+
+                if activity_type == "作业":
+                    panel_title = f"[cyan][{activity_type}][/cyan]"
 
-            if len(course_department_name) > 10:
-                if "与" in course_department_name:
-                    course_department_name = course_department_name.split("与")[0] + "与\n" + course_department_name.split("与")[1]
                 else:
-                    course_department_name = course_department_name[:11] + "\n" + course_department_name[11:]
+                    panel_title = f"[white][{activity_type}][/white]"
+
+                activity_panel = Panel(
+                    Group(*content_renderables),
+                    title=panel_title,
+                    border_style="bright_cyan" if activity_type == "作业" else "bright_black",
+                    expand=True,
+                    padding=(1, 2)
+                )
+
+                module_tree.add(activity_panel)
+
+            # --- 加载测试内容 ---
+            for exam in exams_list:
+                exam_title = exam.title or "null"
+                exam_type = type_map.get(exam.type, exam.type or "null")
+                exam_id = exam.id or "null"
+                exam_completion_criterion_key = exam.completion_criterion_key or "none"
+                completion_status = exam_id in course_content.exams_completeness
+
+                # 理由同上
+                # 开放日期
+                exam_start_time = transform_time(exam.start_time)
+                exam_is_started: bool = exam.is_started
                 
+                # 截止日期
+                exam_end_time = transform_time(exam.end_time)
 
-            academic_year = course.get("academic_year")
-            course_academic_year_name = academic_year.get("name", "N/A") if academic_year else "N/A"
-            
-            courses_list_table.add_row(
-                course_id,
-                course_name,
-                teachers_name,
-                course_time,
-                course_department_name,
-                course_academic_year_name
-            )
-            
-            if course != courses_list[-1]:
-                courses_list_table.add_row()
+                exam_is_closed: bool = exam.is_closed
 
-        progress.advance(task, 1)
+                # 创建状态描述文本和截止时间富文本
+                status_text = get_status_text(exam_is_started, exam_is_closed)
+                start_time_text = Text.assemble(
+                    ("开放时间: ", "cyan"),
+                    (exam_start_time, "bright_white")
+                )
+                end_time_text = Text.assemble(
+                    ("截止时间: ", "cyan"),
+                    (exam_end_time, "bright_white")
+                )
+                url_jump = make_jump_url(course_id, exam_id, exam.type or "null")
+                url_jump_text = Text.assemble(
+                    ("跳转链接: ", "cyan"),
+                    (url_jump, "bright_white")
+                )
 
-    rprint(courses_list_table)
+                completion_text = get_completion_text(completion_status, exam_completion_criterion_key)
+
+                # --- 准备Panel内容 ---
+                content_renderables = []
+                title_line = Text.assemble(
+                    (f"{exam_title}", "bold bright_magenta"),
+                    (" [ID: ", "bright_white"),
+                    (f"{exam_id}", "green"),
+                    ("]", "bright_white"),
+                    "\n",
+                    completion_text,
+                    status_text
+                )
+                content_renderables.append(title_line)
+                content_renderables.append(start_time_text)
+                content_renderables.append(end_time_text)
+                content_renderables.append(url_jump_text)
+
+                panel_title = f"[yellow][{exam_type}][/yellow]"
+
+                activity_panel = Panel(
+                    Group(*content_renderables),
+                    title=panel_title,
+                    border_style="bright_yellow",
+                    expand=True,
+                    padding=(1, 2)
+                )
+
+                module_tree.add(activity_panel)
+
+            # --- 加载课堂任务内容 ---
+            for classroom in classrooms_list:
+                classroom_title = classroom.title or "null"
+                classroom_type = type_map.get(classroom.type, classroom.type or "null")
+                classroom_id = classroom.id or "null"
+                classroom_status = classroom.status
+                
+                classroom_completeness_status = "full" if classroom_id in course_content.classrooms_completeness else ""
+
+                classroom_start_time: str = transform_time(classroom.start_at)
+
+                classroom_status_text = get_classroom_status_text(classroom_status)
+                classroom_completeness_status_text = get_classroom_completion_text(classroom_completeness_status)
+                start_time_text = Text.assemble(
+                    ("开放时间: ", "cyan"),
+                    (classroom_start_time, "bright_white")
+                )
+
+                prompt_text = Text("请在移动端上完成！", "red")
+                
+                # --- 准备Panel内容 ---
+                content_renderables = []
+                title_line = Text.assemble(
+                    (f"{classroom_title}", "bold bright_magenta"),
+                    (" [ID: ", "bright_white"),
+                    (f"{classroom_id}", "green"),
+                    ("]", "bright_white"),
+                    "\n",
+                    classroom_completeness_status_text,
+                    classroom_status_text
+                )
+                content_renderables.append(title_line)
+                content_renderables.append(start_time_text)
+                content_renderables.append("")
+                content_renderables.append(prompt_text)
+
+                panel_title = f"[yellow][{classroom_type}][/yellow]"
+
+                classroom_panel = Panel(
+                    Group(*content_renderables),
+                    title=panel_title,
+                    border_style="bright_green",
+                    expand=True,
+                    padding=(1, 2)
+                )
+
+                module_tree.add(classroom_panel)
+    else:
+        for index, module in enumerate(modules_list):
+            module_name = module.name or "null"
+            module_id = module.id or "null"
+
+            # 微型表格，装填！ ---- from gemini 2.5pro
+            course_tree_node = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
+            course_tree_node.add_column("Name", no_wrap=True, style="green")
+            course_tree_node.add_column("ID", justify="right", style="bright_white")
+            course_tree_node.add_row(f"[magenta]{index + 1}[/magenta] {module_name}", f"章节ID: {module_id}")
+
+            course_tree.add(course_tree_node)
+
+    rprint(course_tree)
 
 # 注册课程查看命令
 @view_app.command(
@@ -310,6 +735,12 @@ async def list_courses(
                 
               $ lazy course view syllabus 114514 --last
                 (查看ID为"114514"课程的最新章节内容)
+
+              $ lazy course view syllabus 114514 1919810 --last
+                (同时查看两门课程的最新章节内容)
+
+              $ lazy course view syllabus --all-my-courses --last
+                (查看所有课程的最新章节内容)
         """),
         no_args_is_help=True)
 @view_app.command(
@@ -329,11 +760,17 @@ async def list_courses(
                 
               $ lazy course view syllabus 114514 --last
                 (查看ID为"114514"课程的最新章节内容)
+
+              $ lazy course view syllabus 114514 1919810 --last
+                (同时查看两门课程的最新章节内容)
+
+              $ lazy course view syllabus --all-my-courses --last
+                (查看所有课程的最新章节内容)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def view_syllabus(
-    course_id: Annotated[int, typer.Argument(help="课程id")],
+    course_ids: Annotated[Optional[List[int]], typer.Argument(help="课程id，可以指定多个")] = None,
     modules_id: Annotated[Optional[List[int]], typer.Option("--module", "-m", help="章节id")] = None,
     last: Annotated[Optional[bool], typer.Option("--last", "-l", help="启用此选项，自动展示最新一章节")] = False,
     indices: Annotated[Optional[str], typer.Option("--index", "-i", help="通过索引号查看章节，索引从'1'开始，支持使用范围表示，如'1-5'。", callback=parse_indices)] = "",
@@ -341,347 +778,94 @@ async def view_syllabus(
     only_activity: Annotated[Optional[bool], typer.Option("--activity", "-a", help="启用此选项，只展示活动内容")] = False,
     only_classroom: Annotated[Optional[bool], typer.Option("--classroom", "-c", help="启用此选项，只展示课堂任务")] = False,
     only_exam: Annotated[Optional[bool], typer.Option("--exam", "-e", help="启用此选项，只展示测试内容")] = False,
-    only_homework: Annotated[Optional[bool], typer.Option("--homework", "-H", help="启用此选项，只展示作业")] = False
+    only_homework: Annotated[Optional[bool], typer.Option("--homework", "-H", help="启用此选项，只展示作业")] = False,
+    all_my_courses: Annotated[Optional[bool], typer.Option("--all-my-courses", help="启用此选项，查看所有进行中与未开始课程的目录")] = False
 ):
     """
     浏览指定课程的目录，并按条件进行筛选。
     
     默认对章节进行折叠，你可以通过 -m 或 -i 来展开指定的章节。
     或者使用 -A 来展开所有章节，并通过 -a, -c, -e 与 -H 进行筛选。
+    可以同时指定多个课程，或使用 --all-my-courses 查看所有课程，各课程并发获取，按指定的顺序输出。
     """
-    # 给出module_id则进行完整的请求
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True
-    ) as progress:
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-
-        task = progress.add_task(description="获取课程信息中...", total=1)
-    
-        # --- 加载预备课程信息 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            course_messages, raw_course_modules = await zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data()
-        
-        course_name = course_messages.get("name", "null")
-        course_modules: List[dict] = raw_course_modules.get("modules", [])
-
-        if not course_modules:
-            rprint(f"课程{course_name} (ID: {course_id}) 无章节内容")
-            return
-        
-        if all:
-            indices = list(range(0, len(course_modules)))
-        
-        if modules_id or indices or last:
-            # --- 筛选目标modules ---
-            modules_list = extract_modules(course_modules, indices, modules_id, last)
-            course_modules_node_list: List[Tuple[dict, dict, dict, dict]] = []
-            
-            if not modules_list:
-                logger.error(f"{course_name}(ID: {course_id})中你要查询的章节不存在！")
-                rprint("未找到章节！")
-                return 
-
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-                raw_course_activities, raw_course_exams, raw_course_classrooms, raw_course_activities_reads, raw_homework_completeness, raw_exam_completeness = await zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
-
-            for module_id, module in modules_list:
-                course_activities: List[dict] = raw_course_activities.get("activities", [])
-                course_exams: List[dict] = raw_course_exams.get("exams", [])
-                course_classrooms: List[dict] = raw_course_classrooms.get("classrooms", [])
-                exams_completeness: List[int] = raw_exam_completeness.get("exam_ids", [])
-                activities_completeness: List[int] = [homework_activitie.get("id") for homework_activitie in raw_homework_completeness.get("homework_activities", {}) if homework_activitie.get("status") == "已交"]
-                classrooms_completeness: List[dict] = [activity_read for activity_read in raw_course_activities_reads.get("activity_reads") if activity_read.get("activity_type") == "classroom_activity"]
-
-                logger.info(f"{activities_completeness}")
-
-                # 筛选目标activities, exams 和 classrooms
-                
-                activities_list: List[dict] = []
-                if not (only_classroom or only_exam):
-                    for course_activity in course_activities:
-                        if only_homework and course_activity.get("type", "null") != "homework":
-                            continue
-
-                        if course_activity.get("module_id") == module_id:
-                                activities_list.append(course_activity)
-
-                exams_list: List[dict] = []
-                if not (only_classroom or only_activity or only_homework):
-                    for course_exam in course_exams:
-                        if course_exam.get("module_id") == module_id:
-                            exams_list.append(course_exam)
-
-                classrooms_list: List[dict] = []
-                if not (only_exam or only_activity or only_homework):
-                    for course_classroom in course_classrooms:
-                        if course_classroom.get("module_id") == module_id:
-                            classrooms_list.append(course_classroom)
-
-                if len(activities_list) == 0 and len(exams_list) == 0 and len(classrooms_list) == 0:
-                    rprint(f"章节 {module_id} 无内容")
-                    continue
-                
-                course_modules_node_list.append((module, activities_list, exams_list, classrooms_list))
-
-            if not course_modules_node_list:
-                return
-        else:
-            modules_list = course_modules
-            progress.advance(task)
-
-
-        task = progress.add_task(description="加载内容中...", total=1)
-
-        # 装填树状图
-        course_tree = Tree(f"[bold yellow]{course_name}[/bold yellow][dim] 课程ID: {course_id}[/dim]")
-        
-        if modules_id or indices or last:
-            # _index is unused, thus named with a prefix "_"
-            for _index, (module, activities_list, exams_list, classrooms_list) in enumerate(course_modules_node_list):
-                module_name = module.get("name", "null")
-                module_tree = course_tree.add(f"[green]{module_name}[/green][dim] 章节ID: {module_id}[/dim]")
-                type_map = {
-                    "material": "资料",
-                    "online_video": "视频",
-                    "homework": "作业",
-                    "questionnaire": "问卷",
-                    "exam": "测试",
-                    "page": "页面",
-                    "classroom": "课堂任务"
-                }
-
-                # --- 加载活动内容 ---
-                for activity in activities_list: # type: ignore
-                    # 标题、类型与ID
-                    activity_title = activity.get("title", "null")
-                    activity_type = type_map.get(activity.get("type", "null"), activity.get("type", "null"))
-                    activity_id = activity.get("id", "null")
-                    activity_completion_criterion_key = activity.get("completion_criterion_key", "none")
-                    completion_status = activity_id in activities_completeness
-                    # 活动的start_time和end_time都可能是null值，必须多做一次判断
-                    # is_started 和 is_closed 来判断活动是否开始或者截止
-                    # 开放日期
-                    activity_start_time = transform_time(activity.get("start_time"))
-                    
-                    activity_is_started: bool = activity.get("is_started", False)
-                    
-                    # 截止日期
-                    activity_end_time = transform_time(activity.get("end_time"))
-
-                    activity_is_closed: bool = activity.get("is_closed", False)
-
-                    # 创建状态描述文本和截止时间富文本
-                    status_text = get_status_text(activity_is_started, activity_is_closed)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (activity_start_time, "bright_white")
-                    )
-                    end_time_text = Text.assemble(
-                        ("截止时间: ", "cyan"),
-                        (activity_end_time, "bright_white")
-                    )
-                    # 跳转链接
-                    url_jump = make_jump_url(course_id, activity_id, activity.get("type", "null"))
-                    url_jump_text = Text.assemble(
-                        ("跳转链接: ", "cyan"),
-                        (url_jump, "bright_white")
-                    )
-
-                    # 任务完成状态
-                    completion_text = get_completion_text(completion_status, activity_completion_criterion_key)
-
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{activity_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{activity_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        completion_text,
-                        status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append(end_time_text)
-                    if url_jump:
-                        content_renderables.append(url_jump_text)
-
-                    # 附件
-                    activity_uploads: List[dict]= activity.get("uploads", [])
-                    if activity_uploads:
-                        content_renderables.append("[cyan]附件: [/cyan]")
-
-                    for upload in activity_uploads:
-                        file_name = upload.get("name", "null")
-                        file_id = upload.get("id", "null")
-                        file_size = filesize.decimal(upload.get("size", 0))
-
-                        upload_table = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
-                        upload_table.add_column("Name", no_wrap=True)
-                        upload_table.add_column("Info", justify="right")
-
-                        upload_table.add_row(
-                            f"{file_name}",
-                            f"大小: {file_size} | 文件ID: {file_id}"
-                        )
-                        
-                        content_renderables.append(upload_table)
-
-                    if activity_type == "作业":
-                        panel_title = f"[cyan][{activity_type}][/cyan]"
-
-                    else:
-                        panel_title = f"[white][{activity_type}][/white]"
-
-                    activity_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_cyan" if activity_type == "作业" else "bright_black",
-                        expand=True,
-                        padding=(1, 2)
-                    )
-
-                    module_tree.add(activity_panel)
-
-                # --- 加载测试内容 ---
-                for exam in exams_list:
-                    exam_title = exam.get("title", "null")
-                    exam_type = type_map.get(exam.get("type", "null"), exam.get("type", "null"))
-                    exam_id = exam.get("id", "null")
-                    exam_completion_criterion_key = exam.get("completion_criterion_key", "none")
-                    completion_status = exam_id in exams_completeness
-
-                    # 理由同上
-                    # 开放日期
-                    exam_start_time = transform_time(exam.get("start_time"))
-                    exam_is_started: bool = exam.get("is_started", False)
-                    
-                    # 截止日期
-                    exam_end_time = transform_time(exam.get("end_time"))
-
-                    exam_is_closed: bool = exam.get("is_closed", False)
-
-                    # 创建状态描述文本和截止时间富文本
-                    status_text = get_status_text(exam_is_started, exam_is_closed)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (exam_start_time, "bright_white")
-                    )
-                    end_time_text = Text.assemble(
-                        ("截止时间: ", "cyan"),
-                        (exam_end_time, "bright_white")
-                    )
-                    url_jump = make_jump_url(course_id, exam_id, exam.get("type", "null"))
-                    url_jump_text = Text.assemble(
-                        ("跳转链接: ", "cyan"),
-                        (url_jump, "bright_white")
-                    )
-
-                    completion_text = get_completion_text(completion_status, exam_completion_criterion_key)
-
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{exam_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{exam_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        completion_text,
-                        status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append(end_time_text)
-                    content_renderables.append(url_jump_text)
-
-                    panel_title = f"[yellow][{exam_type}][/yellow]"
+    if not course_ids and not all_my_courses:
+        rprint("请指定课程id，或使用 --all-my-courses 查看所有课程")
+        raise typer.Exit(code=1)
 
-                    activity_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_yellow",
-                        expand=True,
-                        padding=(1, 2)
-                    )
+    cookies = CredentialManager().load_cookies()
+    if not cookies and not response_cache.offline:
+        rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
 
-                    module_tree.add(activity_panel)
+    # 需要展开章节时，课程目录与章节内容在同一轮请求中获取
+    show_content = bool(modules_id or indices or last or all)
+
+    async def resolve_course_ids(client)->List[int]:
+        target_ids = list(dict.fromkeys(course_ids or []))
+        if all_my_courses:
+            courses_paginator = zju_api.apiPaginator(
+                lambda page, page_size: zju_api.coursesListAPIFits(client.session, None, page, page_size),
+                items_key="courses",
+                model=Course,
+                projection=FieldProjection("id", "courses")
+            )
+            target_ids += [course.id async for course in courses_paginator.items() if course.id is not None and course.id not in target_ids]
 
-                # --- 加载课堂任务内容 ---
-                for classroom in classrooms_list:
-                    classroom_title = classroom.get("title", "null")
-                    classroom_type = type_map.get(classroom.get("type", "null"), classroom.get("type", "null"))
-                    classroom_id = classroom.get("id", "null")
-                    classroom_status = classroom.get("status")
-                    
-                    for classroom_completeness in classrooms_completeness:
-                        if classroom_completeness.get("activity_id") == classroom_id:
-                            classroom_completeness_status = "full"
-                            break
-                    else:
-                        classroom_completeness_status = ""
+        return target_ids
 
-                    classroom_start_time: str = transform_time(classroom.get("start_at"))
+    async def fetch_syllabus(client, course_id: int)->tuple:
+        preview_task = zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data()
+        if not show_content:
+            return await preview_task, None
 
-                    classroom_status_text = get_classroom_status_text(classroom_status)
-                    classroom_completeness_status_text = get_classroom_completion_text(classroom_completeness_status)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (classroom_start_time, "bright_white")
-                    )
+        return tuple(await asyncio.gather(
+            preview_task,
+            zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
+        ))
 
-                    prompt_text = Text("请在移动端上完成！", "red")
-                    
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{classroom_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{classroom_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        classroom_completeness_status_text,
-                        classroom_status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append("")
-                    content_renderables.append(prompt_text)
-
-                    panel_title = f"[yellow][{classroom_type}][/yellow]"
-
-                    classroom_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_green",
-                        expand=True,
-                        padding=(1, 2)
-                    )
+    def render_course(course_id: int, raw_syllabus: tuple):
+        render_syllabus(
+            course_id, *raw_syllabus, modules_id, indices, last, all,
+            only_activity, only_classroom, only_exam, only_homework
+        )
 
-                    module_tree.add(classroom_panel)
-        else:
-            for index, module in enumerate(modules_list):
-                module_name = module.get("name", "null")
-                module_id = module.get("id", "null")
+    # 离线与先显示缓存模式需要整体比较新旧数据，所有课程获取完成后一并渲染
+    if response_cache.offline or state.stale_while_revalidate:
+        async def fetch_all_syllabus()->list:
+            async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+                target_ids = await resolve_course_ids(client)
+                return list(zip(target_ids, await asyncio.gather(*(fetch_syllabus(client, course_id) for course_id in target_ids))))
 
-                # 微型表格，装填！ ---- from gemini 2.5pro
-                course_tree_node = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
-                course_tree_node.add_column("Name", no_wrap=True, style="green")
-                course_tree_node.add_column("ID", justify="right", style="bright_white")
-                course_tree_node.add_row(f"[magenta]{index + 1}[/magenta] {module_name}", f"章节ID: {module_id}")
+        def render_all_syllabus(all_syllabus: list):
+            if not all_syllabus:
+                rprint("啊呀！没有找到课程呢。")
+            for course_id, raw_syllabus in all_syllabus:
+                render_course(course_id, raw_syllabus)
 
-                course_tree.add(course_tree_node)
+        await render_cached_first(fetch_all_syllabus, render_all_syllabus, description="获取课程信息中...")
+        return
 
-        progress.advance(task)
+    # 所有课程共用一个会话并发获取，每门课程在其之前的课程都渲染后立即渲染
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True
+    ) as progress:
+        task = progress.add_task(description="获取课程信息中...", total=None)
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            target_ids = await resolve_course_ids(client)
+            if not target_ids:
+                rprint("啊呀！没有找到课程呢。")
+                return
 
-    rprint(course_tree)
+            await render_in_order(
+                [fetch_syllabus(client, course_id) for course_id in target_ids],
+                lambda index, raw_syllabus: render_course(target_ids[index], raw_syllabus),
+                on_complete=lambda index, completed: progress.update(
+                    task, description=f"获取课程信息中... {completed}/{len(target_ids)} (课程 {target_ids[index]} 已完成)"
+                )
+            )
 
 @view_app.command(
         "cw",
@@ -710,7 +894,7 @@ async def view_syllabus(
                 (查看第 2 页，每页显示 5 个结果)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def view_coursewares(
     course_id: Annotated[int, typer.Argument(help="课程ID")],
     page: Annotated[Optional[int], typer.Option("--page", "-p", help="页面索引")] = 1,
@@ -738,89 +922,101 @@ async def view_coursewares(
 
         task = progress.add_task(description="获取课程信息中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            # 预请求，检查一下有多少章节
-            pre_raw_coursewares = (await zju_api.coursewaresViewAPIFits(client.session, course_id, 1, 1).get_api_data())[0]
-            total_syllabuses = pre_raw_coursewares.get("total", 0)
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            # 首页返回章节总数，剩余页面并发拉取
+            coursewares_paginator = zju_api.apiPaginator(
+                lambda page_index, page_amount: zju_api.coursewaresViewAPIFits(client.session, course_id, page_index, page_amount),
+                items_key="activities",
+                model=Activity,
+                projection=Activity.projection("activities")
+            )
+            await coursewares_paginator.first_page()
             
-            if total_syllabuses == 0:
+            if coursewares_paginator.total == 0:
                 rprint("当前还没有课件哦~\\( ^ ω ^ )/")
                 return
 
-            # 一次性拉取所有章节
-            raw_coursewares = (await zju_api.coursewaresViewAPIFits(client.session, course_id, 1, total_syllabuses).get_api_data())[0]
-        
-        progress.update(task, description="渲染任务信息中...", advance=1)
-
-        # 提取并拼装所有文件
-        coursewares_list: List[dict] = raw_coursewares.get("activities", [])
-        coursewares_uploads: List[dict] = []
-        for courseware in coursewares_list:
-            coursewares_uploads.extend(courseware.get("uploads", []))
+            async def iter_uploads():
+                async for courseware in coursewares_paginator.items():
+                    for courseware_upload in courseware.uploads:
+                        yield courseware_upload
 
-        total: int = len(coursewares_uploads)
-        pages: int = int(total / page_size) + 1
+            async def iter_page(uploads: List[Upload]):
+                for courseware_upload in uploads:
+                    yield courseware_upload
 
-        if page > pages:
-            rprint(f"当前仅有 {pages} 页，你都索引到 {page} 页啦！[○･｀Д´･ ○]")
-            raise typer.Exit(code=1)
-        
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        
-        coursewares_uploads_shown = coursewares_uploads[start_index: end_index]
+            # 启用--all时各页到达后即逐条渲染；分页显示时需要全部文件以计算页数
+            if all:
+                page = 1
+                pages = 1
+                coursewares_uploads_shown = iter_uploads()
+            else:
+                coursewares_uploads: List[Upload] = [courseware_upload async for courseware_upload in iter_uploads()]
+                pages: int = int(len(coursewares_uploads) / page_size) + 1
 
-        if quiet:
-            courseware_ids = [str(courseware_upload.get("id", "null")) for courseware_upload in coursewares_uploads_shown]
-            print(" ".join(courseware_ids))
-            return
+                if page > pages:
+                    rprint(f"当前仅有 {pages} 页，你都索引到 {page} 页啦！[○･｀Д´･ ○]")
+                    raise typer.Exit(code=1)
 
-        # --- 准备表格 ---
-        coursewares_table = Table(
-            title=f"资源列表 (第 {page} / {pages} 页)",
-            caption=f"本页显示 {len(coursewares_uploads_shown)} 个，共 {total} 个结果。",
-            border_style="bright_black",
-            show_header=True,
-            header_style="bold magenta",
-            expand=True
-        )
+                start_index = (page - 1) * page_size
+                end_index = start_index + page_size
+                coursewares_uploads_shown = iter_page(coursewares_uploads[start_index: end_index])
+        
+            progress.update(task, description="渲染任务信息中...", advance=1)
 
-        if short:
-            coursewares_table.add_column("资源ID", style="cyan", no_wrap=True, width=10)
-            coursewares_table.add_column("资源名称", style="bright_yellow", ratio=1)
-        else:
-            coursewares_table.add_column("资源ID", style="cyan", no_wrap=True, width=8)
-            coursewares_table.add_column("资源名称", style="bright_yellow", ratio=3)
-            coursewares_table.add_column("上传时间", ratio=1)
-            coursewares_table.add_column("文件大小", ratio=1)
+            if quiet:
+                courseware_ids = [str(courseware_upload.id or "null") async for courseware_upload in coursewares_uploads_shown]
+                print(" ".join(courseware_ids))
+                return
 
-        for courseware_upload in coursewares_uploads_shown:
-            courseware_id   = str(courseware_upload.get("id", "null"))
-            courseware_name = courseware_upload.get("name", "null")
+            # --- 准备表格 ---
+            coursewares_table = Table(
+                title=f"资源列表 (第 {page} / {pages} 页)",
+                border_style="bright_black",
+                show_header=True,
+                header_style="bold magenta",
+                expand=True
+            )
 
             if short:
-                coursewares_table.add_row(
-                    courseware_id,
-                    courseware_name
-                )
-
-                if courseware_upload != coursewares_uploads[-1]:
+                coursewares_table.add_column("资源ID", style="cyan", no_wrap=True, width=10)
+                coursewares_table.add_column("资源名称", style="bright_yellow", ratio=1)
+            else:
+                coursewares_table.add_column("资源ID", style="cyan", no_wrap=True, width=8)
+                coursewares_table.add_column("资源名称", style="bright_yellow", ratio=3)
+                coursewares_table.add_column("上传时间", ratio=1)
+                coursewares_table.add_column("文件大小", ratio=1)
+
+            shown_amount = 0
+            async for courseware_upload in coursewares_uploads_shown:
+                if shown_amount:
                     coursewares_table.add_row()
+                shown_amount += 1
 
-                continue
+                courseware_id   = str(courseware_upload.id or "null")
+                courseware_name = courseware_upload.name or "null"
 
-            courseware_size        = filesize.decimal(courseware_upload.get("size", 0))
-            courseware_update_time = transform_time(courseware_upload.get("updated_at", "1900-01-01T00:00:00Z"))
+                if short:
+                    coursewares_table.add_row(
+                        courseware_id,
+                        courseware_name
+                    )
+                    continue
 
-            coursewares_table.add_row(
-                courseware_id,
-                courseware_name,
-                courseware_update_time,
-                courseware_size
-            )
+                courseware_size        = filesize.decimal(courseware_upload.size or 0)
+                courseware_update_time = transform_time(courseware_upload.updated_at or "1900-01-01T00:00:00Z")
 
-            if courseware_upload != coursewares_uploads[-1]:
-                coursewares_table.add_row()
+                coursewares_table.add_row(
+                    courseware_id,
+                    courseware_name,
+                    courseware_update_time,
+                    courseware_size
+                )
+
+        total = shown_amount if all else len(coursewares_uploads)
+        coursewares_table.caption = f"本页显示 {shown_amount} 个，共 {total} 个结果。"
+        if coursewares_paginator.failed_pages:
+            coursewares_table.caption += f"第 {', '.join(map(str, coursewares_paginator.failed_pages))} 页拉取失败。"
 
         progress.update(task, description="渲染完成！", advance=1)
 
@@ -853,7 +1049,7 @@ async def view_coursewares(
                 (只查看课程教师)    
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def view_members(
     course_id: Annotated[int, typer.Argument(help="课程ID")],
     instructor: Annotated[Optional[bool], typer.Option("--instructor", "-I", help="启用此选项，只输出教师")] = False,
@@ -880,7 +1076,7 @@ async def view_members(
             raise typer.Exit(code=1)
         task = progress.add_task(description="请求数据中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             raw_course_enrollments = (await zju_api.courseMembersViewAPIFits(client.session, course_id).get_api_data())[0]
 
         progress.update(task, description="渲染任务信息中...", advance=1)
@@ -954,7 +1150,7 @@ async def view_members(
               (查看课程点名概况)
     """),
     no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def view_rollcalls(
     course_id: Annotated[str, typer.Argument(help="课程id")],
     amount: Annotated[Optional[int], typer.Option("--amount", "-a", help="显示点名记录的数量")] = 10,
@@ -962,7 +1158,7 @@ async def view_rollcalls(
     all: Annotated[Optional[bool], typer.Option("--all", "-A", help="启用此参数，一次性输出所有结果")] = False,
     summary: Annotated[Optional[bool], typer.Option("--summary", "-S", help="启用此选项，统计点名情况")] = False
 ):
-    student_id = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME)
+    student_id = credential_broker.get(KEYRING_LAZ_STUDENTID_NAME)
     rollcall_type_map = {
         "radar": "雷达点名",
         "number": "数字点名"
@@ -984,12 +1180,12 @@ async def view_rollcalls(
         
         task = progress.add_task(description="请求数据中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             raw_course_rollcalls = (await zju_api.courseRollcallsViewAPIFits(client.session, course_id=course_id, student_id=student_id).get_api_data())[0]
 
         progress.update(task, description="渲染点名记录中...", completed=1)
         
-        course_rollcalls: List[dict] = raw_course_rollcalls.get("rollcalls")
+        course_rollcalls: List[Rollcall] = Rollcall.decode_list(raw_course_rollcalls.get("rollcalls"))
 
         if not course_rollcalls:
             rprint("暂无点名记录哦~")
@@ -1001,7 +1197,7 @@ async def view_rollcalls(
             on_call_rollcalls_amount = 0
             
             for rollcall in course_rollcalls:
-                if rollcall.get("status") == "on_call_fine":
+                if rollcall.status == "on_call_fine":
                     on_call_rollcalls_amount += 1
 
             rprint(f"签到情况: 共 {total_rollcalls_amount} 次签到，[green]{on_call_rollcalls_amount}[/green] 次已到，[red]{total_rollcalls_amount - on_call_rollcalls_amount}[/red] 次未到")
@@ -1036,17 +1232,17 @@ async def view_rollcalls(
         rollcalls_table.add_column("签到类型")
 
         for rollcall in course_rollcalls_shown:
-            rollcall_id = str(rollcall.get("rollcall_id", 0))
-            rollcall_time = transform_time(rollcall.get("rollcall_time"))
-            rollcall_type = rollcall_type_map.get(rollcall.get("source"), "None")
+            rollcall_id = str(rollcall.rollcall_id or 0)
+            rollcall_time = transform_time(rollcall.rollcall_time)
+            rollcall_type = rollcall_type_map.get(rollcall.source, "None")
 
-            if rollcall.get("status") == "on_call_fine":
+            if rollcall.status == "on_call_fine":
                 rollcall_status_text = Text(
                     "√ 已签到",
                     "green"
                 )
             else:
-                if rollcall.get("rollcall_status") == "finished":   
+                if rollcall.rollcall_status == "finished":   
                     rollcall_status_text = Text(
                         "✘ 未签到",
                         "red"
@@ -1069,5 +1265,223 @@ async def view_rollcalls(
     rprint(rollcalls_table)
 
 
+# --- 课程同步 ---
+SYNC_MANIFEST_NAME = ".lazy_sync.json"
+# 同步时单页拉取的课件活动数量，绝大多数课程一次请求即可取完
+SYNC_PAGE_SIZE = 1000
+
+def safe_path_name(name)->str:
+    """替换文件系统不允许的字符，用作目录名"""
+    cleaned = re.sub(r'[\\/:*?"<>|\r\n\t]', "_", str(name)).strip().rstrip(".")
+    return cleaned or "_"
+
+def load_sync_manifest(dest: Path, course_id: int)->dict:
+    """读取同步目录下的清单，记录已下载文件的 upload id、大小、更新时间与相对路径
+    """
+    manifest_path = dest / SYNC_MANIFEST_NAME
+    empty_manifest = {"course_id": course_id, "files": {}}
+
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest: dict = json.load(f)
+    except FileNotFoundError:
+        return empty_manifest
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"同步清单 {manifest_path} 读取失败，将重新同步: {e}")
+        return empty_manifest
+
+    if manifest.get("course_id") != course_id:
+        rprint(f"[red]{dest} 已用于同步课程 {manifest.get('course_id')}，请换一个目录！[/red]")
+        logger.error(f"{dest} 已用于同步课程 {manifest.get('course_id')}")
+        raise typer.Exit(code=1)
+
+    manifest.setdefault("files", {})
+    return manifest
+
+def save_sync_manifest(dest: Path, manifest: dict):
+    manifest_path = dest / SYNC_MANIFEST_NAME
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def is_upload_changed(upload: Upload, record: dict|None, dest: Path)->bool:
+    """根据 upload id、文件大小、更新时间以及本地文件是否存在判断是否需要下载
+    """
+    if not record:
+        return True
+
+    if record.get("size") != upload.size or record.get("updated_at") != upload.updated_at:
+        return True
+
+    local_path = dest / record.get("path", "")
+    if not local_path.is_file():
+        return True
+
+    return bool(upload.size) and local_path.stat().st_size != upload.size
+
+def disambiguate_upload_name(upload: Upload)->str:
+    """在文件名后附加 upload id，如 `讲义.pdf` -> `讲义_114514.pdf`"""
+    name = Path(safe_path_name(upload.name or "null"))
+    return f"{name.stem}_{upload.id}{name.suffix}"
+
+@app.command(
+        "sync",
+        help="将课程课件增量同步至本地目录",
+        epilog=dedent("""
+            EXAMPLES:
+
+              $ lazy course sync 114514 -d ~/courses/calculus
+                (将课程"114514"的课件同步至指定目录，仅下载新增或变更的文件)
+
+              $ lazy course sync 114514 -d ~/courses/calculus --dry-run
+                (只列出需要下载的文件)
+        """),
+        no_args_is_help=True)
+@session_manager.syncify
+async def sync_course(
+    course_id: Annotated[int, typer.Argument(help="课程ID")],
+    dest: Annotated[Optional[Path], typer.Option("--dest", "-d", help="同步目录，默认为 ~/Downloads/<课程名>")] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="同时下载的文件数")] = 4,
+    dry_run: Annotated[Optional[bool], typer.Option("--dry-run", help="启用此选项，只列出需要下载的文件")] = False
+):
+    """
+    将课程课件镜像到本地，目录结构为 章节/活动/文件。
+
+    同步清单保存在目标目录的 .lazy_sync.json 中，再次同步时只下载新增或发生变化的文件。
+    """
+    cookies = CredentialManager().load_cookies()
+    if not cookies:
+        rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True
+    ) as progress:
+        progress.add_task(description="获取课程课件中...", total=None)
+
+        # 章节与课件首页在同一轮请求中获取，课件超过一页时并发获取剩余页面
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            coursewares_paginator = zju_api.apiPaginator(
+                lambda page, page_size: zju_api.coursewaresViewAPIFits(client.session, course_id, page, page_size),
+                items_key="activities",
+                page_size=SYNC_PAGE_SIZE,
+                model=Activity,
+                projection=Activity.projection("activities")
+            )
+            (course_messages, raw_course_modules), _ = await asyncio.gather(
+                zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data(),
+                coursewares_paginator.first_page()
+            )
+
+            coursewares_list: List[Activity] = [courseware async for courseware in coursewares_paginator.items()]
+
+    if not course_messages:
+        rprint(f"获取课程 {course_id} 信息失败！")
+        raise typer.Exit(code=1)
+
+    course_name = course_messages.get("name", str(course_id))
+    modules_name = {module.id: module.name or "null" for module in Module.decode_list(raw_course_modules.get("modules", []))}
+
+    if dest is None:
+        dest = Path().home() / "Downloads" / safe_path_name(course_name)
+    dest = dest.expanduser().resolve()
+
+    manifest = load_sync_manifest(dest, course_id)
+    manifest["course_name"] = course_name
+    manifest_files: dict = manifest["files"]
+
+    # --- 确定每个文件的保存目录 ---
+    placements: dict[int, Tuple[Upload, Path]] = {}
+    for courseware in coursewares_list:
+        module_dir   = safe_path_name(modules_name.get(courseware.module_id, "未分章节"))
+        activity_dir = safe_path_name(courseware.title or courseware.id or "null")
+
+        for upload in courseware.uploads:
+            if upload.id is not None:
+                placements[upload.id] = (upload, Path(module_dir) / activity_dir)
+
+    # 同一目录下的同名文件会互相覆盖，以 upload id 作为后缀区分
+    name_counts = Counter((relative_dir, upload.name) for upload, relative_dir in placements.values())
+    save_as: dict[int, str] = {
+        upload_id: disambiguate_upload_name(upload)
+        for upload_id, (upload, relative_dir) in placements.items()
+        if name_counts[(relative_dir, upload.name)] > 1
+    }
+
+    # --- 对比清单，找出新增与变更的文件 ---
+    to_download: dict[int, Tuple[Upload, Path]] = {}
+    for upload_id, (upload, relative_dir) in placements.items():
+        record = manifest_files.get(str(upload_id))
+        # 此前同步时与其他文件同名，保存位置已改变
+        moved = upload_id in save_as and record and record.get("path") != (relative_dir / save_as[upload_id]).as_posix()
+        if moved or is_upload_changed(upload, record, dest):
+            to_download[upload_id] = (upload, relative_dir)
+
+    if not to_download:
+        rprint(f"[green]{course_name} 已是最新，无需下载。[/green]")
+        return
+
+    if dry_run:
+        for upload_id, (upload, relative_dir) in to_download.items():
+            rprint(f"[cyan]{relative_dir / save_as.get(upload_id, upload.name or 'null')}[/cyan] ({filesize.decimal(upload.size or 0)})")
+        rprint(f"共 {len(to_download)} 个文件需要下载。")
+        return
+
+    for _upload, relative_dir in to_download.values():
+        (dest / relative_dir).mkdir(parents=True, exist_ok=True)
+
+    # --- 下载 ---
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        HumanReadableTransferColumn(),
+        TimeRemainingColumn()
+    ) as sub_progress:
+        download_tasks = {upload_id: sub_progress.add_task(description=f"{upload.name or upload_id}", start=False, total=upload.size or None) for upload_id, (upload, _relative_dir) in to_download.items()}
+
+        def update_progress(upload_id: int, downloaded: int, total_size: int, filename: str):
+            task_id = download_tasks[upload_id]
+            if not sub_progress.tasks[task_id].started:
+                sub_progress.start_task(task_id)
+                sub_progress.update(task_id, description=f"[cyan]下载: {filename}", total=total_size)
+
+            sub_progress.update(task_id, completed=downloaded)
+
+        def finish_download(result: zju_api.downloadResult):
+            task_id = download_tasks[result.resource_id]
+            if not result.success:
+                sub_progress.update(task_id, description=f"[red]下载失败: {result.resource_id} o(￣ヘ￣o＃)[/red]")
+                return
+
+            sub_progress.update(task_id, description=f"[green]√ {sub_progress.tasks[task_id].description}", completed=sub_progress.tasks[task_id].total)
+
+            # 每完成一个文件即写入清单，中断后已完成的文件不必重新下载
+            upload, relative_dir = to_download[result.resource_id]
+            manifest_files[str(result.resource_id)] = {
+                "path": str((relative_dir / result.filename).as_posix()),
+                "size": upload.size,
+                "updated_at": upload.updated_at
+            }
+            save_sync_manifest(dest, manifest)
+
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            scheduler = zju_api.resourcesDownloadScheduler(client.session, output_path=dest, concurrency=jobs)
+            results = await scheduler.download(
+                list(to_download),
+                progress_callback=update_progress,
+                done_callback=finish_download,
+                output_paths={upload_id: dest / relative_dir for upload_id, (_upload, relative_dir) in to_download.items()},
+                save_as=save_as
+            )
+
+    success_amount = sum(result.success for result in results)
+    rprint(f"[green]同步完成！[/green]下载 {success_amount} 个文件，失败 {len(results) - success_amount} 个文件。")
+    rprint(f"[cyan]同步路径: [/cyan]{dest}")
+
+
 # view 注册入课程命令组
 app.add_typer(view_app, name="view", help="管理学在浙大课程的查看")
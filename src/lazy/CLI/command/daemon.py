@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from textwrap import dedent
+from typing import Annotated, Optional
+
+import typer
+from rich import print as rprint
+
+from ..daemon import (
+    DAEMON_COMMANDS,
+    DAEMON_DISABLE_ENV,
+    DAEMON_IDLE_TIMEOUT,
+    DAEMON_SOCKET,
+    LazyDaemon,
+    daemon_supported,
+    request,
+)
+
+# 启动后台进程后等待其就绪的最长时间（秒）
+DAEMON_START_TIMEOUT = 10.0
+
+# daemon 命令组
+app = typer.Typer(help="""
+                        管理 LAZY CLI 常驻后台进程
+                       """,
+                    no_args_is_help=True
+                  )
+
+def check_supported():
+    if not daemon_supported():
+        rprint("[red]当前平台不支持 Unix 域套接字，无法使用后台进程！[/red]")
+        raise typer.Exit(code=1)
+
+@app.command(
+        "start",
+        help="启动后台进程",
+        epilog=dedent(f"""
+            EXAMPLES:
+
+              $ lazy daemon start
+                (启动后台进程，之后的 {', '.join(DAEMON_COMMANDS)} 只读命令将由后台进程执行)
+
+              $ lazy daemon start --idle-timeout 0
+                (启动后台进程，并且不因空闲而自动退出)
+        """))
+def start_daemon(
+    idle_timeout: Annotated[Optional[int], typer.Option("--idle-timeout", "-t", help="空闲超过此秒数后自动退出，0 表示不自动退出")] = DAEMON_IDLE_TIMEOUT
+):
+    """
+    启动常驻后台进程。
+
+    后台进程保持已登录的会话、接口注册表与已导入的命令，只读命令转交给它执行，省去每次启动与登录检查的开销。
+    设置环境变量 LAZY_NO_DAEMON 后不会转发命令。
+    """
+    check_supported()
+
+    status = request({"type": "status"})
+    if status is not None:
+        rprint(f"后台进程已在运行 (PID: {status.get('pid')})")
+        return
+
+    # 打包后的可执行文件本身即为 lazy
+    if getattr(sys, "frozen", False):
+        command = [sys.executable, "daemon", "run", "--idle-timeout", str(idle_timeout)]
+    else:
+        command = [sys.executable, "-m", "lazy", "daemon", "run", "--idle-timeout", str(idle_timeout)]
+
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env={**os.environ, DAEMON_DISABLE_ENV: "1"}
+    )
+
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = request({"type": "status"})
+        if status is not None:
+            rprint(f"[green]后台进程已启动[/green] (PID: {status.get('pid')})")
+            return
+        time.sleep(0.1)
+
+    rprint("[red]后台进程启动失败，请查看日志！[/red]")
+    raise typer.Exit(code=1)
+
+@app.command(
+        "stop",
+        help="停止后台进程")
+def stop_daemon():
+    """
+    停止常驻后台进程，之后的命令在本进程中执行。
+    """
+    check_supported()
+
+    if request({"type": "shutdown"}) is None:
+        rprint("后台进程未在运行")
+        return
+
+    rprint("[green]后台进程已停止[/green]")
+
+@app.command(
+        "status",
+        help="查看后台进程状态")
+def daemon_status():
+    """
+    查看常驻后台进程是否在运行，以及已执行的命令数量。
+    """
+    check_supported()
+
+    status = request({"type": "status"})
+    if status is None:
+        rprint("后台进程未在运行")
+        raise typer.Exit(code=1)
+
+    started_at = datetime.fromtimestamp(status.get("started_at", 0)).strftime("%Y-%m-%d %H:%M:%S")
+    rprint(f"[green]后台进程运行中[/green] PID: {status.get('pid')}")
+    rprint(f"[cyan]启动时间: [/cyan]{started_at}")
+    rprint(f"[cyan]已执行命令: [/cyan]{status.get('requests', 0)}")
+    rprint(f"[cyan]套接字: [/cyan]{DAEMON_SOCKET}")
+
+@app.command(
+        "run",
+        hidden=True,
+        help="在前台运行后台进程")
+def run_daemon(
+    idle_timeout: Annotated[Optional[int], typer.Option("--idle-timeout", "-t", help="空闲超过此秒数后自动退出，0 表示不自动退出")] = DAEMON_IDLE_TIMEOUT
+):
+    """
+    在前台运行后台进程，供 start 启动或调试时使用。
+    """
+    check_supported()
+
+    LazyDaemon(idle_timeout=idle_timeout).serve()
@@ -1,12 +1,10 @@
 import logging
 from datetime import datetime
-from functools import partial
 from pathlib import Path
 from textwrap import dedent
 from typing import List, Optional
 
 import typer
-from asyncer import syncify
 from rich import filesize
 from rich import print as rprint
 from rich.progress import (
@@ -23,8 +21,9 @@ from rich.progress import (
 from rich.table import Table
 from typing_extensions import Annotated
 
-from ...login.login import CredentialManager, ZjuAsyncClient
+from ...login.login import CredentialManager, session_manager
 from ...zjuAPI import zju_api
+from ...zjuAPI.models import Upload
 from ..state import state
 
 # resource 命令组
@@ -150,7 +149,7 @@ def to_upload_dir_walker(dir: Path)->List[Path]:
               $ lazy resource list -p 2 -a 5  
                 (查看第 2 页，每页显示 5 个结果)
         """))
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def list_resources(
     keyword: Annotated[Optional[str], typer.Option("--name", "-n", help="文件名称")] = "",
     amount: Annotated[Optional[int], typer.Option("--amount", "-a", help="显示文件的数量")] = 10,
@@ -180,79 +179,84 @@ async def list_resources(
             logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            # 如果启用--all，则先获取文件资源总数
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+            # 启用--all时先请求首页获取总数，再并发拉取剩余页面；否则仅请求指定页
             if all:
-                pre_results = (await zju_api.resourcesListAPIFits(client.session, keyword, 1, 1, file_type).get_api_data(False))[0]
-                amount = pre_results.get("pages", 1)
                 page_index = 1
+                pagination = {}
+            else:
+                pagination = {"page_size": amount, "start_page": page_index, "max_pages": 1}
 
-            results = (await zju_api.resourcesListAPIFits(client.session, keyword, page_index, amount, file_type).get_api_data(False))[0]
-        
-        progress.advance(task, 1)
-        task = progress.add_task(description="渲染资源信息中...", total=1)
-        
-        total_pages = results.get("pages", 0)
-
-        if page_index > total_pages and total_pages > 0:
-            print(f"页面索引超限！共 {total_pages} 页，你都索引到第 {page_index} 页啦！")
-            raise typer.Exit(code=1)
-
-        resources_list = results.get("uploads", [])
-        current_results_amount = len(resources_list)
-
-        if current_results_amount == 0:
-            print("啊呀！没有找到文件呢。")
-            return
+            resources_paginator = zju_api.apiPaginator(
+                lambda page, page_size: zju_api.resourcesListAPIFits(client.session, keyword, page, page_size, file_type),
+                items_key="uploads",
+                model=Upload,
+                **pagination
+            )
+            results = await resources_paginator.first_page()
         
-        if quiet:
-            resourse_ids = [str(resource.get('id', 'null')) for resource in resources_list]
-            print(" ".join(resourse_ids))
-            return
+            progress.advance(task, 1)
+            task = progress.add_task(description="渲染资源信息中...", total=1)
+            
+            total_pages = 1 if all else results.get("pages", 0)
 
-        resources_list_table = Table(
-            title=f"资源列表 (第 {page_index} / {total_pages} 页)",
-            caption=f"本页显示 {len(resources_list)} 个。",
-            border_style="bright_black",
-            show_header=True,
-            header_style="bold magenta",
-            expand=True
-        )
-
-        if short:
-            resources_list_table.add_column("资源ID", style="cyan", no_wrap=True, width=10)
-            resources_list_table.add_column("资源名称", style="bright_yellow", ratio=1)
-        else:
-            resources_list_table.add_column("资源ID", style="cyan", no_wrap=True, width=8)
-            resources_list_table.add_column("资源名称", style="bright_yellow", ratio=3)
-            resources_list_table.add_column("上传时间", ratio=1)
-            resources_list_table.add_column("文件大小", ratio=1)
+            if page_index > total_pages and total_pages > 0:
+                print(f"页面索引超限！共 {total_pages} 页，你都索引到第 {page_index} 页啦！")
+                raise typer.Exit(code=1)
 
-        
-        # short 模式仅按表单格式打印文件名与文件id
-        for resource in resources_list:
-            resource_id = str(resource.get('id', 'null'))
-            resource_name = resource.get('name', 'null')
+            if not results.get("uploads"):
+                print("啊呀！没有找到文件呢。")
+                return
             
+            if quiet:
+                resourse_ids = [str(resource.id or 'null') async for resource in resources_paginator.items()]
+                print(" ".join(resourse_ids))
+                return
+
+            resources_list_table = Table(
+                title=f"资源列表 (第 {page_index} / {total_pages} 页)",
+                border_style="bright_black",
+                show_header=True,
+                header_style="bold magenta",
+                expand=True
+            )
+
             if short:
-                resources_list_table.add_row(resource_id, resource_name)
-                
-                if resource != resources_list[-1]:
+                resources_list_table.add_column("资源ID", style="cyan", no_wrap=True, width=10)
+                resources_list_table.add_column("资源名称", style="bright_yellow", ratio=1)
+            else:
+                resources_list_table.add_column("资源ID", style="cyan", no_wrap=True, width=8)
+                resources_list_table.add_column("资源名称", style="bright_yellow", ratio=3)
+                resources_list_table.add_column("上传时间", ratio=1)
+                resources_list_table.add_column("文件大小", ratio=1)
+
+            # 各页到达后即逐条加入表格，无需等待最后一页
+            shown_amount = 0
+            async for resource in resources_paginator.items():
+                if shown_amount:
                     resources_list_table.add_row()
-                
-                continue
-            
-            resource_size = filesize.decimal(resource.get('size', 0))
-            resource_update_time = transform_time(resource.get("updated_at", "1900-01-01T00:00:00Z"))
-            resources_list_table.add_row(
-                resource_id,
-                resource_name,
-                resource_update_time,
-                resource_size
-            )
+                shown_amount += 1
 
-            if resource != resources_list[-1]:
-                resources_list_table.add_row()
+                resource_id = str(resource.id or 'null')
+                resource_name = resource.name or 'null'
+                
+                # short 模式仅按表单格式打印文件名与文件id
+                if short:
+                    resources_list_table.add_row(resource_id, resource_name)
+                    continue
+                
+                resource_size = filesize.decimal(resource.size or 0)
+                resource_update_time = transform_time(resource.updated_at or "1900-01-01T00:00:00Z")
+                resources_list_table.add_row(
+                    resource_id,
+                    resource_name,
+                    resource_update_time,
+                    resource_size
+                )
+
+        resources_list_table.caption = f"本页显示 {shown_amount} 个。"
+        if resources_paginator.failed_pages:
+            resources_list_table.caption += f"第 {', '.join(map(str, resources_paginator.failed_pages))} 页拉取失败。"
 
         progress.advance(task, 1)
     
@@ -286,7 +290,7 @@ async def list_resources(
                 (上传指定路径文件夹内的文件)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def upload_resources(
     files: Annotated[List[Path], typer.Argument(help="一个或多个文件路径", callback=check_files_path)],
     recursion: Annotated[Optional[bool], typer.Option("--recursion", "-r", help="启用此参数以解析文件夹")] = False
@@ -352,7 +356,7 @@ async def upload_resources(
                 logger.error("Cookies不存在！")
                 raise typer.Exit(code=1)
 
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+            async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
                 files_uploader = zju_api.resourceUploadAPIFits(client.session)
                 
                 for to_upload_file in to_upload_files:
@@ -408,7 +412,7 @@ async def upload_resources(
                 (从云盘上删除ID为"114514"与"2333"的文件，批量模式)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def remove_resources(
     files_id: Annotated[List[int], typer.Argument(help="需删除文件的id")],
     force: Annotated[Optional[bool], typer.Option("--force", "-f", help="启用 --force 以关闭二次确认")] = False,
@@ -447,7 +451,7 @@ async def remove_resources(
         if batch:
             task = progress.add_task(description="删除文件中...", total=1)
 
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+            async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
                 file_deleter = zju_api.resourcesRemoveAPIFits(client.session, resources_id=files_id)
             
             if await file_deleter.batch_delete():
@@ -463,7 +467,7 @@ async def remove_resources(
         
         task = progress.add_task(description="删除文件中...", total=files_id_amount)
         
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             for file_id in files_id:
                 file_deleter = zju_api.resourcesRemoveAPIFits(client.session, resource_id=file_id)
                 
@@ -507,17 +511,24 @@ async def remove_resources(
                 (从云盘以压缩包形式下载指定文件)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def download_resource(
     files_id: Annotated[List[int], typer.Argument(help="需下载文件的id")],
     basename: Annotated[List[int], typer.Option("--basename", "-n", help="文件的基本名，会附加在下载文件的开头")] = None,
     dest: Annotated[Optional[Path], typer.Option("--dest", "-d", help="下载路径", callback=is_download_dest_dir)] = None,
-    batch: Annotated[Optional[bool], typer.Option("--batch", "-b", help="启用批量下载模式，所有下载的文件以压缩包的形式保存在下载目录下。")] = False
+    batch: Annotated[Optional[bool], typer.Option("--batch", "-b", help="启用批量下载模式，所有下载的文件以压缩包的形式保存在下载目录下。")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="同时下载的文件数")] = 4,
+    per_host: Annotated[Optional[int], typer.Option("--per-host", min=1, help="同一文件服务器的最大并发下载数，默认不单独限制；设置后每个文件会多一次 HEAD 请求以确定所在主机")] = None,
+    segments: Annotated[int, typer.Option("--segments", "-s", min=1, help="单个大文件切分为多段并发下载，需服务器支持 Range 请求")] = 1
 ):
     """
     下载学在浙大云盘文件，支持对个人云盘与课程资源的下载。
 
-    默认支持多文件ID自动下载。
+    默认支持多文件ID自动下载，使用 -j 选项设置同时下载的文件数。
+
+    下载中断后重新执行相同命令，会从中断处继续下载。
+
+    使用 -s 选项将单个大文件切分为多段并发下载。
 
     使用 -b 选项以启用批量下载，最终下载文件为包含所有目标文件的压缩包。
 
@@ -527,6 +538,8 @@ async def download_resource(
     if dest is None:
         dest = Path().home() / "Downloads"
 
+    # 去除重复的文件ID，同一文件只下载一次
+    files_id = list(dict.fromkeys(files_id))
     files_id_amount = len(files_id)
     success_amount = 0
 
@@ -552,7 +565,7 @@ async def download_resource(
                     logger.error("Cookies不存在！")
                     raise typer.Exit(code=1)
 
-                async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+                async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
                     resources_downloader = zju_api.resourcesDownloadAPIFits(client.session, output_path=dest, resources_id=files_id, basename=basename)
                 
                 # 子任务，跟踪文件下载进度
@@ -581,10 +594,11 @@ async def download_resource(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TaskProgressColumn(),
+        HumanReadableTransferColumn(),
         transient=True
     ) as progress:
-        # 总任务，跟踪总体下载进度
-        main_task = progress.add_task(description="[green]总进度[/green]", total=files_id_amount)
+        # 总任务，跟踪所有文件的总字节数
+        main_task = progress.add_task(description=f"[green]总进度 0/{files_id_amount}[/green]", total=None)
 
         with Progress(
             TextColumn("[progress.description]{task.description}"),
@@ -598,30 +612,54 @@ async def download_resource(
                 logger.error("Cookies不存在！")
                 raise typer.Exit(code=1)
 
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-                for file_id in files_id:
-                    resource_downloader = zju_api.resourcesDownloadAPIFits(client.session, output_path=dest, resource_id=file_id, basename=basename)
-                    
-                    # 单文件子任务，跟踪文件下载状态
-                    download_task = sub_progress.add_task(description=f"文件ID: {file_id}", start=False)
+            # 单文件子任务，跟踪文件下载状态
+            download_tasks = {file_id: sub_progress.add_task(description=f"文件ID: {file_id}", start=False) for file_id in files_id}
+            downloaded_sizes: dict[int, int] = {}
+            total_sizes: dict[int, int] = {}
+            finished_amount = 0
+
+            # 创建回调函数
+            def update_progress(file_id: int, downloaded: int, total_size: int, filename: str):
+                task_id = download_tasks[file_id]
+                # 首次回调，更新文件名和文件大小
+                if not sub_progress.tasks[task_id].started:
+                    sub_progress.start_task(task_id)
+                    sub_progress.update(task_id, description=f"[cyan]下载: {filename}", total=total_size)
+
+                sub_progress.update(task_id, completed=downloaded)
+
+                downloaded_sizes[file_id] = downloaded
+                total_sizes[file_id] = total_size
+                progress.update(main_task, completed=sum(downloaded_sizes.values()), total=sum(total_sizes.values()))
+
+            def finish_download(result: zju_api.downloadResult):
+                nonlocal finished_amount
+                finished_amount += 1
+                task_id = download_tasks[result.resource_id]
+
+                if result.success:
+                    sub_progress.update(task_id, description=f"[green]√ {sub_progress.tasks[task_id].description}", completed=sub_progress.tasks[task_id].total)
+                else:
+                    sub_progress.update(task_id, description=f"[red]下载失败: {result.resource_id} o(￣ヘ￣o＃)[/red]")
 
-                    # 创建回调函数
-                    def update_progress(downloaded: int, total_size: int, filename: int, task_id: int = download_task):
-                        # 首次回调，更新文件名和文件大小
-                        if not sub_progress.tasks[task_id].started:
-                            sub_progress.start_task(task_id)
-                            sub_progress.update(task_id, description=f"[cyan]下载: {filename}", total=total_size)
+                progress.update(main_task, description=f"[green]总进度 {finished_amount}/{files_id_amount}[/green]")
 
-                        sub_progress.update(task_id, completed=downloaded)
+            async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
+                scheduler = zju_api.resourcesDownloadScheduler(client.session, output_path=dest, concurrency=jobs, per_host_limit=per_host, basename=basename, segments=segments)
+                results = await scheduler.download(files_id, progress_callback=update_progress, done_callback=finish_download)
 
-                    if await resource_downloader.download(progress_callback=update_progress):
-                        success_amount += 1
-                        sub_progress.update(download_task, description=f"[green]√ {sub_progress.tasks[download_task].description}", completed=sub_progress.tasks[download_task].total)
-                    else:
-                        sub_progress.update(download_task, description=f"[red]下载失败: {file_id} o(￣ヘ￣o＃)[/red]")
+        success_amount = sum(result.success for result in results)
+        rprint(f"[green]下载完成！[/green]成功下载 {success_amount} 个文件，失败 {files_id_amount - success_amount} 个文件。")
 
-                    progress.update(main_task, advance=1)
+        failed_results = [result for result in results if not result.success]
+        if failed_results:
+            table = Table(title="下载失败文件", show_header=True, header_style="bold red")
+            table.add_column("文件ID", style="cyan", no_wrap=True)
+            table.add_column("文件名")
+            table.add_column("失败原因", style="red")
+            for result in failed_results:
+                table.add_row(str(result.resource_id), result.filename or "-", (result.error or "未知原因").splitlines()[0])
+            rprint(table)
 
-        rprint(f"[green]下载完成！[/green]成功下载 {success_amount} 个文件，失败 {files_id_amount - success_amount} 个文件。")
         rprint(f"[cyan]下载路径: [/cyan]{dest}")
         return
@@ -1,12 +1,10 @@
 import asyncio
 import logging
 import uuid
-from functools import partial
 from textwrap import dedent
 from typing import Annotated, List, Optional
 
 import typer
-from asyncer import syncify
 from rich import print as rprint
 from rich.progress import (
     BarColumn,
@@ -19,8 +17,9 @@ from rich.progress import (
 from rich.table import Table
 
 from ...load_config import load_config
-from ...login.login import CredentialManager, ZjuAsyncClient
+from ...login.login import CredentialManager, ZjuAsyncClient, session_manager
 from ...zjuAPI import zju_api
+from ...zjuAPI.models import Rollcall
 from ..state import state
 from .subcommand import rollcall_config
 
@@ -78,7 +77,7 @@ async def answer_radar_rollcall(rollcall_id: int, site: str):
         raise typer.Exit(code=1)
         
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
         raw_rollcall_answer_list = await zju_api.rollcallAnswerRadarAPIFits(
             client.session, rollcall_id, rollcall_data
         ).put_api_data()
@@ -157,7 +156,7 @@ async def answer_number_rollcall(rollcall_id: int, number_code: str|None):
         logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
         if number_code:
             rollcall_data = {
                 "deviceId": device_id,
@@ -241,7 +240,7 @@ async def answer_number_rollcall(rollcall_id: int, number_code: str|None):
               $ lazy rollcall list
                 (查看当前正在进行的签到任务) 
         """))
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def list_rollcall():
     """
     查看学在浙大正在进行的签到任务。
@@ -258,10 +257,10 @@ async def list_rollcall():
             logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with session_manager.client(cookies=cookies, trust_env=state.trust_env) as client:
             raw_rollcalls_list = (await zju_api.rollcallListAPIFits(client.session).get_api_data())[0]
         
-        rollcalls_list: List[dict] = raw_rollcalls_list.get("rollcalls", [])
+        rollcalls_list: List[Rollcall] = Rollcall.decode_list(raw_rollcalls_list.get("rollcalls", []))
 
         progress.update(task, description="渲染数据中...", completed=1)
 
@@ -283,10 +282,10 @@ async def list_rollcall():
         rollcall_list_table.add_column("签到属性", ratio=2)
 
         for rollcall in rollcalls_list:
-            rollcall_course_title = rollcall.get("course_title", "null")
-            rollcall_initiator = rollcall.get("created_by_name", "null")
-            rollcall_id = str(rollcall.get("rollcall_id", "null"))
-            rollcall_is_radar = rollcall.get("is_radar", False)
+            rollcall_course_title = rollcall.course_title or "null"
+            rollcall_initiator = rollcall.created_by_name or "null"
+            rollcall_id = str(rollcall.rollcall_id or "null")
+            rollcall_is_radar = rollcall.is_radar
 
             rollcall_description = "雷达点名" if rollcall_is_radar else "非雷达点名"
 
@@ -328,7 +327,7 @@ async def list_rollcall():
                 (以"2333"应答ID为"114514"的数字点名任务)
         """),
         no_args_is_help=True)
-@partial(syncify, raise_sync_error=False)
+@session_manager.syncify
 async def answer_rollcall(
     rollcall_id: Annotated[int, typer.Argument(help="签到任务id")],
     
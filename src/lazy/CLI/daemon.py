@@ -0,0 +1,382 @@
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 本模块的客户端部分（should_forward、forward_to_daemon 等）只依赖标准库，
+# 以免转发命令前就导入 typer、rich、httpx 等依赖
+
+# 通信协议：每条消息为一行 UTF-8 编码的JSON
+# - 客户端 -> 后台进程: {"type": "run", "argv": [...], "cwd": ..., "width": ..., "tty": ..., "protocol": ...}，
+#   或 {"type": "status"}、{"type": "shutdown"}、{"type": "credentials"}、{"type": "credentials_changed"}
+# - 后台进程 -> 客户端: 若干 {"type": "stdout"|"stderr", "data": ...}，最后为 {"type": "exit", "code": ...}；
+#   状态查询返回 {"type": "status", ...}，凭据查询返回 {"type": "credentials", "secrets": {...}}，
+#   拒绝执行时返回 {"type": "rejected", "reason": ...}
+DAEMON_SOCKET = Path.home() / ".lazy_cli_daemon.sock"
+# 协议版本，与后台进程不一致时在本进程中执行
+DAEMON_PROTOCOL_VERSION = 1
+# 设置此环境变量后不转发命令
+DAEMON_DISABLE_ENV = "LAZY_NO_DAEMON"
+# 连接后台进程的超时（秒），超时视为未运行
+DAEMON_CONNECT_TIMEOUT = 0.5
+# 空闲超过此时长（秒）后后台进程自动退出
+DAEMON_IDLE_TIMEOUT = 3600
+
+# 转发给后台进程的命令：{命令组: 子命令}，均为不需要交互输入的只读命令
+DAEMON_COMMANDS = {
+    "course": {"ls", "list", "view"},
+    "assignment": {"vw", "view", "td", "todo"},
+    "resource": {"ls", "list"},
+    "rollcall": {"ls", "list"},
+}
+
+# 在本进程中处理的全局选项
+LOCAL_OPTIONS = {"--help", "-h", "--install-completion", "--show-completion"}
+
+logger = logging.getLogger(__name__)
+
+def should_forward(argv: list[str])->bool:
+    """判断命令是否可以转交后台进程执行
+
+    Parameters
+    ----------
+    argv : list[str]
+        不含程序名的命令行参数
+
+    Returns
+    -------
+    bool
+        是否可以转发
+    """
+    if any(arg in LOCAL_OPTIONS for arg in argv):
+        return False
+
+    # 全局选项均为开关，跳过后即为命令组与子命令
+    args = list(argv)
+    while args and args[0].startswith("-"):
+        args.pop(0)
+
+    return len(args) >= 2 and args[1] in DAEMON_COMMANDS.get(args[0], ())
+
+def daemon_supported()->bool:
+    return hasattr(socket, "AF_UNIX")
+
+def connect(socket_path: Path = DAEMON_SOCKET, timeout: float = DAEMON_CONNECT_TIMEOUT)->socket.socket|None:
+    """连接后台进程，未运行时返回 None
+    """
+    if not daemon_supported() or not socket_path.exists():
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(str(socket_path))
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+def send_message(connection: socket.socket, message: dict):
+    connection.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+def read_messages(connection: socket.socket):
+    """逐条产出收到的消息，连接关闭时结束
+    """
+    with connection.makefile("rb") as reader:
+        for line in reader:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.error("后台进程返回的消息格式有误！")
+                return
+
+def request(message: dict, socket_path: Path = DAEMON_SOCKET)->dict|None:
+    """向后台进程发送控制消息并返回应答，后台进程未运行时返回 None
+    """
+    connection = connect(socket_path)
+    if connection is None:
+        return None
+
+    with connection:
+        try:
+            send_message(connection, message)
+            return next(read_messages(connection), None)
+        except OSError:
+            return None
+
+def forward_to_daemon(argv: list[str], socket_path: Path = DAEMON_SOCKET)->int|None:
+    """把命令转交后台进程执行，并将其输出写到本进程的标准输出与标准错误
+
+    Parameters
+    ----------
+    argv : list[str]
+        不含程序名的命令行参数
+    socket_path : Path, optional
+        后台进程的套接字, by default DAEMON_SOCKET
+
+    Returns
+    -------
+    int | None
+        命令的退出码；未转发（不适合转发、后台进程未运行或拒绝执行）时返回 None，调用方应在本进程中执行
+    """
+    if os.environ.get(DAEMON_DISABLE_ENV) or not should_forward(argv):
+        return None
+
+    connection = connect(socket_path)
+    if connection is None:
+        return None
+
+    received_output = False
+    with connection:
+        try:
+            send_message(connection, {
+                "type": "run",
+                "argv": argv,
+                "cwd": os.getcwd(),
+                "width": shutil.get_terminal_size().columns,
+                "tty": sys.stdout.isatty(),
+                "protocol": DAEMON_PROTOCOL_VERSION
+            })
+            # 命令本身可能需要较长时间
+            connection.settimeout(None)
+
+            for message in read_messages(connection):
+                message_type = message.get("type")
+                if message_type in ("stdout", "stderr"):
+                    received_output = True
+                    stream = sys.stdout if message_type == "stdout" else sys.stderr
+                    stream.write(message.get("data", ""))
+                    stream.flush()
+                elif message_type == "exit":
+                    return int(message.get("code", 0))
+                elif message_type == "rejected":
+                    return None
+        except KeyboardInterrupt:
+            return 130
+        except OSError:
+            pass
+
+    # 尚未输出任何内容时可以安全地改为在本进程中执行
+    if not received_output:
+        return None
+
+    sys.stderr.write("与后台进程的连接中断！\n")
+    return 1
+
+class _FrameWriter(io.TextIOBase):
+    """把写入的文本作为消息发送给客户端的文件对象
+
+    进度条在刷新线程中写入，同一连接上的写入以锁串行化，避免消息交错
+    """
+    def __init__(self, connection: socket.socket, stream: str, tty: bool, lock: threading.Lock):
+        self._connection = connection
+        self._stream = stream
+        self._tty = tty
+        self._lock = lock
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self)->bool:
+        return True
+
+    def isatty(self)->bool:
+        return self._tty
+
+    def write(self, data: str)->int:
+        if data:
+            with self._lock:
+                send_message(self._connection, {"type": self._stream, "data": data})
+        return len(data)
+
+class LazyDaemon:
+    """常驻后台进程，依次执行客户端转发来的命令
+
+    后台进程在内存中保留已导入的命令、接口注册表与共享会话，CLI 执行只读命令前先尝试连接后台进程，
+    连接成功则把命令转交给它执行并回显输出，后台进程未运行时照常在本进程中执行。
+    所有命令共享同一个事件循环与会话，连接在命令之间保持；
+    每条命令开始前清空请求合并保留的结果，其余缓存与命令行执行时一致。
+    凭据缓存配置为"daemon"时，后台进程还向其它 CLI 进程提供它已读取的 keyring 凭据。
+
+    Parameters
+    ----------
+    socket_path : Path, optional
+        监听的套接字, by default DAEMON_SOCKET
+    idle_timeout : float, optional
+        空闲超过此时长（秒）后退出，0 表示不自动退出, by default DAEMON_IDLE_TIMEOUT
+    """
+    def __init__(self, socket_path: Path = DAEMON_SOCKET, idle_timeout: float = DAEMON_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.requests = 0
+        self._running = False
+        self._command = None
+
+    def serve(self):
+        """监听套接字并处理请求，直到收到停止请求或空闲超时
+        """
+        if request({"type": "status"}, self.socket_path) is not None:
+            logger.error("后台进程已在运行！")
+            return
+
+        # 清理异常退出后残留的套接字文件
+        self.socket_path.unlink(missing_ok=True)
+
+        self._warm_up()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # 套接字只允许当前用户访问，后台进程持有已登录的会话
+        previous_umask = os.umask(0o077)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+        server.listen()
+        server.settimeout(self.idle_timeout or None)
+
+        logger.info(f"后台进程已启动，PID: {os.getpid()}，套接字: {self.socket_path}")
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    connection, _address = server.accept()
+                except socket.timeout:
+                    logger.info(f"空闲超过 {self.idle_timeout} 秒，后台进程退出")
+                    break
+
+                with connection:
+                    try:
+                        self._handle(connection)
+                    except OSError as e:
+                        logger.warning(f"与客户端的连接中断: {e}")
+        finally:
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+            logger.info(f"后台进程已退出，共执行 {self.requests} 条命令")
+
+    def status(self)->dict:
+        return {
+            "type": "status",
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "requests": self.requests,
+            "protocol": DAEMON_PROTOCOL_VERSION
+        }
+
+    def _warm_up(self):
+        """预先导入可转发的命令组并加载接口注册表
+        """
+        import typer
+
+        from ..load_config.api_registry import api_registry
+        from .CLI import app
+
+        self._command = typer.main.get_command(app)
+        for group_name in DAEMON_COMMANDS:
+            self._command._load_subcommand(group_name)
+        api_registry.load()
+
+    def _handle(self, connection: socket.socket):
+        message = next(read_messages(connection), None)
+        if message is None:
+            return
+
+        message_type = message.get("type")
+        if message_type == "status":
+            send_message(connection, self.status())
+        elif message_type == "shutdown":
+            self._running = False
+            send_message(connection, {"type": "ok"})
+        elif message_type == "credentials":
+            send_message(connection, self._credentials())
+        elif message_type == "credentials_changed":
+            from ..login.credential_broker import credential_broker
+
+            credential_broker.clear()
+            send_message(connection, {"type": "ok"})
+        elif message_type == "run":
+            if message.get("protocol") != DAEMON_PROTOCOL_VERSION:
+                send_message(connection, {"type": "rejected", "reason": "协议版本不一致"})
+                return
+            if not should_forward(message.get("argv") or []):
+                send_message(connection, {"type": "rejected", "reason": "不支持的命令"})
+                return
+
+            code = self._run(connection, message)
+            send_message(connection, {"type": "exit", "code": code})
+        else:
+            send_message(connection, {"type": "rejected", "reason": f"未知的消息类型 {message_type}"})
+
+    def _credentials(self)->dict:
+        from ..login.credential_broker import credential_broker
+
+        if credential_broker.cache_mode != "daemon":
+            return {"type": "rejected", "reason": "未启用后台进程凭据缓存"}
+
+        try:
+            return {"type": "credentials", "secrets": credential_broker.snapshot()}
+        except Exception as e:
+            logger.error(f"读取凭据失败: {e}")
+            return {"type": "rejected", "reason": "读取凭据失败"}
+
+    def _run(self, connection: socket.socket, message: dict)->int:
+        import traceback
+        from contextlib import redirect_stderr, redirect_stdout, suppress
+
+        import rich
+
+        from ..zjuAPI.single_flight import single_flight
+
+        argv: list = message["argv"]
+        tty = bool(message.get("tty"))
+        width = message.get("width") or 80
+        lock = threading.Lock()
+        stdout = _FrameWriter(connection, "stdout", tty, lock)
+        stderr = _FrameWriter(connection, "stderr", tty, lock)
+
+        self.requests += 1
+        logger.info(f"执行转发的命令: {' '.join(argv)}")
+        # 合并保留的结果只在一条命令内有效
+        single_flight.clear()
+
+        saved_argv, saved_cwd, saved_columns = sys.argv, os.getcwd(), os.environ.get("COLUMNS")
+        sys.argv = ["lazy", *argv]
+        os.environ["COLUMNS"] = str(width)
+        with suppress(OSError):
+            os.chdir(message.get("cwd") or saved_cwd)
+        # 客户端为终端时进度条照常刷新，刷新内容随输出一并转发
+        rich.reconfigure(file=stdout, width=width, force_terminal=tty, force_interactive=tty)
+
+        code = 0
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    self._command.main(args=argv, prog_name="lazy", standalone_mode=True)
+                except SystemExit as e:
+                    code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except OSError:
+                    raise
+                except Exception:
+                    logger.exception(f"执行 {' '.join(argv)} 时发生错误")
+                    stderr.write(traceback.format_exc())
+                    code = 1
+        finally:
+            sys.argv = saved_argv
+            os.chdir(saved_cwd)
+            if saved_columns is None:
+                os.environ.pop("COLUMNS", None)
+            else:
+                os.environ["COLUMNS"] = saved_columns
+            rich.reconfigure()
+
+        return code
@@ -0,0 +1,107 @@
+import functools
+import importlib
+import sys
+from contextlib import contextmanager
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+try:
+    # 新版 typer 内置了 click
+    from typer import _click as click
+except ImportError:
+    import click
+
+# typer 为顶层应用添加的补全选项
+COMPLETION_PARAM_NAMES = ("install_completion", "show_completion")
+
+class LazyTyperGroup(TyperGroup):
+    """按需导入子命令组的 TyperGroup
+
+    子类通过`lazy_subcommands`声明 {命令组名: (模块路径, 帮助文本)}，模块需提供名为`app`的 typer.Typer。
+    只有真正执行某个命令组时才导入对应模块及其依赖；列出帮助与补全顶层命令时使用占位命令，不会触发导入。
+    """
+    lazy_subcommands: dict[str, tuple[str, str]] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loaded_subcommands: dict[str, click.Command] = {}
+        self._listing_only = False
+
+    def list_commands(self, ctx: click.Context)->list[str]:
+        return [*super().list_commands(ctx), *self.lazy_subcommands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str)->click.Command|None:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        if self._listing_only and cmd_name not in self._loaded_subcommands:
+            _module_path, help_text = self.lazy_subcommands[cmd_name]
+            return TyperCommand(name=cmd_name, help=help_text)
+
+        return self._load_subcommand(cmd_name)
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter):
+        with self._listing():
+            return super().format_help(ctx, formatter)
+
+    def shell_complete(self, ctx: click.Context, incomplete: str):
+        with self._listing():
+            return super().shell_complete(ctx, incomplete)
+
+    def _load_subcommand(self, cmd_name: str)->click.Command:
+        if cmd_name not in self._loaded_subcommands:
+            module_path, help_text = self.lazy_subcommands[cmd_name]
+            module = importlib.import_module(module_path)
+            command = typer.main.get_command(module.app)
+            command.name = cmd_name
+            # get_command 按顶层应用构建，会带上补全选项；add_typer 挂载的命令组没有这两个选项
+            command.params = [param for param in command.params if param.name not in COMPLETION_PARAM_NAMES]
+            # 与 add_typer(help=...) 一致，以注册时的帮助文本为准
+            command.help = help_text
+            self._loaded_subcommands[cmd_name] = command
+
+        return self._loaded_subcommands[cmd_name]
+
+    @contextmanager
+    def _listing(self):
+        self._listing_only = True
+        try:
+            yield
+        finally:
+            self._listing_only = False
+
+def lazy_syncify(async_function):
+    """与`session_manager.syncify`相同，但在调用时才导入会话管理器及其网络依赖
+    """
+    @functools.wraps(async_function)
+    def wrapper(*args, **kwargs):
+        from ..login.login import session_manager
+
+        return session_manager.run(async_function(*args, **kwargs))
+
+    return wrapper
+
+def close_session_manager():
+    """关闭会话管理器，未曾导入时说明本次调用没有发起网络请求，无需处理
+    """
+    login_module = sys.modules.get(f"{__package__.rsplit('.', 1)[0]}.login.login")
+    if login_module is not None:
+        login_module.session_manager.close()
+
+def log_request_stats():
+    """记录响应缓存、请求合并与请求重试的统计，未曾导入时说明本次调用没有发起对应的请求
+    """
+    zju_api_package = f"{__package__.rsplit('.', 1)[0]}.zjuAPI"
+
+    cache_module = sys.modules.get(f"{zju_api_package}.response_cache")
+    if cache_module is not None:
+        cache_module.response_cache.log_stats()
+
+    single_flight_module = sys.modules.get(f"{zju_api_package}.single_flight")
+    if single_flight_module is not None:
+        single_flight_module.single_flight.log_stats()
+
+    policy_module = sys.modules.get(f"{zju_api_package}.request_policy")
+    if policy_module is not None:
+        policy_module.request_policy.log_stats()
@@ -6,5 +6,7 @@ class State:
     def __init__(self):
         # self.client: ZjuClient = None
         self.trust_env: bool = True
+        # 先以缓存内容渲染，再联网刷新
+        self.stale_while_revalidate: bool = False
 
 state = State()
\ No newline at end of file
@@ -1,10 +1,24 @@
-from .CLI.CLI import app
+import sys
+
+from .CLI.daemon import forward_to_daemon
 from .printlog.print_log import setup_global_logging
 
 
 def main():
+    # 后台进程在运行时，只读命令直接转交给它执行，无需导入命令及其依赖
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from .CLI.CLI import app
+    from .CLI.lazy_group import close_session_manager, log_request_stats
+
     setup_global_logging()
-    app()
+    try:
+        app()
+    finally:
+        log_request_stats()
+        close_session_manager()
 
 
 if __name__ == "__main__":
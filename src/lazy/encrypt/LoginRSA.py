@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 class RSAKeyPython:
     def __init__(self, public_exponent_hex: str, modulus_hex: str):
         """
@@ -25,6 +28,13 @@ class RSAKeyPython:
         elif self.chunkSize <= 0 and self.m <= 0xFFFF and self.m != 0 : 
              pass
 
+@lru_cache(maxsize=8)
+def get_rsa_key(public_exponent_hex: str, modulus_hex: str) -> RSAKeyPython:
+    """
+    按公钥指数与模数缓存 RSA 密钥对象，同一公钥只解析一次。
+    """
+    return RSAKeyPython(public_exponent_hex=public_exponent_hex, modulus_hex=modulus_hex)
+
 def encrypted_string_python(key: RSAKeyPython, s: str) -> str:
     """
     使用给定的 RSA 密钥加密字符串 s。
@@ -0,0 +1,138 @@
+import copy
+import logging
+import re
+from functools import lru_cache
+
+from .load_config import BaseConfig, apiListConfig
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PATTERN = re.compile(r"<(\w+)>")
+
+class URLTemplate:
+    """预编译的 API url 模板，将 `<placeholder>` 形式的占位符转换为具名字段
+    """
+    def __init__(self, url: str):
+        self.url = url
+        self.fields: tuple = tuple(PLACEHOLDER_PATTERN.findall(url))
+        # 先转义原有的花括号，再将占位符替换为 str.format 字段
+        escaped_url = url.replace("{", "{{").replace("}", "}}")
+        self._format_string = PLACEHOLDER_PATTERN.sub(r"{\1}", escaped_url)
+
+    def render(self, **values)->str|None:
+        """以具名参数填充占位符
+
+        Returns
+        -------
+        str | None
+            填充完成的url，缺少占位符取值时返回None
+        """
+        if not self.fields:
+            return self.url
+
+        missing_fields = [field for field in self.fields if field not in values]
+        if missing_fields:
+            logger.error(f"{self.url} 缺少占位符取值: {', '.join(missing_fields)}")
+            return None
+
+        return self._format_string.format(**{field: values[field] for field in self.fields})
+
+@lru_cache(maxsize=256)
+def compile_url_template(url: str)->URLTemplate:
+    return URLTemplate(url)
+
+class APIEndpoint:
+    """api_list.json 中单个接口的预编译结果
+    """
+    def __init__(self, group: str, name: str, raw_config: dict):
+        self.group  = group
+        self.name   = name
+        self.config = raw_config
+        self.url: str|None = raw_config.get("url")
+        self.method: str = str(raw_config.get("method", "GET")).upper()
+        self.template = compile_url_template(self.url) if self.url else None
+
+    def render_url(self, **values)->str|None:
+        if self.template is None:
+            logger.error(f"{self.group}.{self.name} 缺少url！")
+            return None
+
+        return self.template.render(**values)
+
+    def default_params(self)->dict|None:
+        """返回默认params的副本，调用方可以放心修改"""
+        return copy.deepcopy(self.config.get("params"))
+
+    def default_data(self)->dict|None:
+        """返回默认data的副本，调用方可以放心修改"""
+        return copy.deepcopy(self.config.get("data"))
+
+class APIRegistry:
+    """进程内的接口注册表，api_list.json 在每个进程中只解析一次
+
+    `group()` 返回的配置在所有 APIFits 实例间共享，应视为只读；
+    需要修改 params 或 data 时请使用 `APIEndpoint.default_params()` 与 `APIEndpoint.default_data()` 获取副本。
+    """
+    def __init__(self, config: BaseConfig|None = None):
+        self._config_file = config
+        self._groups: dict[str, dict]|None = None
+        self._endpoints: dict[str, dict[str, APIEndpoint]] = {}
+
+    def load(self, force: bool = False):
+        """解析并预编译 api_list.json
+        """
+        if self._groups is not None and not force:
+            return
+
+        if self._config_file is None:
+            self._config_file = apiListConfig()
+
+        raw_api_list = self._config_file.load_config()
+        self._groups = {}
+        self._endpoints = {}
+
+        for group_name, group_config in raw_api_list.items():
+            if not isinstance(group_config, dict):
+                logger.warning(f"{group_name} 配置项格式有误，已忽略！")
+                continue
+
+            apis_config: dict = group_config.get("apis_config", {}) or {}
+            self._groups[group_name] = {
+                "apis_name": list(group_config.get("apis_name", []) or []),
+                "apis_config": apis_config
+            }
+            self._endpoints[group_name] = {
+                api_name: APIEndpoint(group_name, api_name, api_config)
+                for api_name, api_config in apis_config.items()
+                if isinstance(api_config, dict)
+            }
+
+        logger.info(f"接口注册表加载完成，共 {sum(map(len, self._endpoints.values()))} 个接口")
+
+    def reload(self):
+        self.load(force=True)
+
+    def group(self, name: str)->dict|None:
+        """获取接口组配置，返回结构与 api_list.json 中对应项一致
+
+        Returns
+        -------
+        dict | None
+            包含"apis_name"与"apis_config"的dict，接口组不存在时返回None
+        """
+        self.load()
+        group_config = self._groups.get(name)
+        if group_config is None:
+            return None
+
+        # apis_name 可能被调用方改写，仅复制这一层
+        return {
+            "apis_name": list(group_config["apis_name"]),
+            "apis_config": group_config["apis_config"]
+        }
+
+    def endpoint(self, group: str, name: str)->APIEndpoint|None:
+        self.load()
+        return self._endpoints.get(group, {}).get(name)
+
+api_registry = APIRegistry()
@@ -0,0 +1,121 @@
+import importlib.util
+import json
+import logging
+import os
+from typing import IO, Any
+
+# 按优先顺序尝试的解码后端
+JSON_BACKENDS = ("msgspec", "orjson", "json")
+# 指定后端的环境变量，取值为 JSON_BACKENDS 之一
+JSON_BACKEND_ENV = "LAZY_JSON_BACKEND"
+
+logger = logging.getLogger(__name__)
+
+class JsonCodec:
+    """可替换后端的JSON编解码器
+
+    安装了 msgspec 或 orjson 时使用它们解码，否则回退到标准库 json；解码失败统一抛出 ValueError。
+    使用 msgspec 时，`loads`可以按`schema`（TypedDict）解码，只保留其中声明的字段，
+    数据与 schema 不符时回退为不带 schema 的解码。
+
+    编码时 orjson 只支持两空格缩进，其它缩进回退到标准库；输出均不转义非 ASCII 字符。
+
+    Parameters
+    ----------
+    backend : str | None, optional
+        "msgspec"、"orjson"或"json"，None 时读取环境变量`LAZY_JSON_BACKEND`，未设置则自动选择, by default None
+    """
+    def __init__(self, backend: str|None = None):
+        self.backend = self._select_backend(backend or os.environ.get(JSON_BACKEND_ENV))
+        self._decoders: dict = {}
+
+        if self.backend == "msgspec":
+            import msgspec
+            self._msgspec = msgspec
+        elif self.backend == "orjson":
+            import orjson
+            self._orjson = orjson
+
+    def loads(self, data: bytes|str, schema: Any = None)->Any:
+        """解码JSON
+
+        Parameters
+        ----------
+        data : bytes | str
+            JSON文本，bytes 须为 UTF-8 编码
+        schema : Any, optional
+            期望的类型，通常为 TypedDict，仅 msgspec 后端使用, by default None
+
+        Returns
+        -------
+        Any
+            解码结果
+
+        Raises
+        ------
+        ValueError
+            不是合法的JSON
+        """
+        if self.backend == "msgspec":
+            return self._msgspec_loads(data, schema)
+
+        if self.backend == "orjson":
+            return self._orjson.loads(data)
+
+        return json.loads(data)
+
+    def load(self, f: IO)->Any:
+        """从文件对象解码JSON，文本与二进制模式均可"""
+        return self.loads(f.read())
+
+    def dumps(self, obj: Any, indent: int|None = None)->str:
+        """编码为JSON文本，不转义非 ASCII 字符"""
+        if self.backend == "orjson" and indent in (None, 2):
+            option = self._orjson.OPT_INDENT_2 if indent == 2 else 0
+            return self._orjson.dumps(obj, option=option).decode("utf-8")
+
+        if self.backend == "msgspec" and indent is None:
+            return self._msgspec.json.encode(obj).decode("utf-8")
+
+        return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+    def dump(self, obj: Any, f: IO[str], indent: int|None = None):
+        """编码后写入以文本模式打开的文件对象"""
+        f.write(self.dumps(obj, indent=indent))
+
+    def _msgspec_loads(self, data: bytes|str, schema: Any)->Any:
+        msgspec = self._msgspec
+        try:
+            return self._decoder(schema).decode(data)
+        except msgspec.ValidationError as e:
+            logger.debug(f"JSON与 schema 不符，回退为不带 schema 的解码: {e}")
+            try:
+                return self._decoder(None).decode(data)
+            except msgspec.DecodeError as decode_error:
+                raise ValueError(str(decode_error)) from decode_error
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def _decoder(self, schema: Any):
+        decoder = self._decoders.get(schema)
+        if decoder is None:
+            decoder = self._msgspec.json.Decoder(schema) if schema is not None else self._msgspec.json.Decoder()
+            self._decoders[schema] = decoder
+        return decoder
+
+    def _select_backend(self, backend: str|None)->str:
+        if backend is not None:
+            if backend not in JSON_BACKENDS:
+                logger.warning(f"未知的JSON后端 {backend}，将自动选择")
+            elif backend == "json" or importlib.util.find_spec(backend) is not None:
+                return backend
+            else:
+                logger.warning(f"未安装 {backend}，将自动选择JSON后端")
+
+        for candidate in JSON_BACKENDS:
+            if candidate == "json" or importlib.util.find_spec(candidate) is not None:
+                return candidate
+
+        return "json"
+
+json_codec = JsonCodec()
@@ -1,8 +1,9 @@
-import json
 import logging
 import sys
 from pathlib import Path
 
+from .json_codec import json_codec
+
 logger = logging.getLogger(__name__)
 
 def resource_path(relative_path: str) -> Path:
@@ -36,12 +37,12 @@ class BaseConfig:
         config = None
         # print(self.config_path)
         try:
-            with open(self.config_path) as f:
-                config = json.load(f)
+            with open(self.config_path, "rb") as f:
+                config = json_codec.load(f)
             logger.info(f"配置文件 '{self.config_name}'加载成功",)
         except FileNotFoundError:
             logger.warning(f"配置文件 '{self.config_name}' 未找到！",)
-        except json.JSONDecodeError: # 处理 JSON 格式错误
+        except ValueError: # 处理 JSON 格式错误
             logger.warning(f"配置文件 '{self.config_name}' 可能为空！",)
         except OSError as e: # 捕获其他 IO 错误
             logger.warning(f"配置读取失败，IO错误: {e}",)
@@ -70,7 +71,7 @@ class BaseConfig:
         logger.info(f"配置文件{self.config_name}更新中中...",)
         try:
             with open(self.config_path, "w", encoding='utf-8') as f: # 推荐添加 encoding
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+                json_codec.dump(config_data, f, indent=4)
             
             logger.info(f"{self.config_name}配置更新成功，路径{self.config_path}",)
 
@@ -0,0 +1,164 @@
+import time
+from http.cookiejar import Cookie, CookieJar
+
+import httpx
+
+from ..load_config.json_codec import json_codec
+
+# 会话文件的格式标识与版本，字段含义或顺序变化时递增版本
+COOKIE_JAR_FORMAT = "lazy-cookie-jar"
+COOKIE_JAR_VERSION = 1
+# 每个Cookie保存为一行，依次为以下字段
+COOKIE_FIELDS = ("name", "value", "domain", "path", "expires", "secure", "http_only", "domain_specified")
+
+def domain_matches(host: str, domain: str)->bool:
+    """`domain`下的Cookie是否会发送给`host`，domain 为空时视为匹配任意主机"""
+    domain = domain.lstrip(".")
+    return not domain or host == domain or host.endswith("." + domain)
+
+class PersistentCookieJar:
+    """可持久化的Cookie集合，保留域名、路径、过期时间等全部属性
+
+    序列化为带版本号的紧凑JSON，不使用 pickle：
+    `{"format": "lazy-cookie-jar", "version": 1, "saved_at": ..., "cookies": [[name, value, domain, ...], ...]}`，
+    行内字段顺序见`COOKIE_FIELDS`。读取时拒绝格式标识不符或版本更新的数据。
+
+    Parameters
+    ----------
+    cookies : list[Cookie]
+        Cookie列表
+    saved_at : float | None, optional
+        保存时间，None 时为当前时间, by default None
+    """
+    def __init__(self, cookies: list[Cookie], saved_at: float|None = None):
+        self.cookies = cookies
+        self.saved_at = time.time() if saved_at is None else saved_at
+
+    @classmethod
+    def from_cookies(cls, cookies: httpx.Cookies|CookieJar|dict)->"PersistentCookieJar":
+        """由会话的Cookies构造，dict 形式的Cookies没有域名与过期时间"""
+        if isinstance(cookies, httpx.Cookies):
+            jar = cookies.jar
+        elif isinstance(cookies, CookieJar):
+            jar = cookies
+        else:
+            jar = httpx.Cookies(cookies).jar
+
+        return cls(list(jar))
+
+    def dumps(self)->bytes:
+        rows = [
+            [
+                cookie.name,
+                cookie.value,
+                cookie.domain,
+                cookie.path,
+                cookie.expires,
+                cookie.secure,
+                cookie.has_nonstandard_attr("HttpOnly"),
+                cookie.domain_specified
+            ]
+            for cookie in self.cookies
+        ]
+        return json_codec.dumps({
+            "format": COOKIE_JAR_FORMAT,
+            "version": COOKIE_JAR_VERSION,
+            "saved_at": self.saved_at,
+            "cookies": rows
+        }).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: bytes)->"PersistentCookieJar":
+        """解析`dumps`的结果
+
+        Raises
+        ------
+        ValueError
+            不是会话文件格式，或由更新的版本写入
+        """
+        record = json_codec.loads(data)
+        if not isinstance(record, dict) or record.get("format") != COOKIE_JAR_FORMAT:
+            raise ValueError("不是Cookies文件格式")
+
+        version = record.get("version")
+        if not isinstance(version, int) or version > COOKIE_JAR_VERSION:
+            raise ValueError(f"不支持的Cookies文件版本: {version}")
+
+        cookies = []
+        for row in record.get("cookies") or []:
+            if not isinstance(row, list) or len(row) != len(COOKIE_FIELDS):
+                raise ValueError("Cookies文件中存在格式有误的条目")
+            cookies.append(cls._make_cookie(**dict(zip(COOKIE_FIELDS, row))))
+
+        return cls(cookies, saved_at=record.get("saved_at"))
+
+    def to_cookies(self, now: float|None = None)->httpx.Cookies:
+        """转换为可写入会话的 httpx.Cookies，跳过已过期的Cookie"""
+        now = time.time() if now is None else now
+        cookies = httpx.Cookies()
+        for cookie in self.cookies:
+            if not cookie.is_expired(now):
+                cookies.jar.set_cookie(cookie)
+
+        return cookies
+
+    def remaining(self, host: str, names: list[str], now: float|None = None)->float|None:
+        """登录Cookie距过期的秒数，已过期时为负数
+
+        在发送给`host`的Cookie中查找`names`，取其中最早的过期时间；
+        找不到，或其中有不带过期时间的会话Cookie时无法在本地判断，返回 None。
+
+        Parameters
+        ----------
+        host : str
+            主机
+        names : list[str]
+            标识登录状态的Cookie名称
+        now : float | None, optional
+            当前时间, by default None
+
+        Returns
+        -------
+        float | None
+            剩余秒数
+        """
+        now = time.time() if now is None else now
+        expires = [cookie.expires for cookie in self.cookies if cookie.name in names and domain_matches(host, cookie.domain)]
+        if not expires or None in expires:
+            return None
+
+        return min(expires) - now
+
+    def __len__(self):
+        return len(self.cookies)
+
+    @staticmethod
+    def _make_cookie(
+        name: str,
+        value: str,
+        domain: str,
+        path: str,
+        expires: int|None,
+        secure: bool,
+        http_only: bool,
+        domain_specified: bool
+    )->Cookie:
+        return Cookie(
+            version            = 0,
+            name               = name,
+            value              = value,
+            port               = None,
+            port_specified     = False,
+            domain             = domain,
+            domain_specified   = domain_specified,
+            domain_initial_dot = domain.startswith("."),
+            path               = path,
+            path_specified     = True,
+            secure             = secure,
+            expires            = expires,
+            discard            = expires is None,
+            comment            = None,
+            comment_url        = None,
+            rest               = {"HttpOnly": None} if http_only else {},
+            rfc2109            = False
+        )
@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import sys
+
+import keyring
+from cryptography.fernet import Fernet
+
+from ..load_config import load_config
+
+KEYRING_SERVICE_NAME = "lazy"
+KEYRING_STUDENTID_NAME = "studentid"
+KEYRING_PASSWORD_NAME = "password"
+KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
+ENCRYPTION_KEY_NAME = "session_encryption_key"
+# 一次读取的全部 keyring 条目
+CREDENTIAL_NAMES = (
+    KEYRING_STUDENTID_NAME,
+    KEYRING_PASSWORD_NAME,
+    KEYRING_LAZ_STUDENTID_NAME,
+    ENCRYPTION_KEY_NAME,
+)
+
+# 凭据缓存的默认配置，可在 global_config.json 的 "credentials" 项中覆盖
+# cache: "none" 不跨进程缓存；"kernel" 缓存在 Linux 内核密钥环中（需要 keyutils）；
+#        "daemon" 向正在运行的后台进程获取（见 lazy daemon）
+DEFAULT_CREDENTIAL_SETTINGS = {
+    "cache": "none",
+    # 内核密钥环中缓存的有效期（秒）
+    "cache_ttl": 900
+}
+# 内核密钥环中保存全部凭据的密钥描述
+KERNEL_KEY_DESCRIPTION = b"lazy:credentials"
+
+logger = logging.getLogger(__name__)
+
+class NullCredentialCache:
+    """不跨进程缓存凭据
+
+    缓存均提供三个方法：`load`取回凭据，未命中时返回 None；`store`保存从 keyring 读取的凭据；
+    `changed`在凭据写入后调用
+    """
+    def load(self)->dict|None:
+        return None
+
+    def store(self, secrets: dict):
+        pass
+
+    def changed(self, secrets: dict):
+        pass
+
+class KernelKeyringCache:
+    """把全部凭据作为一个 user 类型密钥缓存在 Linux 内核的会话密钥环中
+
+    同一登录会话中的后续进程只需一次系统调用即可取得凭据，不必访问桌面密钥环；
+    密钥到期后由内核删除，默认权限只允许持有会话密钥环的进程读取。
+
+    Parameters
+    ----------
+    ttl : int
+        有效期（秒）
+    """
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._keyutils = None
+        if sys.platform.startswith("linux"):
+            try:
+                import keyutils
+                self._keyutils = keyutils
+            except ImportError:
+                logger.warning("未安装 keyutils，无法使用内核密钥环缓存凭据")
+
+    def load(self)->dict|None:
+        if self._keyutils is None:
+            return None
+
+        try:
+            key_id = self._keyutils.request_key(KERNEL_KEY_DESCRIPTION, self._keyutils.KEY_SPEC_SESSION_KEYRING)
+            if key_id is None:
+                return None
+            secrets = json.loads(self._keyutils.read_key(key_id))
+        except (self._keyutils.Error, ValueError) as e:
+            logger.info(f"内核密钥环中的凭据不可用: {e}")
+            return None
+
+        return secrets if isinstance(secrets, dict) else None
+
+    def store(self, secrets: dict):
+        if self._keyutils is None:
+            return
+
+        try:
+            key_id = self._keyutils.add_key(
+                KERNEL_KEY_DESCRIPTION,
+                json.dumps(secrets).encode("utf-8"),
+                self._keyutils.KEY_SPEC_SESSION_KEYRING
+            )
+            self._keyutils.set_timeout(key_id, self.ttl)
+        except self._keyutils.Error as e:
+            logger.warning(f"凭据缓存至内核密钥环失败: {e}")
+
+    def changed(self, secrets: dict):
+        self.store(secrets)
+
+class DaemonCredentialCache:
+    """向正在运行的后台进程获取其已读取的凭据，后台进程未运行时返回 None
+    """
+    def load(self)->dict|None:
+        from ..CLI.daemon import DAEMON_DISABLE_ENV, request
+
+        # 后台进程自身从 keyring 读取
+        if os.environ.get(DAEMON_DISABLE_ENV):
+            return None
+
+        response = request({"type": "credentials"})
+        if response is None or not isinstance(response.get("secrets"), dict):
+            return None
+
+        return response["secrets"]
+
+    def store(self, secrets: dict):
+        # 后台进程自行从 keyring 读取
+        pass
+
+    def changed(self, secrets: dict):
+        from ..CLI.daemon import DAEMON_DISABLE_ENV, request
+
+        # 让后台进程重新读取
+        if not os.environ.get(DAEMON_DISABLE_ENV):
+            request({"type": "credentials_changed"})
+
+class CredentialBroker:
+    """进程内的 keyring 凭据代理
+
+    首次访问时一次性读取`lazy`服务下的全部条目并保存在内存中，之后同一进程内的读取不再访问 keyring；
+    写入时同时更新 keyring 与内存。按配置还可以先从内核密钥环或后台进程中获取，使后续进程也不必访问桌面密钥环。
+
+    Parameters
+    ----------
+    service_name : str, optional
+        keyring 服务名, by default KEYRING_SERVICE_NAME
+    names : tuple, optional
+        读取的条目, by default CREDENTIAL_NAMES
+    """
+    def __init__(self, service_name: str = KEYRING_SERVICE_NAME, names: tuple = CREDENTIAL_NAMES):
+        self.service_name = service_name
+        self.names = names
+        self.settings = dict(DEFAULT_CREDENTIAL_SETTINGS)
+        self._secrets: dict[str, str|None]|None = None
+        self._cache = None
+        self._settings_loaded = False
+
+    def configure(self, **settings):
+        """覆盖凭据缓存配置，需在首次读取前调用"""
+        self._load_settings()
+        self.settings.update(settings)
+        self._cache = None
+
+    def get(self, name: str)->str|None:
+        """读取凭据
+
+        Parameters
+        ----------
+        name : str
+            条目名称，如`KEYRING_PASSWORD_NAME`
+
+        Returns
+        -------
+        str | None
+            凭据，不存在时为 None
+        """
+        secrets = self._load()
+        if name not in secrets:
+            secrets[name] = keyring.get_password(self.service_name, name)
+        return secrets[name]
+
+    def set(self, name: str, value: str):
+        """写入凭据并更新缓存"""
+        keyring.set_password(self.service_name, name, value)
+        self._load()[name] = value
+        self._get_cache().changed(self.snapshot())
+
+    @property
+    def cache_mode(self)->str:
+        """跨进程缓存方式，取值为"none"、"kernel"或"daemon"
+        """
+        self._load_settings()
+        return self.settings.get("cache") or "none"
+
+    def get_encryption_key(self)->bytes:
+        """提取已有的会话加密密钥，如果不存在则创建并保存
+        """
+        key_hex = self.get(ENCRYPTION_KEY_NAME)
+        if key_hex:
+            return bytes.fromhex(key_hex)
+        # 生成新密钥并保存（十六进制）
+        new_key = Fernet.generate_key()
+        self.set(ENCRYPTION_KEY_NAME, new_key.hex())
+        return new_key
+
+    def snapshot(self)->dict:
+        """返回已读取的全部凭据，不存在的条目为 None"""
+        return dict(self._load())
+
+    def clear(self):
+        """丢弃内存中的凭据，下次读取时重新获取"""
+        self._secrets = None
+
+    def _load(self)->dict:
+        if self._secrets is not None:
+            return self._secrets
+
+        cached = self._get_cache().load()
+        if cached is not None and all(name in cached for name in self.names):
+            logger.info("从缓存中获取凭据")
+            self._secrets = dict(cached)
+            return self._secrets
+
+        self._secrets = {name: keyring.get_password(self.service_name, name) for name in self.names}
+        self._get_cache().store(self.snapshot())
+        return self._secrets
+
+    def _get_cache(self):
+        if self._cache is None:
+            self._load_settings()
+            cache = self.cache_mode
+            if cache == "kernel":
+                self._cache = KernelKeyringCache(int(self.settings.get("cache_ttl", DEFAULT_CREDENTIAL_SETTINGS["cache_ttl"])))
+            elif cache == "daemon":
+                self._cache = DaemonCredentialCache()
+            else:
+                self._cache = NullCredentialCache()
+        return self._cache
+
+    def _load_settings(self):
+        if self._settings_loaded:
+            return
+
+        self._settings_loaded = True
+        credential_settings = load_config.globalConfig().load_config().get("credentials", {})
+        if isinstance(credential_settings, dict):
+            self.settings.update(credential_settings)
+
+credential_broker = CredentialBroker()
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# 等待锁时的轮询间隔（秒）
+FILE_LOCK_POLL_INTERVAL = 0.1
+
+logger = logging.getLogger(__name__)
+
+class FileLock:
+    """基于锁文件的跨进程互斥锁，POSIX 上使用 flock，Windows 上使用 msvcrt.locking
+
+    锁随文件描述符释放，持有锁的进程异常退出时由操作系统自动释放，不会遗留死锁。
+    等待时以`asyncio.sleep`轮询，不阻塞事件循环；同一进程内的协程之间也互斥，
+    但锁不可重入，进程内应另以 asyncio.Lock 串行化。
+
+    Parameters
+    ----------
+    lock_file : Path
+        锁文件，不存在时自动创建
+    timeout : float
+        等待锁的最长时间（秒）
+    """
+    def __init__(self, lock_file: Path, timeout: float):
+        self.lock_file = lock_file
+        self.timeout = timeout
+        self._fd: int|None = None
+
+    @property
+    def locked(self)->bool:
+        return self._fd is not None
+
+    def try_acquire(self)->bool:
+        """尝试获取锁，不等待
+
+        Returns
+        -------
+        bool
+            是否获取成功
+        """
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        return True
+
+    async def acquire(self)->bool:
+        """等待并获取锁
+
+        Returns
+        -------
+        bool
+            是否在`timeout`内获取成功
+        """
+        deadline = time.monotonic() + self.timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                logger.warning(f"等待 {self.lock_file} 超过 {self.timeout} 秒，放弃加锁")
+                return False
+            await asyncio.sleep(FILE_LOCK_POLL_INTERVAL)
+
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.warning(f"释放 {self.lock_file} 失败: {e}")
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    async def __aenter__(self)->bool:
+        return await self.acquire()
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        self.release()
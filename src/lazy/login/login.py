@@ -1,5 +1,12 @@
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
+import os
 import pickle
+import time
 import traceback
 from pathlib import Path
 
@@ -13,16 +20,44 @@ from requests.exceptions import ConnectionError, HTTPError
 
 from ..encrypt import LoginRSA
 from ..load_config import load_config
+from .cookie_jar import PersistentCookieJar
+from .credential_broker import (
+    KEYRING_PASSWORD_NAME,
+    KEYRING_STUDENTID_NAME,
+    credential_broker,
+)
+from .file_lock import FileLock
 
 CURRENT_SCRIPT_PATH = Path(__file__)
 USER_AVATAR_PATH = CURRENT_SCRIPT_PATH.parent.parent.parent.parent / "images/user_avatar.png"
 
-KEYRING_SERVICE_NAME = "lazy"
-KEYRING_STUDENTID_NAME = "studentid"
-KEYRING_PASSWORD_NAME = "password"
-KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
-ENCRYPTION_KEY_NAME = "session_encryption_key"
 SESSION_FILE = Path.home() / ".lazy_cli_session.enc"
+SESSION_VALIDATION_FILE = Path.home() / ".lazy_cli_session.validated"
+# 跨进程的登录锁，同一时间只有一个进程登录并改写会话文件
+SESSION_LOCK_FILE = Path.home() / ".lazy_cli_session.lock"
+# 等待其他进程登录的最长时间（秒），超时后自行登录
+LOGIN_LOCK_TIMEOUT = 60
+
+# 共享会话连接池的默认配置，可在 global_config.json 的 "session" 项中覆盖
+DEFAULT_SESSION_SETTINGS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+    # 会话验证通过后，在此时长（秒）内跳过登录状态探测
+    "validation_ttl": 600,
+    # 标识学在浙大登录状态的Cookie，带有过期时间时据此在本地判断会话是否有效
+    "auth_cookies": ["session"],
+    # 登录Cookie剩余有效期少于此时长（秒）时在后台提前重新登录
+    "refresh_ahead": 600
+}
+
+# 学在浙大接口所在主机与统一身份认证主机
+COURSES_HOST = "courses.zju.edu.cn"
+CAS_HOST = "zjuam.zju.edu.cn"
+# 登录入口，未登录时跳转至统一身份认证登录页，登录后为学在浙大首页
+COURSES_INDEX_URL = f"https://{COURSES_HOST}/user/index#/"
+CAS_PUBKEY_URL = f"https://{CAS_HOST}/cas/v2/getPubKey"
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +69,31 @@ def generate_encryption_key()->bytes:
     bytes
         _description_
     """    
-    key_hex = keyring.get_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME)
-    if key_hex:
-        return bytes.fromhex(key_hex)
-    # 生成新密钥
-    new_key = Fernet.generate_key()
-    # 保存密钥（十六进制）
-    keyring.set_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME, password=new_key.hex())
-    return new_key        
+    return credential_broker.get_encryption_key()
+
+def session_file_stamp(stat_result: os.stat_result|None = None)->tuple|None:
+    """会话文件的版本标识，文件被替换或改写后随之变化，文件不存在时为 None
+    """
+    if stat_result is None:
+        try:
+            stat_result = os.stat(SESSION_FILE)
+        except OSError:
+            return None
+
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+class CookiesSaveError(RuntimeError):
+    """登录成功但会话Cookies未能保存"""
 
 # 凭据管理器
 class CredentialManager:
     """加密、解密、加载与保存会话/Cookies文件
+
+    会话文件以先写临时文件再重命名的方式原子地替换，并发读取的进程不会读到写了一半的文件。
+    `seen_stamp`记录本进程最近一次读取或写入的会话文件版本，用于发现其他进程已经完成了重新登录。
     """
+    seen_stamp: tuple|None = None
+
     def __init__(self):
         # 初始化加密器
         logger.info("初始化加密器中...")
@@ -57,51 +104,125 @@ class CredentialManager:
     def _generate_encryption_key(self)->bytes:
         """提取已有的会话加密密钥，如果不存在则创建并保存
         """    
-        key_hex = keyring.get_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME)
-        if key_hex:
-            return bytes.fromhex(key_hex)
-        # 生成新密钥
-        new_key = Fernet.generate_key()
-        # 保存密钥（十六进制）
-        keyring.set_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME, password=new_key.hex())
-        return new_key
+        return credential_broker.get_encryption_key()
         
-    def save_cookies(self, cookies: dict)->bool:
-        """以序列化和加密的方式保存会话Cookies至本地家目录
+    def save_cookies(self, cookies: httpx.Cookies|dict)->bool:
+        """以加密的方式保存会话Cookies至本地家目录，httpx.Cookies 的域名、路径与过期时间一并保存
         """        
         logger.info("会话保存中...")
         try:
             # 序列化
-            pickled_cookies = pickle.dumps(cookies)
+            serialized_cookies = PersistentCookieJar.from_cookies(cookies).dumps()
             # 加密
-            encrypted_pickled_cookies = self._fernet.encrypt(pickled_cookies)
-            with open(SESSION_FILE, 'wb') as f:
-                f.write(encrypted_pickled_cookies)
+            encrypted_cookies = self._fernet.encrypt(serialized_cookies)
+            tmp_file = SESSION_FILE.with_name(f"{SESSION_FILE.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(encrypted_cookies)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, SESSION_FILE)
+            CredentialManager.seen_stamp = session_file_stamp()
             logger.info("会话保存成功！")
             return True
         except Exception as e:
             logger.error(f"会话保存未成功！错误信息: {e}")
             return False
         
-    def load_cookies(self)->dict|None:
+    def load_cookies(self)->httpx.Cookies|None:
+        """加载会话Cookies，已过期的Cookie不会加载
+        """
+        cookie_jar = self.load_cookie_jar()
+        if cookie_jar is None:
+            return None
+
+        return cookie_jar.to_cookies()
+
+    def load_cookie_jar(self)->PersistentCookieJar|None:
+        """加载带有全部属性的会话Cookies，用于在本地判断会话是否过期
+        """
         logger.info("Cookies加载中...")
         if not SESSION_FILE.exists():
             logger.error("Cookies文件不存在！")
             return None
 
-        # 读取文件，解密并反序列化        
+        # 读取文件，解密并解析
         try:
             with open(SESSION_FILE, 'rb') as f:
-                encrypted_pickled_cookies =f.read()
+                encrypted_cookies = f.read()
+                CredentialManager.seen_stamp = session_file_stamp(os.fstat(f.fileno()))
             
-            decrypted_pickled_cookies = self._fernet.decrypt(encrypted_pickled_cookies)
-            cookies = pickle.loads(decrypted_pickled_cookies)
+            cookie_jar = PersistentCookieJar.loads(self._fernet.decrypt(encrypted_cookies))
             logger.info("Cookies加载成功！")
-            return cookies
-        except (InvalidToken, pickle.UnpicklingError, EOFError, FileNotFoundError) as e:
+            return cookie_jar
+        except (InvalidToken, FileNotFoundError) as e:
             logger.error(f"Cookies加载失败！错误原因: {e}")
             logger.info("Cookies加载未成功，请检查会话文件是否损坏或密钥已更改")
             return None
+        except ValueError as e:
+            # 旧版本以 pickle 保存的会话文件同样无法解析，重新登录后会以新格式保存
+            logger.error(f"Cookies加载失败！错误原因: {e}")
+            logger.info("会话文件格式已过时或损坏，需要重新登录")
+            return None
+
+# 会话验证缓存
+class SessionValidationCache:
+    """记录会话文件最近一次被确认有效的时间
+
+    缓存与会话文件内容的摘要绑定，会话文件被改写后缓存自动失效。
+    """
+    def __init__(self, cache_file: Path = SESSION_VALIDATION_FILE, session_file: Path = SESSION_FILE):
+        self.cache_file = cache_file
+        self.session_file = session_file
+
+    def _session_digest(self)->str|None:
+        try:
+            with open(self.session_file, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def is_fresh(self, ttl: float)->bool:
+        """会话是否在`ttl`秒内被确认有效过
+        """
+        if ttl <= 0:
+            return False
+
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                record: dict = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        validated_at = record.get("validated_at", 0)
+        if not 0 <= time.time() - validated_at < ttl:
+            return False
+
+        return record.get("session_digest") == self._session_digest()
+
+    def mark_valid(self):
+        digest = self._session_digest()
+        if digest is None:
+            return
+
+        record = {"validated_at": time.time(), "session_digest": digest}
+        # 各进程使用各自的临时文件，并发写入时互不覆盖
+        tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_file, self.cache_file)
+            logger.info("已记录会话验证时间")
+        except OSError as e:
+            logger.warning(f"会话验证缓存写入失败: {e}")
+            tmp_file.unlink(missing_ok=True)
+
+    def invalidate(self):
+        try:
+            self.cache_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"会话验证缓存删除失败: {e}")
+
+session_validation_cache = SessionValidationCache()
 
 # 异步架构Client类
 class ZjuAsyncClient:
@@ -109,7 +230,8 @@ class ZjuAsyncClient:
         self, 
         headers   = None, 
         cookies   = None,
-        trust_env = True
+        trust_env = True,
+        session: httpx.AsyncClient|None = None
     ):
         """初始化会话
 
@@ -117,6 +239,8 @@ class ZjuAsyncClient:
         ----------
         headers : dict, optional
             _description_, by default None
+        session : httpx.AsyncClient, optional
+            外部传入的共享会话，传入时退出上下文不会关闭该会话，by default None
         """
         # 初始化会话    
         logger.info("初始化会话中...")
@@ -126,7 +250,8 @@ class ZjuAsyncClient:
         else:
             logger.info("全局代理关闭")
 
-        self.session = httpx.AsyncClient(trust_env=trust_env)
+        self._owns_session = session is None
+        self.session = session if session is not None else httpx.AsyncClient(trust_env=trust_env)
 
         if headers is None:
             headers = {
@@ -141,6 +266,8 @@ class ZjuAsyncClient:
             self.session.cookies.update(cookies)
             
         self.studentid = None
+        # 学在浙大ID，登录成功后从落地页中获取
+        self.laz_studentid: str|None = None
         logger.info("初始化会话成功")
 
         # # 初始化加密器
@@ -153,11 +280,16 @@ class ZjuAsyncClient:
         return self
     
     async def __aexit__(self, exc_type, exc_value, exc_traceback):
-        await self.session.aclose()
+        # 共享会话由 ZjuSessionManager 统一关闭
+        if self._owns_session:
+            await self.session.aclose()
 
     async def login(self, studentid: str, password: str)->bool:
         """学在浙大登录逻辑，返回bool值表示登录结果是否成功。
 
+        公钥须在登录页之后、以登录页建立的统一身份认证会话获取，使加密密钥与表单中的 execution 属于同一会话。
+        登录后的落地页只解析一次，同时用于判断登录结果与获取学在浙大ID，后者保存在`laz_studentid`中。
+
         Parameters
         ----------
         studentid : str
@@ -173,26 +305,25 @@ class ZjuAsyncClient:
         # 初始化会话
         logger.info("初始化会话...")
         self.session.cookies.clear()
+        start_time = time.perf_counter()
 
-        # 初始化常量
-        url = "https://courses.zju.edu.cn/user/index#/"
-        pubkey_url = "https://zjuam.zju.edu.cn/cas/v2/getPubKey"
         self.studentid = studentid
         self.password = password
+        self.laz_studentid = None
         # 初始化登录POST表单
         # 获取password RSA加密所需的exponent与modulus
         try: 
-            login_response = await self.session.get(url=url, follow_redirects=True)
-            pubkey_json = await self.session.get(url=pubkey_url, follow_redirects=True)
-            pubkey_json.raise_for_status()
+            login_response = await self.session.get(url=COURSES_INDEX_URL, follow_redirects=True)
+            pubkey_response = await self._get_pubkey()
             
             # 解析，获取exponent和modulus
-            data = pubkey_json.json()
+            data = pubkey_response.json()
             exponent = data.get("exponent")
             modulus = data.get("modulus")
 
             if exponent is None or modulus is None:
                 logger.error("PubKey API调用存在问题，请将此问题报告给开发者！")
+                return False
 
         except HTTPError as errh:
             logger.error(f"HTTP错误: {errh}")
@@ -213,12 +344,15 @@ class ZjuAsyncClient:
         # 加密password
         try:
             encrypted_password = self._encrypt_password(password=self.password, exponent=exponent, modulus=modulus)
-        
         except ValueError:
             logger.error("密码值错误！发生在RSA加密时。")
+            return False
 
         # 获取execution
         execution = self._get_execution(response=login_response)
+        if not execution:
+            logger.error("登录页中没有找到execution，请将此问题报告给开发者！")
+            return False
 
         # 构建POST表单
         logger.info("构建POST表单中...")
@@ -246,11 +380,24 @@ class ZjuAsyncClient:
             logger.error(f"未知错误: {e}")
             return False
 
-        if "学在浙大" in response.text:
-            logger.info("登录成功！")
-            return True
-        logger.error("登录失败，可能是学号或密码不正确！")
-        return False
+        if "学在浙大" not in response.text:
+            logger.error("登录失败，可能是学号或密码不正确！")
+            return False
+
+        # 落地页即学在浙大首页，其中带有学在浙大ID
+        html = etree.HTML(response.text)
+        laz_studentid = html.xpath(r'//span[@id="userId"]/@value') if html is not None else []
+        self.laz_studentid = laz_studentid[0] if laz_studentid else None
+
+        logger.info(f"登录成功！耗时 {time.perf_counter() - start_time:.2f} 秒")
+        return True
+
+    async def _get_pubkey(self)->httpx.Response:
+        """获取统一身份认证的RSA公钥
+        """
+        response = await self.session.get(url=CAS_PUBKEY_URL, follow_redirects=True)
+        response.raise_for_status()
+        return response
 
     def _encrypt_password(self, password: str, exponent: str, modulus: str)->str:
         """用RSA算法加密password
@@ -263,7 +410,7 @@ class ZjuAsyncClient:
         if not password.isascii():
             raise ValueError
 
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
+        key_obj = LoginRSA.get_rsa_key(public_exponent_hex=exponent, modulus_hex=modulus)
         reversed_password = password[::-1]
         return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
 
@@ -384,6 +531,357 @@ class ZjuAsyncClient:
             logger.error(f"未知错误: {e}")
             return False
 
+class ConnectionStats:
+    """单个主机的连接复用统计
+    """
+    def __init__(self):
+        self.requests       = 0
+        self.connections    = 0
+        self.tls_handshakes = 0
+
+    @property
+    def reused(self)->int:
+        """复用已有连接完成的请求次数"""
+        return max(self.requests - self.connections, 0)
+
+def needs_relogin(request: httpx.Request, response: httpx.Response)->bool:
+    """学在浙大接口返回401，或被重定向至统一身份认证登录页时，说明会话已失效
+
+    跟随重定向时`response.request`是最终落地的请求，因此需要单独传入原请求
+    """
+    if request.url.host != COURSES_HOST or not request.url.path.startswith("/api/"):
+        return False
+
+    if response.status_code == 401:
+        return True
+
+    if response.is_redirect:
+        return httpx.URL(response.headers.get("Location", "")).host == CAS_HOST
+
+    # 已跟随重定向时，最终落在登录页
+    return response.url.host == CAS_HOST
+
+class ReloginAuth(httpx.Auth):
+    """会话失效时使用已保存的凭据重新登录，并透明地重试原请求
+
+    httpx 在跟随重定向后才将最终响应交给 auth flow，因此重定向至登录页的情况同样能被识别。
+    """
+    def __init__(self, manager: "ZjuSessionManager", trust_env: bool):
+        self.manager = manager
+        self.trust_env = trust_env
+
+    async def async_auth_flow(self, request: httpx.Request):
+        generation = self.manager.login_generation
+        response = yield request
+
+        if not needs_relogin(request, response) or not self._is_replayable(request):
+            return
+
+        logger.warning(f"会话已失效: {request.url}，尝试重新登录后重试")
+        session = self.manager.get_session(self.trust_env)
+        if not await self.manager.relogin(session, generation):
+            return
+
+        # 以新的Cookies重建请求头
+        request.headers.pop("Cookie", None)
+        session.cookies.set_cookie_header(request)
+        yield request
+
+    def _is_replayable(self, request: httpx.Request)->bool:
+        return request.method in ("GET", "HEAD", "OPTIONS", "DELETE") or isinstance(request.stream, httpx.ByteStream)
+
+# 进程级共享会话管理器
+class ZjuSessionManager:
+    """在一次 CLI 调用内共享同一个事件循环与长连接 httpx.AsyncClient
+
+    所有命令与 main_callback 通过 `client()` 借用会话，避免每一步都重新进行 TCP + TLS 握手。
+    会话在 `close()` 时统一关闭，并将各主机的连接复用统计写入日志。
+    """
+    def __init__(self):
+        self.settings: dict = dict(DEFAULT_SESSION_SETTINGS)
+        self._settings_loaded = False
+        self._sessions: dict[bool, httpx.AsyncClient] = {}
+        self._stats: dict[str, ConnectionStats] = {}
+        self._loop: asyncio.AbstractEventLoop|None = None
+        self._login_lock: asyncio.Lock|None = None
+        self._refresh_task: asyncio.Task|None = None
+        self._login_file_lock = FileLock(SESSION_LOCK_FILE, LOGIN_LOCK_TIMEOUT)
+        # 每次重新登录成功后递增，用于合并并发请求触发的重复登录
+        self.login_generation = 0
+
+    def configure(self, **settings):
+        """更新连接池配置，仅对之后新建的会话生效
+        """
+        self._load_settings()
+        self.settings.update({key: value for key, value in settings.items() if value is not None})
+
+    def client(self, cookies: dict|None = None, trust_env: bool = True)->ZjuAsyncClient:
+        """借用共享会话构建 ZjuAsyncClient，退出其上下文时不会关闭底层连接
+
+        Parameters
+        ----------
+        cookies : dict | None, optional
+            需要写入共享会话的Cookies, by default None
+        trust_env : bool, optional
+            是否使用系统代理, by default True
+
+        Returns
+        -------
+        ZjuAsyncClient
+            基于共享会话的客户端
+        """
+        return ZjuAsyncClient(cookies=cookies, trust_env=trust_env, session=self.get_session(trust_env))
+
+    def get_session(self, trust_env: bool = True)->httpx.AsyncClient:
+        session = self._sessions.get(trust_env)
+        if session is not None and not session.is_closed:
+            return session
+
+        self._load_settings()
+        http2 = bool(self.settings.get("http2"))
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("未安装 h2，HTTP/2 已回退为 HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections           = self.settings.get("max_connections"),
+            max_keepalive_connections = self.settings.get("max_keepalive_connections"),
+            keepalive_expiry          = self.settings.get("keepalive_expiry")
+        )
+
+        logger.info(f"创建共享会话，连接池配置: {self.settings}")
+        session = httpx.AsyncClient(
+            trust_env   = trust_env,
+            limits      = limits,
+            http2       = http2,
+            auth        = ReloginAuth(self, trust_env),
+            event_hooks = {"request": [self._on_request]}
+        )
+        self._sessions[trust_env] = session
+        return session
+
+    def get_setting(self, key: str):
+        self._load_settings()
+        return self.settings.get(key)
+
+    async def relogin(self, session: httpx.AsyncClient, generation: int)->bool:
+        """使用 keyring 中保存的凭据在共享会话上重新登录，并保存新的Cookies
+
+        Parameters
+        ----------
+        session : httpx.AsyncClient
+            需要重新登录的共享会话
+        generation : int
+            发起请求时的`login_generation`，期间已有其他请求完成重新登录时直接复用其结果
+
+        Returns
+        -------
+        bool
+            会话是否已恢复
+        """
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+
+        async with self._login_lock:
+            if self.login_generation != generation:
+                return True
+
+            session_validation_cache.invalidate()
+            studentid = credential_broker.get(KEYRING_STUDENTID_NAME)
+            password = credential_broker.get(KEYRING_PASSWORD_NAME)
+            if not studentid or not password:
+                logger.error("未能找到登录凭据，无法自动重新登录！")
+                return False
+
+            try:
+                logged_in = await self._locked_login(ZjuAsyncClient(session=session), studentid, password)
+            except CookiesSaveError as e:
+                logger.error(f"自动重新登录失败！{e}")
+                return False
+
+            if not logged_in:
+                logger.error("自动重新登录失败！")
+                return False
+
+            self.login_generation += 1
+            logger.info("自动重新登录成功")
+            return True
+
+    async def login(self, client: ZjuAsyncClient, studentid: str, password: str, force: bool = False)->bool:
+        """在`client`的会话上登录并保存Cookies，多个进程同时需要登录时只有一个进程真正登录
+
+        登录与保存会话文件在跨进程的文件锁内进行。等待锁期间若其他进程已经保存了新的、未过期的Cookies，
+        则直接把它们写入`client`的会话，不再重复登录，以免相互覆盖会话文件而使彼此的Cookies失效。
+
+        Parameters
+        ----------
+        client : ZjuAsyncClient
+            需要登录的客户端
+        studentid : str
+            学号
+        password : str
+            密码
+        force : bool, optional
+            始终自行登录，用于手动登录等凭据可能变化的场合, by default False
+
+        Returns
+        -------
+        bool
+            会话是否已可用
+
+        Raises
+        ------
+        CookiesSaveError
+            登录成功但会话Cookies未能保存
+        """
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+
+        async with self._login_lock:
+            return await self._locked_login(client, studentid, password, force)
+
+    async def _locked_login(self, client: ZjuAsyncClient, studentid: str, password: str, force: bool = False)->bool:
+        # 调用方已持有进程内的 _login_lock
+        seen_stamp = CredentialManager.seen_stamp
+        # 等待超时时仍先检查其他进程是否已保存了新的Cookies，没有时才在不持有锁的情况下登录
+        locked = await self._login_file_lock.acquire()
+        try:
+            if not force and session_file_stamp() not in (None, seen_stamp):
+                cookie_jar = CredentialManager().load_cookie_jar()
+                remaining = self.cookie_remaining(cookie_jar) if cookie_jar is not None else None
+                if cookie_jar is not None and len(cookie_jar) and (remaining is None or remaining > 0):
+                    client.session.cookies.update(cookie_jar.to_cookies())
+                    logger.info("其他进程已完成重新登录，使用其保存的Cookies")
+                    return True
+
+            if not locked:
+                logger.warning("未能取得登录锁，在不持有锁的情况下登录，可能与其他进程重复登录")
+
+            if not await client.login(studentid, password):
+                return False
+
+            if not CredentialManager().save_cookies(client.session.cookies):
+                raise CookiesSaveError("Cookies保存失败！")
+
+            session_validation_cache.mark_valid()
+            return True
+        finally:
+            if locked:
+                self._login_file_lock.release()
+
+    def cookie_remaining(self, cookie_jar: PersistentCookieJar)->float|None:
+        """登录Cookie距过期的秒数，无法在本地判断时返回 None
+        """
+        return cookie_jar.remaining(COURSES_HOST, self.get_setting("auth_cookies") or [])
+
+    def schedule_refresh(self, trust_env: bool = True):
+        """在后台提前重新登录，完成后把新的Cookies写入共享会话并保存
+
+        刷新在共享事件循环上与命令的请求并发进行，使用独立的会话登录，不会清空共享会话正在使用的Cookies；
+        `close()`时等待其完成。需在共享事件循环中调用。
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        self._refresh_task = asyncio.get_running_loop().create_task(self._refresh(trust_env))
+
+    async def _refresh(self, trust_env: bool):
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+
+        # 期间会话失效的请求等待刷新完成，随后直接以新的Cookies重试
+        async with self._login_lock:
+            try:
+                studentid = credential_broker.get(KEYRING_STUDENTID_NAME)
+                password = credential_broker.get(KEYRING_PASSWORD_NAME)
+                if not studentid or not password:
+                    logger.error("未能找到登录凭据，无法提前刷新会话！")
+                    return
+
+                async with ZjuAsyncClient(trust_env=trust_env) as client:
+                    if not await self._locked_login(client, studentid, password):
+                        logger.error("提前刷新会话失败！")
+                        return
+
+                    self.get_session(trust_env).cookies.update(client.session.cookies)
+            except Exception as e:
+                logger.error(f"提前刷新会话时发生错误: {e}")
+                return
+
+            self.login_generation += 1
+            logger.info("已在后台提前刷新会话")
+
+    def stats(self)->dict[str, ConnectionStats]:
+        """返回按主机划分的连接复用统计"""
+        return dict(self._stats)
+
+    def run(self, coroutine):
+        """在本进程共享的事件循环上运行协程
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+        return self._loop.run_until_complete(coroutine)
+
+    def syncify(self, async_function):
+        """将异步命令包装为同步函数，所有命令共享同一个事件循环，连接池因此可以跨命令复用
+        """
+        @functools.wraps(async_function)
+        def wrapper(*args, **kwargs):
+            return self.run(async_function(*args, **kwargs))
+
+        return wrapper
+
+    def close(self):
+        """关闭所有共享会话与事件循环，并记录连接复用统计
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        # 提前刷新的结果需要保存下来，供之后的调用使用
+        if self._refresh_task is not None and not self._refresh_task.done():
+            logger.info("等待后台会话刷新完成...")
+            self._loop.run_until_complete(asyncio.wait([self._refresh_task]))
+        self._refresh_task = None
+
+        for session in self._sessions.values():
+            if not session.is_closed:
+                self._loop.run_until_complete(session.aclose())
+        self._sessions.clear()
+
+        for host, host_stats in self._stats.items():
+            logger.info(f"连接复用统计 {host}: 请求 {host_stats.requests} 次，新建连接 {host_stats.connections} 次，TLS握手 {host_stats.tls_handshakes} 次，复用 {host_stats.reused} 次")
+
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+        self._loop = None
+        self._login_lock = None
+
+    def _load_settings(self):
+        if self._settings_loaded:
+            return
+
+        self._settings_loaded = True
+        session_settings = load_config.globalConfig().load_config().get("session", {})
+        if isinstance(session_settings, dict):
+            self.settings.update(session_settings)
+
+    async def _on_request(self, request: httpx.Request):
+        host = request.url.host
+        self._stats.setdefault(host, ConnectionStats()).requests += 1
+
+        # 通过 httpcore 的 trace 扩展统计新建连接与 TLS 握手
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                self._stats[host].connections += 1
+            elif event_name == "connection.start_tls.complete":
+                self._stats[host].tls_handshakes += 1
+
+        request.extensions["trace"] = trace
+
+session_manager = ZjuSessionManager()
+
 # 新版Client类
 class ZjuClient:
     def __init__(self, headers=None):
@@ -505,7 +1003,7 @@ class ZjuClient:
             return the encrypted password for POST
         """        
 
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
+        key_obj = LoginRSA.get_rsa_key(public_exponent_hex=exponent, modulus_hex=modulus)
         reversed_password = password[::-1]
         return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
 
@@ -741,7 +1239,7 @@ class LoginFit:
             return the encrypted password for POST
         """        
 
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
+        key_obj = LoginRSA.get_rsa_key(public_exponent_hex=exponent, modulus_hex=modulus)
         reversed_password = self.password[::-1]
         return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
 
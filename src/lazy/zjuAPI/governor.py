@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+# 视为服务端过载的状态码
+OVERLOAD_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+logger = logging.getLogger(__name__)
+
+class requestOutcome:
+    """一次请求的结果，由调用方在请求完成后填写状态码
+    """
+    def __init__(self):
+        self.status_code: int|None = None
+
+class ConcurrencyGovernor:
+    """自适应的客户端并发控制器
+
+    - 令牌桶限制每秒发起的请求数，平滑突发请求
+    - 并发上限按 AIMD 调整：响应正常时每个响应增加 1/limit（约每轮增加 1），
+      遇到 429/5xx、超时或延迟突增时乘以`decrease_factor`，同一冷却期内只收缩一次
+    - 经由`RequestPolicy`的读写请求都受其限制，默认每秒最多约`rate`个请求；
+      api_list.json 中配置了"governor": false 的接口不经此控制
+
+    Parameters
+    ----------
+    initial_limit : int
+        初始并发上限
+    min_limit : int
+        并发上限的下限
+    max_limit : int
+        并发上限的上限
+    rate : float
+        令牌桶每秒补充的令牌数
+    burst : int
+        令牌桶容量
+    decrease_factor : float
+        收缩时并发上限的乘数
+    cooldown : float
+        两次收缩之间的最短间隔（秒）
+    latency_spike_factor : float
+        延迟超过平均延迟的倍数时视为延迟突增
+    min_spike_latency : float
+        视为延迟突增的最低延迟（秒）
+    """
+    def __init__(self,
+                 initial_limit: int = 8,
+                 min_limit: int = 1,
+                 max_limit: int = 32,
+                 rate: float = 20.0,
+                 burst: int = 20,
+                 decrease_factor: float = 0.5,
+                 cooldown: float = 1.0,
+                 latency_spike_factor: float = 3.0,
+                 min_spike_latency: float = 1.0
+                 ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.rate = rate
+        self.burst = burst
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.latency_spike_factor = latency_spike_factor
+        self.min_spike_latency = min_spike_latency
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.average_latency: float|None = None
+        self.decreases = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = 0.0
+        self._loop: asyncio.AbstractEventLoop|None = None
+        self._condition: asyncio.Condition|None = None
+        self._bucket_lock: asyncio.Lock|None = None
+        # 事件循环只保留任务的弱引用，持有唤醒任务直至完成，避免被提前回收
+        self._notify_tasks: set[asyncio.Task] = set()
+
+    @property
+    def queue_depth(self)->int:
+        """等待并发名额或令牌的请求数"""
+        return self.waiting
+
+    def snapshot(self)->dict:
+        """当前状态，用于诊断
+        """
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "tokens": round(self._tokens, 2),
+            "average_latency": round(self.average_latency, 3) if self.average_latency is not None else None,
+            "decreases": self.decreases
+        }
+
+    @asynccontextmanager
+    async def slot(self):
+        """占用一个并发名额直至请求结束，并根据结果调整并发上限
+
+        Yields
+        ------
+        requestOutcome
+            调用方在收到响应后填写`status_code`
+        """
+        await self._acquire()
+        outcome = requestOutcome()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            yield outcome
+        except httpx.TimeoutException:
+            overloaded = True
+            raise
+        finally:
+            latency = time.monotonic() - started
+            if outcome.status_code in OVERLOAD_STATUS_CODES:
+                overloaded = True
+            self._release()
+            if overloaded or outcome.status_code is not None:
+                self._adjust(overloaded, latency)
+
+    async def _acquire(self):
+        self._bind_loop()
+        self.waiting += 1
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+
+            try:
+                await self._take_token()
+            except BaseException:
+                self._release()
+                raise
+        finally:
+            self.waiting -= 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._schedule_notify()
+
+    def _schedule_notify(self):
+        """唤醒等待名额的请求；`_release`与`_adjust`是同步方法，无法直接等待条件变量，因此在任务中唤醒"""
+        task = asyncio.get_running_loop().create_task(self._notify())
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    async def _take_token(self):
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _adjust(self, overloaded: bool, latency: float):
+        latency_spike = (
+            self.average_latency is not None
+            and latency > self.min_spike_latency
+            and latency > self.average_latency * self.latency_spike_factor
+        )
+
+        # 过载时的延迟不计入平均值，避免抬高基线
+        if not overloaded:
+            self.average_latency = latency if self.average_latency is None else self.average_latency * 0.8 + latency * 0.2
+
+        if overloaded or latency_spike:
+            now = time.monotonic()
+            if now - self._decreased_at < self.cooldown:
+                return
+
+            self._decreased_at = now
+            previous_limit = int(self.limit)
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            self.decreases += 1
+            reason = "overload" if overloaded else "latency_spike"
+            logger.warning(f"并发上限收缩 reason={reason} limit={previous_limit}->{int(self.limit)} latency={latency:.3f}s in_flight={self.in_flight} queue_depth={self.waiting}")
+            return
+
+        previous_limit = int(self.limit)
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        if int(self.limit) != previous_limit:
+            logger.debug(f"并发上限增长 limit={previous_limit}->{int(self.limit)}")
+            self._schedule_notify()
+
+    def _bind_loop(self):
+        """asyncio 同步原语只能在创建时的事件循环中使用，切换事件循环时重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._condition = asyncio.Condition()
+        self._bucket_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+
+request_governor = ConcurrencyGovernor()
@@ -0,0 +1,409 @@
+import abc
+from typing import Any, Iterable, List, Optional, TypedDict
+
+from .projection import FieldProjection
+
+# --- JSON schema ---
+# 模型读取的原始字段，供 msgspec 后端在解码时丢弃其余字段；值类型不做校验
+
+class namedJSON(TypedDict, total=False):
+    name: Any
+
+class courseAttributesJSON(TypedDict, total=False):
+    teaching_class_name: Any
+
+class uploadJSON(TypedDict, total=False):
+    id: Any
+    name: Any
+    size: Any
+    updated_at: Any
+
+class courseJSON(TypedDict, total=False):
+    id: Any
+    name: Any
+    course_attributes: Optional[courseAttributesJSON]
+    department: Optional[namedJSON]
+    academic_year: Optional[namedJSON]
+    instructors: Optional[List[namedJSON]]
+
+class moduleJSON(TypedDict, total=False):
+    id: Any
+    name: Any
+
+class activityJSON(TypedDict, total=False):
+    id: Any
+    title: Any
+    type: Any
+    module_id: Any
+    completion_criterion_key: Any
+    start_time: Any
+    end_time: Any
+    is_started: Any
+    is_closed: Any
+    uploads: Optional[List[uploadJSON]]
+
+class examJSON(TypedDict, total=False):
+    id: Any
+    title: Any
+    type: Any
+    module_id: Any
+    completion_criterion_key: Any
+    start_time: Any
+    end_time: Any
+    is_started: Any
+    is_closed: Any
+
+class classroomJSON(TypedDict, total=False):
+    id: Any
+    title: Any
+    type: Any
+    module_id: Any
+    status: Any
+    start_at: Any
+
+class todoJSON(TypedDict, total=False):
+    id: Any
+    title: Any
+    type: Any
+    course_id: Any
+    course_name: Any
+    end_time: Any
+
+class rollcallJSON(TypedDict, total=False):
+    rollcall_id: Any
+    course_title: Any
+    created_by_name: Any
+    is_radar: Any
+    source: Any
+    status: Any
+    rollcall_status: Any
+    rollcall_time: Any
+
+_page_schemas: dict = {}
+
+class ResponseModel(metaclass=abc.ABCMeta):
+    """接口响应条目的精简模型
+
+    子类在`__slots__`中列出渲染时用到的字段，由`from_json`从原始JSON中一次性取出，
+    其余字段随原始响应一并释放。缺失的字段为 None，布尔字段缺失时为 False。
+    `json_schema`声明`from_json`读取的原始字段，也用于构造服务端字段投影。
+    """
+    __slots__ = ()
+    json_schema: Any = None
+
+    @classmethod
+    @abc.abstractmethod
+    def from_json(cls, data: dict):
+        """由原始JSON构造模型，子类实现"""
+
+    @classmethod
+    def decode_list(cls, items: Iterable[dict]|None)->list:
+        """解码条目列表，跳过不是dict的条目
+
+        Parameters
+        ----------
+        items : Iterable[dict] | None
+            原始条目列表
+
+        Returns
+        -------
+        list
+            解码后的模型列表
+        """
+        return [cls.from_json(item) for item in items or [] if isinstance(item, dict)]
+
+    @classmethod
+    def page_schema(cls, items_key: str)->Any:
+        """列表响应的 schema：保留`total`、`pages`以及`items_key`下各条目中模型读取的字段
+
+        Parameters
+        ----------
+        items_key : str
+            响应中条目列表对应的键
+
+        Returns
+        -------
+        Any
+            TypedDict 类型，可传给`json_codec.loads`
+        """
+        key = (cls, items_key)
+        schema = _page_schemas.get(key)
+        if schema is None:
+            schema = TypedDict(f"{cls.__name__}Page", {
+                "total": Any,
+                "pages": Any,
+                items_key: Optional[List[cls.json_schema]]
+            }, total=False)
+            _page_schemas[key] = schema
+
+        return schema
+
+    @classmethod
+    def projection(cls, items_key: str|None = None)->FieldProjection:
+        """只请求`json_schema`中字段的服务端投影
+
+        Parameters
+        ----------
+        items_key : str | None, optional
+            响应中条目列表对应的键，None 表示响应本身即为一个条目, by default None
+
+        Returns
+        -------
+        FieldProjection
+            可传给`apiPaginator`或`APIFitsAsync.field_projections`的投影
+        """
+        return FieldProjection.from_schema(cls.json_schema, items_key)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+class Upload(ResponseModel):
+    """附件、课件或个人资源中的文件"""
+    __slots__ = ("id", "name", "size", "updated_at")
+    json_schema = uploadJSON
+
+    def __init__(self, id: int|None = None, name: str|None = None, size: int|None = None, updated_at: str|None = None):
+        self.id = id
+        self.name = name
+        self.size = size
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_json(cls, data: dict)->"Upload":
+        return cls(data.get("id"), data.get("name"), data.get("size"), data.get("updated_at"))
+
+class Course(ResponseModel):
+    """课程列表中的课程"""
+    __slots__ = ("id", "name", "instructors", "teaching_class_name", "department_name", "academic_year_name")
+    json_schema = courseJSON
+
+    def __init__(self,
+                 id: int|None = None,
+                 name: str|None = None,
+                 instructors: tuple = (),
+                 teaching_class_name: str|None = None,
+                 department_name: str|None = None,
+                 academic_year_name: str|None = None
+                 ):
+        self.id = id
+        self.name = name
+        # 授课教师姓名
+        self.instructors = instructors
+        self.teaching_class_name = teaching_class_name
+        self.department_name = department_name
+        self.academic_year_name = academic_year_name
+
+    @classmethod
+    def from_json(cls, data: dict)->"Course":
+        course_attributes = data.get("course_attributes") or {}
+        department = data.get("department") or {}
+        academic_year = data.get("academic_year") or {}
+        return cls(
+            data.get("id"),
+            data.get("name"),
+            tuple(instructor.get("name", "") for instructor in data.get("instructors") or []),
+            course_attributes.get("teaching_class_name"),
+            department.get("name"),
+            academic_year.get("name")
+        )
+
+class Module(ResponseModel):
+    """课程章节"""
+    __slots__ = ("id", "name")
+    json_schema = moduleJSON
+
+    def __init__(self, id: int|None = None, name: str|None = None):
+        self.id = id
+        self.name = name
+
+    @classmethod
+    def from_json(cls, data: dict)->"Module":
+        return cls(data.get("id"), data.get("name"))
+
+class Activity(ResponseModel):
+    """课程活动，也用于课件列表中带附件的活动"""
+    __slots__ = ("id", "title", "type", "module_id", "completion_criterion_key", "start_time", "end_time", "is_started", "is_closed", "uploads")
+    json_schema = activityJSON
+
+    def __init__(self,
+                 id: int|None = None,
+                 title: str|None = None,
+                 type: str|None = None,
+                 module_id: int|None = None,
+                 completion_criterion_key: str|None = None,
+                 start_time: str|None = None,
+                 end_time: str|None = None,
+                 is_started: bool = False,
+                 is_closed: bool = False,
+                 uploads: List[Upload]|None = None
+                 ):
+        self.id = id
+        self.title = title
+        self.type = type
+        self.module_id = module_id
+        self.completion_criterion_key = completion_criterion_key
+        self.start_time = start_time
+        self.end_time = end_time
+        self.is_started = is_started
+        self.is_closed = is_closed
+        self.uploads = uploads if uploads is not None else []
+
+    @classmethod
+    def from_json(cls, data: dict)->"Activity":
+        return cls(
+            data.get("id"),
+            data.get("title"),
+            data.get("type"),
+            data.get("module_id"),
+            data.get("completion_criterion_key"),
+            data.get("start_time"),
+            data.get("end_time"),
+            bool(data.get("is_started")),
+            bool(data.get("is_closed")),
+            Upload.decode_list(data.get("uploads"))
+        )
+
+class Exam(ResponseModel):
+    """课程测试"""
+    __slots__ = ("id", "title", "type", "module_id", "completion_criterion_key", "start_time", "end_time", "is_started", "is_closed")
+    json_schema = examJSON
+
+    def __init__(self,
+                 id: int|None = None,
+                 title: str|None = None,
+                 type: str|None = None,
+                 module_id: int|None = None,
+                 completion_criterion_key: str|None = None,
+                 start_time: str|None = None,
+                 end_time: str|None = None,
+                 is_started: bool = False,
+                 is_closed: bool = False
+                 ):
+        self.id = id
+        self.title = title
+        self.type = type
+        self.module_id = module_id
+        self.completion_criterion_key = completion_criterion_key
+        self.start_time = start_time
+        self.end_time = end_time
+        self.is_started = is_started
+        self.is_closed = is_closed
+
+    @classmethod
+    def from_json(cls, data: dict)->"Exam":
+        return cls(
+            data.get("id"),
+            data.get("title"),
+            data.get("type"),
+            data.get("module_id"),
+            data.get("completion_criterion_key"),
+            data.get("start_time"),
+            data.get("end_time"),
+            bool(data.get("is_started")),
+            bool(data.get("is_closed"))
+        )
+
+class Classroom(ResponseModel):
+    """课堂任务"""
+    __slots__ = ("id", "title", "type", "module_id", "status", "start_at")
+    json_schema = classroomJSON
+
+    def __init__(self,
+                 id: int|None = None,
+                 title: str|None = None,
+                 type: str|None = None,
+                 module_id: int|None = None,
+                 status: str|None = None,
+                 start_at: str|None = None
+                 ):
+        self.id = id
+        self.title = title
+        self.type = type
+        self.module_id = module_id
+        self.status = status
+        self.start_at = start_at
+
+    @classmethod
+    def from_json(cls, data: dict)->"Classroom":
+        return cls(
+            data.get("id"),
+            data.get("title"),
+            data.get("type"),
+            data.get("module_id"),
+            data.get("status"),
+            data.get("start_at")
+        )
+
+class Todo(ResponseModel):
+    """待办事项"""
+    __slots__ = ("id", "title", "type", "course_id", "course_name", "end_time")
+    json_schema = todoJSON
+
+    def __init__(self,
+                 id: int|None = None,
+                 title: str|None = None,
+                 type: str|None = None,
+                 course_id: int|None = None,
+                 course_name: str|None = None,
+                 end_time: str|None = None
+                 ):
+        self.id = id
+        self.title = title
+        self.type = type
+        self.course_id = course_id
+        self.course_name = course_name
+        self.end_time = end_time
+
+    @classmethod
+    def from_json(cls, data: dict)->"Todo":
+        return cls(
+            data.get("id"),
+            data.get("title"),
+            data.get("type"),
+            data.get("course_id"),
+            data.get("course_name"),
+            data.get("end_time")
+        )
+
+class Rollcall(ResponseModel):
+    """签到任务，同时用于进行中的签到列表与课程的点名记录"""
+    __slots__ = ("rollcall_id", "course_title", "created_by_name", "is_radar", "source", "status", "rollcall_status", "rollcall_time")
+    json_schema = rollcallJSON
+
+    def __init__(self,
+                 rollcall_id: int|None = None,
+                 course_title: str|None = None,
+                 created_by_name: str|None = None,
+                 is_radar: bool = False,
+                 source: str|None = None,
+                 status: str|None = None,
+                 rollcall_status: str|None = None,
+                 rollcall_time: str|None = None
+                 ):
+        self.rollcall_id = rollcall_id
+        self.course_title = course_title
+        self.created_by_name = created_by_name
+        self.is_radar = is_radar
+        self.source = source
+        self.status = status
+        self.rollcall_status = rollcall_status
+        self.rollcall_time = rollcall_time
+
+    @classmethod
+    def from_json(cls, data: dict)->"Rollcall":
+        return cls(
+            data.get("rollcall_id"),
+            data.get("course_title"),
+            data.get("created_by_name"),
+            bool(data.get("is_radar")),
+            data.get("source"),
+            data.get("status"),
+            data.get("rollcall_status"),
+            data.get("rollcall_time")
+        )
@@ -0,0 +1,245 @@
+import logging
+import re
+import typing
+from typing import Any
+
+import httpx
+
+from ..load_config.json_codec import json_codec
+
+# 服务端接受的字段投影参数名
+FIELDS_PARAM = "fields"
+# 旧版 api_list.json 中拼错的参数名，服务端不会识别，应用投影时移除
+LEGACY_FIELDS_PARAMS = ("fileds",)
+# 检查投影是否生效时抽样的条目数量
+PROJECTION_CHECK_SAMPLE = 20
+
+FIELD_TOKEN_PATTERN = re.compile(r"\s*(\w+|[(),])")
+
+logger = logging.getLogger(__name__)
+
+class FieldProjection:
+    """服务端字段投影，即请求参数`fields`，如`id,name,user(id,name)`
+
+    服务端按投影只返回列出的字段；`items_key`不为 None 时投影作用于响应中该键下的各个条目，否则作用于响应本身。
+    每个接口在每个进程中只检查一次首个响应：返回了未请求的字段说明服务端忽略了投影，
+    投影生效但请求的字段在所有条目中都不存在则可能拼写有误，两者都只记录警告，不影响结果。
+
+    Parameters
+    ----------
+    fields : str
+        投影表达式
+    items_key : str | None, optional
+        响应中条目列表对应的键, by default None
+
+    Raises
+    ------
+    ValueError
+        投影表达式格式有误
+    """
+    _checked: set = set()
+
+    def __init__(self, fields: str, items_key: str|None = None):
+        self.tree = self._parse(fields)
+        self.items_key = items_key
+        self.fields = self._render(self.tree)
+
+    @classmethod
+    def from_schema(cls, schema: Any, items_key: str|None = None)->"FieldProjection":
+        """由 TypedDict 构造投影，嵌套的 TypedDict 及其列表转换为括号中的子字段
+
+        Parameters
+        ----------
+        schema : Any
+            TypedDict 类型，如`courseJSON`
+        items_key : str | None, optional
+            响应中条目列表对应的键, by default None
+
+        Returns
+        -------
+        FieldProjection
+            投影
+        """
+        projection = cls.__new__(cls)
+        projection.tree = cls._schema_tree(schema)
+        projection.items_key = items_key
+        projection.fields = cls._render(projection.tree)
+        return projection
+
+    def apply(self, params: dict|None)->dict:
+        """返回带有投影参数的请求参数副本
+
+        Parameters
+        ----------
+        params : dict | None
+            原有的请求参数
+
+        Returns
+        -------
+        dict
+            新的请求参数
+        """
+        params = dict(params or {})
+        for key in LEGACY_FIELDS_PARAMS:
+            params.pop(key, None)
+        params[FIELDS_PARAM] = self.fields
+        return params
+
+    def check_response(self, response: httpx.Response, source: str)->bool:
+        """检查投影是否被服务端应用，每个 (source, 投影) 只检查一次
+
+        Parameters
+        ----------
+        response : httpx.Response
+            成功的响应
+        source : str
+            接口名称，用于日志
+
+        Returns
+        -------
+        bool
+            未发现问题或已检查过时返回 True
+        """
+        key = (source, self.items_key, self.fields)
+        if key in self._checked:
+            return True
+        self._checked.add(key)
+
+        try:
+            data = json_codec.loads(response.content)
+        except ValueError:
+            return True
+
+        return self.check(data, source)
+
+    def check(self, data: Any, source: str)->bool:
+        """检查响应中的字段与投影是否一致
+
+        Parameters
+        ----------
+        data : Any
+            未经 schema 裁剪的响应
+        source : str
+            接口名称，用于日志
+
+        Returns
+        -------
+        bool
+            未发现问题时返回 True
+        """
+        items = data.get(self.items_key) if self.items_key is not None and isinstance(data, dict) else data
+        if isinstance(items, dict):
+            items = [items]
+        if not isinstance(items, list):
+            return True
+
+        sample = [item for item in items[:PROJECTION_CHECK_SAMPLE] if isinstance(item, dict)]
+        if not sample:
+            return True
+
+        consistent = True
+        extra_fields = self._extra_fields(self.tree, sample)
+        if extra_fields:
+            consistent = False
+            logger.warning(f"服务端忽略了 {source} 的字段投影，响应中含有未请求的字段: {', '.join(extra_fields[:10])}")
+
+        # 服务端忽略投影时返回的是完整条目，缺少的字段多半只是可选字段
+        missing_fields = [name for name in self.tree if all(name not in item for item in sample)]
+        if missing_fields and consistent:
+            consistent = False
+            logger.warning(f"{source} 的字段投影中 {', '.join(missing_fields)} 不在响应中，请检查字段名是否正确")
+        elif missing_fields:
+            logger.info(f"{source} 的响应中没有 {', '.join(missing_fields)}")
+
+        return consistent
+
+    def __str__(self):
+        return self.fields
+
+    def __repr__(self):
+        return f"FieldProjection({self.fields!r}, items_key={self.items_key!r})"
+
+    @classmethod
+    def _extra_fields(cls, tree: dict, items: list, prefix: str = "")->list:
+        extra_fields = []
+        for item in items:
+            for name in item:
+                path = prefix + name
+                if name not in tree:
+                    if path not in extra_fields:
+                        extra_fields.append(path)
+                    continue
+
+                subtree = tree[name]
+                if subtree is None:
+                    continue
+
+                value = item[name]
+                children = value if isinstance(value, list) else [value]
+                for field in cls._extra_fields(subtree, [child for child in children if isinstance(child, dict)], path + "."):
+                    if field not in extra_fields:
+                        extra_fields.append(field)
+
+        return extra_fields
+
+    @staticmethod
+    def _parse(fields: str)->dict:
+        tokens = FIELD_TOKEN_PATTERN.findall(fields)
+        if "".join(tokens) != re.sub(r"\s+", "", fields):
+            raise ValueError(f"字段投影格式有误: {fields}")
+
+        position = 0
+
+        def parse_fields()->dict:
+            nonlocal position
+            tree: dict = {}
+            while True:
+                if position >= len(tokens) or not re.fullmatch(r"\w+", tokens[position]):
+                    raise ValueError(f"字段投影格式有误: {fields}")
+
+                name = tokens[position]
+                position += 1
+                subtree = None
+                if position < len(tokens) and tokens[position] == "(":
+                    position += 1
+                    subtree = parse_fields()
+                    if position >= len(tokens) or tokens[position] != ")":
+                        raise ValueError(f"字段投影格式有误: {fields}")
+                    position += 1
+                tree[name] = subtree
+
+                if position < len(tokens) and tokens[position] == ",":
+                    position += 1
+                    continue
+                return tree
+
+        tree = parse_fields()
+        if position != len(tokens):
+            raise ValueError(f"字段投影格式有误: {fields}")
+
+        return tree
+
+    @classmethod
+    def _render(cls, tree: dict)->str:
+        return ",".join(name if subtree is None else f"{name}({cls._render(subtree)})" for name, subtree in tree.items())
+
+    @classmethod
+    def _schema_tree(cls, schema: Any)->dict:
+        tree: dict = {}
+        for name, annotation in typing.get_type_hints(schema).items():
+            nested = cls._nested_typeddict(annotation)
+            tree[name] = cls._schema_tree(nested) if nested is not None else None
+
+        return tree
+
+    @classmethod
+    def _nested_typeddict(cls, annotation: Any)->Any:
+        if typing.is_typeddict(annotation):
+            return annotation
+
+        for argument in typing.get_args(annotation):
+            nested = cls._nested_typeddict(argument)
+            if nested is not None:
+                return nested
+
+        return None
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .governor import ConcurrencyGovernor, request_governor, requestOutcome
+
+# 未在 api_list.json 中配置"timeout"的接口所使用的超时（秒）
+DEFAULT_TIMEOUT = {
+    "connect": 5.0,
+    "read": 15.0,
+    "write": 15.0,
+    "pool": 10.0
+}
+# 重放不会产生副作用的请求方法
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# 不修改服务端状态的请求方法
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 表示服务端暂时不可用的状态码
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+# 请求尚未送达服务端时的异常，非幂等请求也可以安全重试
+UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def ungoverned_slot():
+    """不经`ConcurrencyGovernor`的请求名额，供配置了"governor": false 的接口使用"""
+    yield requestOutcome()
+
+def make_timeout(timeout_config: dict|float|None = None)->httpx.Timeout:
+    """由接口配置中的"timeout"项构造 httpx.Timeout
+
+    Parameters
+    ----------
+    timeout_config : dict | float | None, optional
+        形如 {"connect": 5, "read": 20} 的dict，缺省项使用`DEFAULT_TIMEOUT`；也可以是统一的秒数, by default None
+
+    Returns
+    -------
+    httpx.Timeout
+        请求超时配置
+    """
+    if isinstance(timeout_config, (int, float)):
+        return httpx.Timeout(timeout_config)
+
+    timeouts = dict(DEFAULT_TIMEOUT)
+    if isinstance(timeout_config, dict):
+        timeouts.update({key: value for key, value in timeout_config.items() if key in DEFAULT_TIMEOUT})
+
+    return httpx.Timeout(**timeouts)
+
+class RetryBudget:
+    """进程级重试预算，限制重试请求占全部请求的比例，避免服务端故障时重试放大流量
+
+    每个新请求存入`ratio`个令牌，每次重试消耗一个令牌；初始令牌数为`min_retries`。
+    """
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.max_tokens = float(min_retries)
+        self.tokens = float(min_retries)
+
+    def record_request(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self)->bool:
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+class RequestPolicy:
+    """统一的请求超时与重试策略
+
+    - 幂等方法在连接异常、超时与 429/502/503/504 时重试；POST 仅在请求尚未送达服务端时重试
+    - 重试间隔为带完全抖动的指数退避，服务端给出 Retry-After 时以其为准
+    - 所有重试共享`RetryBudget`
+    - 每次尝试（包括 PUT/POST/DELETE 等写请求）都经由`ConcurrencyGovernor`占用并发名额，服务端过载时自动降低并发
+
+    接口可在 api_list.json 中通过"timeout"配置超时，通过"max_attempts"配置最多尝试次数，
+    通过"governor": false 不经并发控制，用于调用方自行控制并发且对时延敏感的接口（如签到码爆破）。
+    """
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 budget: RetryBudget|None = None,
+                 governor: ConcurrencyGovernor|None = None
+                 ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget else RetryBudget()
+        self.governor = governor if governor else request_governor
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        # 写请求计数，供请求合并判断已保留的结果是否过时
+        self.writes = 0
+        self.retry_reasons: Counter = Counter()
+
+    async def request(self,
+                      session: httpx.AsyncClient,
+                      method: str,
+                      url: str,
+                      endpoint_config: dict|None = None,
+                      **kwargs)->httpx.Response:
+        """按策略发起请求，参数与`session.request`一致
+
+        Parameters
+        ----------
+        session : httpx.AsyncClient
+            发起请求的会话
+        method : str
+            请求方法
+        url : str
+            请求地址
+        endpoint_config : dict | None, optional
+            api_list.json 中该接口的配置, by default None
+
+        Returns
+        -------
+        httpx.Response
+            最后一次请求的响应
+
+        Raises
+        ------
+        httpx.TransportError
+            不可重试或重试次数用尽时抛出最后一次的异常
+        """
+        endpoint_config = endpoint_config or {}
+        method = method.upper()
+        max_attempts = max(1, int(endpoint_config.get("max_attempts", self.max_attempts)))
+        governed = endpoint_config.get("governor", True) is not False
+        kwargs.setdefault("timeout", make_timeout(endpoint_config.get("timeout")))
+
+        self.requests += 1
+        if method not in SAFE_METHODS:
+            self.writes += 1
+        self.budget.record_request()
+
+        attempt = 1
+        while True:
+            try:
+                async with (self.governor.slot() if governed else ungoverned_slot()) as outcome:
+                    response = await session.request(method, url, **kwargs)
+                    outcome.status_code = response.status_code
+            except httpx.TransportError as e:
+                if not self._is_retryable_error(method, e) or not self._can_retry(attempt, max_attempts, method, url):
+                    raise
+
+                reason = type(e).__name__
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or method not in IDEMPOTENT_METHODS:
+                    return response
+
+                if not self._can_retry(attempt, max_attempts, method, url):
+                    return response
+
+                reason = f"HTTP {response.status_code}"
+                delay = self._retry_after(response) or self._backoff(attempt)
+                await response.aclose()
+
+            self.retries += 1
+            self.retry_reasons[reason] += 1
+            logger.warning(f"请求重试 method={method} url={url} attempt={attempt + 1}/{max_attempts} reason={reason} delay={delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def log_stats(self):
+        if self.retries or self.budget_exhausted:
+            reasons = ",".join(f"{reason}:{count}" for reason, count in self.retry_reasons.most_common())
+            logger.info(f"请求重试统计 requests={self.requests} retries={self.retries} budget_exhausted={self.budget_exhausted} reasons={reasons}")
+
+        if self.governor.decreases:
+            governor_stats = " ".join(f"{key}={value}" for key, value in self.governor.snapshot().items())
+            logger.info(f"并发控制统计 {governor_stats}")
+
+    def _is_retryable_error(self, method: str, error: httpx.TransportError)->bool:
+        if method in IDEMPOTENT_METHODS:
+            return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+        return isinstance(error, UNSENT_REQUEST_ERRORS)
+
+    def _can_retry(self, attempt: int, max_attempts: int, method: str, url: str)->bool:
+        if attempt >= max_attempts:
+            return False
+
+        if not self.budget.try_spend():
+            self.budget_exhausted += 1
+            logger.warning(f"重试预算已耗尽，放弃重试 method={method} url={url} attempt={attempt}/{max_attempts}")
+            return False
+
+        return True
+
+    def _backoff(self, attempt: int)->float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _retry_after(self, response: httpx.Response)->float|None:
+        retry_after = response.headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+
+        return min(self.max_delay, max(0.0, delay))
+
+request_policy = RequestPolicy()
@@ -0,0 +1,279 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+import httpx
+
+from ..load_config.json_codec import json_codec
+from .request_policy import request_policy
+
+RESPONSE_CACHE_DIR = Path.home() / ".lazy_cli_cache"
+# 缓存目录的容量上限，超出后按最近使用时间淘汰
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 写入缓存时保留的响应头
+CACHED_HEADERS = ("content-type", "etag", "last-modified")
+
+logger = logging.getLogger(__name__)
+
+class CacheOnlyScope:
+    """只读缓存的作用域，记录本次读取到的缓存条目的存储时间与缺失的条目数量
+    """
+    def __init__(self):
+        self.stored_at: list[float] = []
+        self.missing = 0
+
+    @property
+    def served(self)->int:
+        return len(self.stored_at)
+
+    @property
+    def age(self)->float:
+        """读取到的缓存中最旧一条的存在时长（秒）"""
+        if not self.stored_at:
+            return 0.0
+        return time.time() - min(self.stored_at)
+
+# 每个 asyncio 任务继承创建时的作用域，并发请求会记录到同一个作用域中
+_cache_only_scope: ContextVar[CacheOnlyScope|None] = ContextVar("cache_only_scope", default=None)
+
+class ResponseCache:
+    """GET 请求的磁盘响应缓存
+
+    只缓存在 api_list.json 中配置了`cache_ttl`（秒）的接口：有效期内直接返回缓存；
+    过期后携带 If-None-Match/If-Modified-Since 重新验证，服务端返回 304 时沿用缓存并刷新有效期。
+    `cache_ttl`为0的接口每次都会验证，缓存仅供离线模式与先显示缓存再刷新时使用。
+    每条缓存单独存为一个文件，文件修改时间即最近使用时间，目录超出容量上限时淘汰最久未使用的条目。
+    """
+    def __init__(self, cache_dir: Path = RESPONSE_CACHE_DIR, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # 不同账号的缓存互不可见
+        self.namespace = ""
+        self.enabled = True
+        # 为 True 时忽略有效期，总是向服务端验证
+        self.refresh = False
+        # 为 True 时不发起任何请求，只读取缓存
+        self.offline = False
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def configure(self,
+                  enabled: bool|None = None,
+                  refresh: bool|None = None,
+                  offline: bool|None = None,
+                  namespace: str|None = None,
+                  max_bytes: int|None = None
+                  ):
+        if enabled is not None:
+            self.enabled = enabled
+        if refresh is not None:
+            self.refresh = refresh
+        if offline is not None:
+            self.offline = offline
+        if namespace is not None:
+            self.namespace = namespace
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+    async def get(self, session: httpx.AsyncClient, url: str, params: dict|None, endpoint_config: dict|None = None)->httpx.Response:
+        """带缓存的 GET 请求，经由`request_policy`发起，返回值与`session.get`一致
+
+        Parameters
+        ----------
+        session : httpx.AsyncClient
+            发起请求的会话
+        url : str
+            请求地址
+        params : dict | None
+            查询参数
+        endpoint_config : dict | None, optional
+            api_list.json 中该接口的配置，其中的"cache_ttl"为缓存有效期（秒），未配置时不使用缓存, by default None
+
+        Returns
+        -------
+        httpx.Response
+            服务端响应，命中缓存或验证通过时为由缓存构造的响应；只读缓存且缓存缺失时为 504 响应
+        """
+        scope = _cache_only_scope.get()
+        if scope is None and self.offline:
+            scope = CacheOnlyScope()
+
+        if scope is not None:
+            return self._read_only(httpx.URL(url, params=params), scope)
+
+        endpoint_config = endpoint_config or {}
+        ttl = endpoint_config.get("cache_ttl")
+        if not self.enabled or ttl is None:
+            return await request_policy.request(session, "GET", url, endpoint_config, params=params, follow_redirects=True)
+
+        request_url = httpx.URL(url, params=params)
+        entry_path = self._entry_path(request_url)
+        entry = self._load(entry_path)
+
+        if entry is not None and not self.refresh and time.time() - entry.get("stored_at", 0) < ttl:
+            self.hits += 1
+            self._touch(entry_path)
+            logger.debug(f"缓存命中: {request_url}")
+            return self._build_response(request_url, entry)
+
+        headers = {}
+        if entry is not None:
+            if entry["headers"].get("etag"):
+                headers["If-None-Match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+
+        response = await request_policy.request(session, "GET", url, endpoint_config, params=params, headers=headers, follow_redirects=True)
+
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            logger.debug(f"缓存验证通过: {request_url}")
+            entry["stored_at"] = time.time()
+            self._save(entry_path, entry)
+            return self._build_response(request_url, entry)
+
+        self.misses += 1
+        # 仅缓存成功的 JSON 响应，登录跳转等 HTML 页面不会写入
+        if response.status_code == 200 and "json" in response.headers.get("content-type", ""):
+            self._save(entry_path, {
+                "url": str(request_url),
+                "stored_at": time.time(),
+                "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                "body": response.text
+            })
+            self._evict()
+
+        return response
+
+    @contextmanager
+    def cache_only(self):
+        """在作用域内只读取缓存而不发起请求，忽略有效期
+
+        Yields
+        ------
+        CacheOnlyScope
+            记录读取结果的作用域
+        """
+        scope = CacheOnlyScope()
+        token = _cache_only_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            _cache_only_scope.reset(token)
+
+    def reading_cache_only(self)->bool:
+        """当前是否只读取缓存而不发起请求
+        """
+        return self.offline or _cache_only_scope.get() is not None
+
+    def _read_only(self, request_url: httpx.URL, scope: CacheOnlyScope)->httpx.Response:
+        entry_path = self._entry_path(request_url)
+        entry = self._load(entry_path) if self.enabled else None
+        if entry is None:
+            scope.missing += 1
+            logger.info(f"缓存缺失: {request_url}")
+            return httpx.Response(504, request=httpx.Request("GET", request_url))
+
+        self.hits += 1
+        scope.stored_at.append(entry.get("stored_at", 0))
+        self._touch(entry_path)
+        return self._build_response(request_url, entry)
+
+    def clear(self):
+        """删除全部缓存条目
+        """
+        for entry_path in self._entries():
+            entry_path.unlink(missing_ok=True)
+
+    def log_stats(self):
+        if self.hits or self.misses or self.revalidated:
+            logger.info(f"响应缓存: 命中 {self.hits} 次，未命中 {self.misses} 次，验证通过 {self.revalidated} 次")
+
+    def _entry_path(self, request_url: httpx.URL)->Path:
+        digest = hashlib.sha256(f"{self.namespace}\n{request_url}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _entries(self)->list[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob("*.json"))
+
+    def _load(self, entry_path: Path)->dict|None:
+        try:
+            with open(entry_path, "rb") as f:
+                entry: dict = json_codec.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"缓存条目 {entry_path.name} 读取失败，已忽略: {e}")
+            return None
+
+        if not isinstance(entry.get("headers"), dict) or not isinstance(entry.get("body"), str):
+            return None
+
+        return entry
+
+    def _save(self, entry_path: Path, entry: dict):
+        tmp_path = None
+        try:
+            # 缓存中有登录后的响应，目录与文件只对当前用户可读写
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # 每次写入使用独立的临时文件（mkstemp 以 0600 创建），并发写入同一条目的进程互不覆盖
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=entry_path.name + ".", suffix=".tmp")
+            tmp_path = Path(tmp_name)
+            with open(fd, "w", encoding="utf-8") as f:
+                json_codec.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"缓存写入失败: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def _touch(self, entry_path: Path):
+        try:
+            os.utime(entry_path)
+        except OSError as e:
+            logger.debug(f"缓存条目 {entry_path.name} 更新使用时间失败: {e}")
+
+    def _evict(self):
+        """目录超出容量上限时，按最近使用时间从旧到新淘汰
+        """
+        entries = []
+        total_size = 0
+        for entry_path in self._entries():
+            try:
+                entry_stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+            total_size += entry_stat.st_size
+
+        if total_size <= self.max_bytes:
+            return
+
+        entries.sort()
+        evicted = 0
+        for _mtime, size, entry_path in entries:
+            if total_size <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+            evicted += 1
+
+        logger.info(f"响应缓存超出容量上限，已淘汰 {evicted} 条")
+
+    def _build_response(self, request_url: httpx.URL, entry: dict)->httpx.Response:
+        return httpx.Response(
+            200,
+            headers=entry["headers"],
+            content=entry["body"].encode("utf-8"),
+            request=httpx.Request("GET", request_url)
+        )
+
+response_cache = ResponseCache()
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Any
+
+import httpx
+
+from ..load_config.json_codec import json_codec
+from .request_policy import request_policy
+from .response_cache import response_cache
+
+# 保留的成功结果数量上限，超出后丢弃最早的结果
+SINGLE_FLIGHT_MAX_RESULTS = 256
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """合并同一会话内相同的 GET 请求
+
+    以 (会话, 方法, 带查询参数的URL) 为键：并发的相同请求共享同一个网络请求，
+    成功的结果在本次运行内保留，之后的相同请求直接复用已解析的JSON。
+    共享的JSON会被多个调用方读取，调用方不应修改它。
+    经由`request_policy`发起过 POST/PUT/DELETE 等写请求后，已保留的结果全部作废。
+    在 api_list.json 中配置了`"retain_response": false`的分页列表接口只合并进行中的请求，不保留结果，
+    以便页面解码后原始响应能够及时释放。
+    """
+    def __init__(self, max_results: int = SINGLE_FLIGHT_MAX_RESULTS):
+        self.max_results = max_results
+        self.enabled = True
+        self.requests = 0
+        self.shared = 0
+        self._calls: dict[tuple, asyncio.Task] = {}
+        self._results: dict[tuple, tuple[httpx.Response, Any]] = {}
+        self._writes = request_policy.writes
+        self._loop: asyncio.AbstractEventLoop|None = None
+
+    async def get_json(self, session: httpx.AsyncClient, url: str, params: dict|None, endpoint_config: dict|None = None, schema: Any = None)->tuple[httpx.Response, Any]:
+        """经由`response_cache`发起 GET 请求，相同的请求只发起一次
+
+        Parameters
+        ----------
+        session : httpx.AsyncClient
+            发起请求的会话
+        url : str
+            请求地址
+        params : dict | None
+            查询参数
+        endpoint_config : dict | None, optional
+            api_list.json 中该接口的配置, by default None
+        schema : Any, optional
+            解码时使用的 schema，见`json_codec.loads`, by default None
+
+        Returns
+        -------
+        tuple[httpx.Response, Any]
+            响应与解析后的JSON，响应失败或不是JSON时后者为 None
+        """
+        # 只读缓存时结果取决于所处的作用域，不参与合并
+        if not self.enabled or response_cache.reading_cache_only():
+            response = await response_cache.get(session, url, params, endpoint_config)
+            return response, self._parse(response, schema)
+
+        self._check_state()
+        # 不同 schema 解码出的结果字段不同，分别合并
+        key = (id(session), "GET", str(httpx.URL(url, params=params)), schema)
+        self.requests += 1
+
+        result = self._results.get(key)
+        if result is not None:
+            self.shared += 1
+            logger.debug(f"复用已完成的请求: {key[2]}")
+            return result
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, session, url, params, endpoint_config, schema))
+            # 所有调用方都被取消时，避免未取回的异常被记录为错误
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._calls[key] = task
+        else:
+            self.shared += 1
+            logger.debug(f"合并进行中的请求: {key[2]}")
+
+        # 单个调用方被取消时不影响其它等待同一请求的调用方
+        return await asyncio.shield(task)
+
+    def clear(self):
+        """丢弃已保留的结果
+        """
+        self._results.clear()
+
+    def log_stats(self):
+        if self.shared:
+            logger.info(f"请求合并: 共 {self.requests} 次，复用 {self.shared} 次")
+
+    async def _fetch(self, key: tuple, session: httpx.AsyncClient, url: str, params: dict|None, endpoint_config: dict|None, schema: Any)->tuple[httpx.Response, Any]:
+        writes = request_policy.writes
+        try:
+            response = await response_cache.get(session, url, params, endpoint_config)
+            result = (response, self._parse(response, schema))
+
+            # 请求期间发生过写请求时，结果可能已经过时，不予保留
+            retain = (endpoint_config or {}).get("retain_response", True)
+            if retain and response.is_success and writes == request_policy.writes:
+                self._results[key] = result
+                if len(self._results) > self.max_results:
+                    self._results.pop(next(iter(self._results)))
+
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def _parse(self, response: httpx.Response, schema: Any = None)->Any:
+        if not response.is_success:
+            return None
+
+        try:
+            return json_codec.loads(response.content, schema)
+        except ValueError:
+            return None
+
+    def _check_state(self):
+        if self._writes != request_policy.writes:
+            self._writes = request_policy.writes
+            self._results.clear()
+
+        # 其它事件循环中的任务无法在当前事件循环中等待
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._calls.clear()
+            self._results.clear()
+
+single_flight = SingleFlight()
@@ -4,9 +4,10 @@ import logging
 import mimetypes
 import os
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Any, Callable, List, Optional
 from urllib.parse import unquote
 
 import aiofiles
@@ -15,12 +16,52 @@ import requests
 from httpx import ConnectTimeout, HTTPError, HTTPStatusError
 
 from ..load_config import load_config
+from ..load_config.api_registry import APIEndpoint, api_registry
+from .models import Activity, Classroom, Exam, Module, ResponseModel, Rollcall, Todo
+from .projection import FieldProjection
+from .request_policy import make_timeout, request_policy
+from .single_flight import single_flight
 
 DOWNLOAD_DIR = Path.home() / "Downloads"
 
 logger = logging.getLogger(__name__)
 
+# 分段下载时每段的最小字节数
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# 服务端拒绝字段投影时的状态码，此时不带投影重新请求
+PROJECTION_REJECTED_STATUS_CODES = {400, 422}
+
+# 分页并发拉取时的默认每页数量与并发页数
+PAGINATION_PAGE_SIZE   = 100
+PAGINATION_CONCURRENCY = 4
+
+def content_range_total(content_range: str|None)->int:
+    """解析 Content-Range 中的文件总大小，如`bytes 0-0/1024`，无法解析时返回 0
+    """
+    match = re.fullmatch(r"bytes\s+\d+-\d+/(\d+)", (content_range or "").strip())
+    return int(match.group(1)) if match else 0
+
+def positioned_write(fd: int, data: bytes, offset: int):
+    """在文件的指定位置写入数据，不改变共享的文件偏移量
+    """
+    view = memoryview(data)
+    while view:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, view, offset)
+        else:
+            # Windows 下没有 pwrite，各段在同一事件循环线程中串行写入，seek + write 不会交错
+            os.lseek(fd, offset, os.SEEK_SET)
+            written = os.write(fd, view)
+        view = view[written:]
+        offset += written
+
 class fileUploadProgressWrapper:
+    """包装二进制文件对象，使 httpx 在构建 multipart 请求体时按块读取文件并汇报进度
+
+    httpx 通过`fileno()`获知文件大小以设置 Content-Length，再从头`read()`固定大小的块，
+    因此内存占用与文件大小无关
+    """
     def __init__(self,
                  file,
                  progress_callback: Optional[Callable[[int, int], None]] = None):
@@ -30,7 +71,7 @@ class fileUploadProgressWrapper:
         self._bytes_read = 0
 
     def read(self, size=-1):
-        """request库会调用这个方法流式读取
+        """httpx会调用这个方法流式读取
         """
         chunk = self._file.read(size)
         if chunk:
@@ -44,9 +85,22 @@ class fileUploadProgressWrapper:
                     logger.error(f"{e}")
 
         return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET)->int:
+        """httpx在发送（以及重定向后重新发送）前会回到文件开头，进度随之重置
+        """
+        position = self._file.seek(offset, whence)
+        self._bytes_read = position
+        return position
+
+    def tell(self)->int:
+        return self._file.tell()
+
+    def fileno(self)->int:
+        return self._file.fileno()
     
     def __len__(self):
-        """request库通过这个方法获知文件大小
+        """通过这个方法获知文件大小
         """
 
         return self._total_size
@@ -55,7 +109,7 @@ class APIFits:
     def __init__(self, login_session: requests.Session, name, apis_name: List[str]|None = None, apis_config: dict|None = None, parent_dir = None, data = None):
         self.login_session = login_session
         self.name = name
-        self.config = load_config.apiListConfig().load_config().get(self.name, None)
+        self.config = api_registry.group(self.name)
         self.apis_name = apis_name
         self.apis_config = apis_config
         self.parent_dir = parent_dir if parent_dir else name
@@ -205,11 +259,17 @@ class APIFitsAsync:
     def __init__(self, login_session: httpx.AsyncClient, name, apis_name: List[str]|None = None, apis_config: dict|None = None, parent_dir = None, data = None):
         self.login_session = login_session
         self.name = name
-        self.config = load_config.apiListConfig().load_config().get(self.name, None)
+        self.config = api_registry.group(self.name)
         self.apis_name = apis_name
         self.apis_config = apis_config
         self.parent_dir = parent_dir if parent_dir else name
         self.data = data
+        # api_name -> 解码时使用的 schema，见`ResponseModel.page_schema`
+        self.response_schemas: dict = {}
+        # api_name -> 服务端字段投影，见`FieldProjection`
+        self.field_projections: dict[str, FieldProjection] = {}
+        # api_name -> 按调用方传入的 apis_config 编译的接口
+        self._endpoints: dict[str, APIEndpoint] = {}
     
     def _load_api_config(self):
         if self.config == None:
@@ -246,23 +306,25 @@ class APIFitsAsync:
                 logger.error(f"{api_name}的{api_url}不存在！")
                 continue
 
-            tasks.append(self.login_session.get(url=api_url, params=api_params, follow_redirects=True))
+            tasks.append(self._get_json(api_name, api_url, api_params, api_config))
             api_urls.append(api_url)
 
         logger.info(f"开始请求API: {', '.join(api_urls)}")
         responses = await asyncio.gather(*tasks, return_exceptions=True)
 
         results_json = []
-        for index, api_response in enumerate(responses):
-            if isinstance(api_response, Exception):
+        for index, api_result in enumerate(responses):
+            if isinstance(api_result, Exception):
                 error_url = api_urls[index] if index < len(api_urls) else "Unkown_URL"
-                logger.error(f"请求时发生错误 | URL: {error_url} | 异常: {type(api_response)} | 详情: {repr(api_response)}")
+                logger.error(f"请求时发生错误 | URL: {error_url} | 异常: {type(api_result)} | 详情: {repr(api_result)}")
                 results_json.append({})
                 continue
 
+            api_response, api_respone_json = api_result
             try:    
                 api_response.raise_for_status()
-                api_respone_json = api_response.json()
+                if api_respone_json is None:
+                    api_respone_json = api_response.json()
             except HTTPStatusError as e:
                 logger.error(f"请求{api_response.url}时发生错误。{e}")
                 results_json.append({})
@@ -292,7 +354,7 @@ class APIFitsAsync:
                 logger.error(f"{api_name}不存在！")
                 continue
                 
-            if not self.check_api_method(api_config, "POST"):
+            if not self.check_api_method(api_name, api_config, "POST"):
                 logger.error("该方法只适用POST请求！")
                 continue
 
@@ -304,7 +366,7 @@ class APIFitsAsync:
             if not self.data:
                 self.data = self._make_api_data(api_config, api_name)
             
-            tasks.append(self.login_session.post(url=api_url, json=self.data, follow_redirects=True))
+            tasks.append(request_policy.request(self.login_session, "POST", api_url, api_config, json=self.data, follow_redirects=True))
             api_urls.append(api_url)
 
         logger.info(f"请求 {', '.join(api_urls)}")
@@ -347,7 +409,7 @@ class APIFitsAsync:
                 logger.error(f"{api_name}不存在！")
                 continue
 
-            if not self.check_api_method(api_config, "PUT"):
+            if not self.check_api_method(api_name, api_config, "PUT"):
                 logger.error("该方法只适用PUT请求！")
                 raise RuntimeError
             
@@ -357,7 +419,7 @@ class APIFitsAsync:
                 continue
             
             logger.info(f"请求 {api_url} 中...")
-            api_response = await self.login_session.put(url = api_url, json = self.data, follow_redirects=True)
+            api_response = await request_policy.request(self.login_session, "PUT", api_url, api_config, json=self.data, follow_redirects=True)
             try:
                 api_response.raise_for_status()
             except HTTPError as e:
@@ -373,24 +435,203 @@ class APIFitsAsync:
 
         return all_api_response
 
+    async def _get_json(self, api_name: str, api_url: str, api_params: dict|None, api_config: dict)->tuple[httpx.Response, Any]:
+        """请求单个接口，设置了字段投影时带上投影参数，服务端拒绝投影时不带投影重新请求
+        """
+        # 相同的请求经由 single_flight 合并；配置了 cache_ttl 的接口经由磁盘缓存请求，超时与重试由 request_policy 统一处理
+        schema = self.response_schemas.get(api_name)
+        projection = self.field_projections.get(api_name)
+        if projection is None:
+            return await single_flight.get_json(self.login_session, api_url, api_params, api_config, schema=schema)
+
+        api_result = await single_flight.get_json(self.login_session, api_url, projection.apply(api_params), api_config, schema=schema)
+        api_response = api_result[0]
+        if api_response.status_code in PROJECTION_REJECTED_STATUS_CODES:
+            logger.warning(f"{self.name}.{api_name} 不接受字段投影 {projection}（{api_response.status_code}），改为请求完整响应")
+            return await single_flight.get_json(self.login_session, api_url, api_params, api_config, schema=schema)
+
+        if api_response.is_success:
+            projection.check_response(api_response, f"{self.name}.{api_name}")
+
+        return api_result
+
     def _make_api_url(self, api_config: dict, api_name):
-        return api_config.get("url")
+        return self._endpoint(api_name, api_config).url
+    
+    def _render_api_url(self, api_config: dict, api_name: str, **placeholders)->str|None:
+        """以预编译的url模板填充具名占位符，如`placeholder`、`placeholder1`
+        """
+        return self._endpoint(api_name, api_config).render_url(**placeholders)
     
     def _make_api_params(self, api_config: dict, api_name: str):
-        return api_config.get("params")
+        return self._endpoint(api_name, api_config).default_params()
     
     def _make_api_data(self, api_config: dict, api_name: str):
-        return api_config.get("data", {})
+        api_data = self._endpoint(api_name, api_config).default_data()
+        return {} if api_data is None else api_data
     
-    def check_api_method(self, apis_config: dict, method: str)->bool:
-        for value in apis_config.values():
-            if value == method:
-                return True
-            
-            if isinstance(value, dict):
-                return self.check_api_method(value, method)
-            
-        return False
+    def check_api_method(self, api_name: str, api_config: dict|None, method: str)->bool:
+        if api_config is None:
+            return False
+
+        return self._endpoint(api_name, api_config).method == method
+
+    def _endpoint(self, api_name: str, api_config: dict)->APIEndpoint:
+        """接口的预编译结果，`apis_config`由调用方传入时按传入的配置编译
+        """
+        endpoint = api_registry.endpoint(self.name, api_name)
+        if endpoint is not None and endpoint.config is api_config:
+            return endpoint
+
+        endpoint = self._endpoints.get(api_name)
+        if endpoint is None or endpoint.config is not api_config:
+            endpoint = self._endpoints[api_name] = APIEndpoint(self.name, api_name, api_config)
+        return endpoint
+
+class apiPaginator:
+    """分页接口的并发拉取器
+
+    先请求起始页获取`total`，再以有限并发拉取剩余页面，并按页序逐条产出条目，调用方无需等待最后一页即可开始处理。
+
+    Parameters
+    ----------
+    make_fits : Callable[[int, int], APIFitsAsync]
+        以 (页码, 每页数量) 构造单页请求的 APIFits
+    items_key : str
+        响应中条目列表对应的键，如"courses"、"uploads"
+    page_size : int
+        每页请求的条目数量
+    concurrency : int
+        同时请求的页面数量上限
+    start_page : int
+        起始页码
+    max_pages : int | None
+        最多拉取的页数，None 表示拉取至最后一页
+    model : type[ResponseModel] | None
+        条目的模型，如`Course`；页面按模型的 schema 解码并转换为模型，原始响应随之释放。None 表示产出原始条目
+    projection : FieldProjection | None
+        各页请求使用的服务端字段投影，如`Course.projection("courses")`，None 表示请求完整条目
+    """
+    def __init__(self,
+                 make_fits: Callable[[int, int], APIFitsAsync],
+                 items_key: str,
+                 page_size: int = PAGINATION_PAGE_SIZE,
+                 concurrency: int = PAGINATION_CONCURRENCY,
+                 start_page: int = 1,
+                 max_pages: int|None = None,
+                 model: type[ResponseModel]|None = None,
+                 projection: FieldProjection|None = None
+                 ):
+        self.make_fits    = make_fits
+        self.items_key    = items_key
+        self.page_size    = max(1, page_size)
+        self.concurrency  = max(1, concurrency)
+        self.start_page   = start_page
+        self.max_pages    = max_pages
+        self.model        = model
+        self.schema       = model.page_schema(items_key) if model is not None else None
+        self.projection   = projection
+        self.first_response: dict|None = None
+        self.total: int   = 0
+        self.pages: int   = 0
+        self.failed_pages: List[int] = []
+
+    async def _fetch_page(self, page: int, page_size: int)->dict:
+        fits = self.make_fits(page, page_size)
+        if self.schema is not None:
+            fits.response_schemas = dict.fromkeys(fits.apis_name or [], self.schema)
+        if self.projection is not None:
+            fits.field_projections = dict.fromkeys(fits.apis_name or [], self.projection)
+
+        return (await fits.get_api_data())[0]
+
+    async def first_page(self)->dict:
+        """请求起始页并记录`total`与`pages`，重复调用不会重复请求
+
+        Returns
+        -------
+        dict
+            起始页的原始响应，请求失败时为{}
+        """
+        if self.first_response is None:
+            self.first_response = await self._fetch_page(self.start_page, self.page_size)
+            if not self.first_response:
+                self.failed_pages.append(self.start_page)
+
+            self.total = self.first_response.get("total", 0) or 0
+            self.pages = self.first_response.get("pages", 0) or 0
+
+        return self.first_response
+
+    def _remaining_pages(self, first_items: list)->tuple[range, int]:
+        """根据起始页的结果计算剩余页码与每页数量
+        """
+        if self.start_page != 1 or not first_items or len(first_items) >= self.total:
+            return range(0), self.page_size
+
+        # 服务端可能限制单页数量，此时以实际返回的数量重新计算页数
+        page_size = min(self.page_size, len(first_items))
+        last_page = -(-self.total // page_size)
+        if self.max_pages is not None:
+            last_page = min(last_page, self.start_page + self.max_pages - 1)
+
+        return range(self.start_page + 1, last_page + 1), page_size
+
+    def _page_items(self, page_response: dict)->list:
+        page_items: list = page_response.get(self.items_key, []) or []
+        if self.model is None:
+            return page_items
+
+        return self.model.decode_list(page_items)
+
+    async def items(self):
+        """按页序逐条产出条目，剩余页面并发请求
+        """
+        first_response = await self.first_page()
+        first_items: list = first_response.get(self.items_key, []) or []
+        for item in self._page_items(first_response):
+            yield item
+
+        remaining_pages, page_size = self._remaining_pages(first_items)
+        if not remaining_pages:
+            return
+
+        logger.info(f"并发拉取第 {remaining_pages.start}-{remaining_pages.stop - 1} 页，每页 {page_size} 条，并发数 {self.concurrency}")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_page(page: int)->list|None:
+            async with semaphore:
+                page_response = await self._fetch_page(page, page_size)
+
+            return self._page_items(page_response) if page_response else None
+
+        tasks = [asyncio.create_task(fetch_page(page)) for page in remaining_pages]
+        yielded = len(first_items)
+        try:
+            for page, task in zip(remaining_pages, tasks):
+                try:
+                    page_items = await task
+                except Exception as e:
+                    logger.error(f"拉取第 {page} 页时发生错误！{e}")
+                    page_items = None
+
+                if page_items is None:
+                    logger.error(f"第 {page} 页拉取失败，已跳过")
+                    self.failed_pages.append(page)
+                    continue
+
+                yielded += len(page_items)
+                for item in page_items:
+                    yield item
+        finally:
+            # 调用方提前结束迭代时取消尚未完成的请求
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if yielded < self.total:
+            logger.warning(f"分页拉取完成，共 {self.total} 条，实际获取 {yielded} 条")
 
 # --- Course API ---
 class coursesAPIFits(APIFitsAsync):
@@ -421,7 +662,7 @@ class coursesListAPIFits(coursesAPIFits):
         self.show_amount = show_amount
 
     def _make_api_params(self, api_config, api_name: str):
-        api_params: dict = api_config.get("params")
+        api_params: dict = self._endpoint(api_name, api_config).default_params()
 
         # 修改conditions中的keyword参数为搜索关键词
         conditions: dict = api_params.get("conditions")
@@ -443,15 +684,15 @@ class coursePreviewAPIFits(coursesAPIFits):
         if apis_name is None:
             apis_name = ["view", "modules"]
         super().__init__(login_session, apis_name)
+        self.response_schemas = {"modules": Module.page_schema("modules")}
+        self.field_projections = {
+            "view": FieldProjection("name"),
+            "modules": Module.projection("modules")
+        }
         self.course_id = course_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.course_id))
+        return self._render_api_url(api_config, api_name, placeholder=self.course_id)
 
 class courseViewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -462,15 +703,20 @@ class courseViewAPIFits(coursesAPIFits):
         if apis_name is None:
             apis_name = ["activities", "exams", "classrooms", "activities_reads", "homework-completeness", "exam-completeness"]
         super().__init__(login_session, apis_name)
+        self.response_schemas = {
+            "activities": Activity.page_schema("activities"),
+            "exams": Exam.page_schema("exams"),
+            "classrooms": Classroom.page_schema("classrooms")
+        }
+        self.field_projections = {
+            "activities": Activity.projection("activities"),
+            "exams": Exam.projection("exams"),
+            "classrooms": Classroom.projection("classrooms")
+        }
         self.course_id = course_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.course_id))
+        return self._render_api_url(api_config, api_name, placeholder=self.course_id)
 
 class coursewaresViewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -488,19 +734,13 @@ class coursewaresViewAPIFits(coursesAPIFits):
         self.page_size = page_size
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None 
-
         if api_name == "coursewares":
-            return base_api_url.replace("<placeholder>", str(self.course_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.course_id)
 
         return super()._make_api_url(api_config, api_name)
     
     def _make_api_params(self, api_config, api_name):
-        api_params: dict = api_config.get("params")
+        api_params: dict = self._endpoint(api_name, api_config).default_params()
 
         if not api_params:
             logger.error(f"{api_name}参数params缺失！")
@@ -525,17 +765,12 @@ class courseMembersViewAPIFits(coursesAPIFits):
         if apis_name is None:
             apis_name = ["enrollments"]
         super().__init__(login_session, apis_name)
+        self.field_projections = {"enrollments": FieldProjection("user(name),roles", "enrollments")}
         self.course_id = course_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
         if api_name == "enrollments":
-            return base_api_url.replace("<placeholder>", str(self.course_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.course_id)
         
         return super()._make_api_url(api_config, api_name)
 
@@ -549,16 +784,12 @@ class courseRollcallsViewAPIFits(coursesAPIFits):
         if apis_name is None:
             apis_name = ["rollcalls"]
         super().__init__(login_session, apis_name)
+        self.response_schemas = {"rollcalls": Rollcall.page_schema("rollcalls")}
         self.course_id = course_id
         self.student_id = student_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-
-        return base_api_url.replace("<placeholder1>", str(self.course_id)).replace("<placeholder2>", str(self.student_id))
+        return self._render_api_url(api_config, api_name, placeholder1=self.course_id, placeholder2=self.student_id)
 
 # --- Assignment API ---
 class assignmentAPIFits(APIFitsAsync):
@@ -585,12 +816,7 @@ class assignmentPreviewAPIFits(assignmentAPIFits):
         self.activity_id = activity_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.activity_id))
+        return self._render_api_url(api_config, api_name, placeholder=self.activity_id)
 
 
 class assignmentViewAPIFits(assignmentAPIFits):
@@ -605,13 +831,8 @@ class assignmentViewAPIFits(assignmentAPIFits):
         self.activity_id = activity_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
         if api_name == "activity":
-            return base_api_url.replace("<placeholder>", str(self.activity_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.activity_id)
 
         return super()._make_api_url(api_config, api_name)
 
@@ -629,14 +850,8 @@ class assignmentSubmissionListAPIFits(assignmentAPIFits):
         self.student_id = student_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
         if api_name == "submission_list":
-            # return base_api_url.replace("<placeholder1>", str(self.activity_id)).replace("<placeholder2>", str(self.student_id))
-            return base_api_url.replace("<placeholder1>", str(self.activity_id)).replace("<placeholder2>", str(self.student_id))
+            return self._render_api_url(api_config, api_name, placeholder1=self.activity_id, placeholder2=self.student_id)
         return super()._make_api_url(api_config, api_name)
 
 class assignmentTodoListAPIFits(assignmentAPIFits):
@@ -647,6 +862,7 @@ class assignmentTodoListAPIFits(assignmentAPIFits):
         if apis_name is None:
             apis_name = ["todo"]
         super().__init__(login_session, apis_name)
+        self.response_schemas = {"todo": Todo.page_schema("todo_list")}
 
 class assignmentExamViewAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -660,14 +876,8 @@ class assignmentExamViewAPIFits(assignmentAPIFits):
         self.exam_id = exam_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
         if api_name in ["exam", "exam_submission_list", "exam_distribute"]:
-            return base_api_url.replace("<placeholder>", f"{self.exam_id}")
+            return self._render_api_url(api_config, api_name, placeholder=self.exam_id)
 
         return super()._make_api_url(api_config, api_name)
 
@@ -684,14 +894,8 @@ class assignmentExanSubmissionViewAPIFits(assignmentAPIFits):
         self.submission_id = submission_id
 
     def _make_api_url(self, api_config, api_name)->str|None:
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数")
-            return None
-        
         if api_name == "exam_submission":
-            return base_api_url.replace("<placeholder1>", str(self.exam_id)).replace("<placeholder2>", str(self.submission_id))
+            return self._render_api_url(api_config, api_name, placeholder1=self.exam_id, placeholder2=self.submission_id)
         
         return super()._make_api_url(api_config, api_name)
 
@@ -707,13 +911,8 @@ class assignmentClassroomViewAPIFits(assignmentAPIFits):
         self.classroom_id = classroom_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-
         if api_name in ["classroom", "classroom_submissions", "classroom_subject", "classroom_subject_result"]:
-            return base_api_url.replace("<placeholder>", str(self.classroom_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.classroom_id)
         
         return super()._make_api_url(api_config, api_name)
 
@@ -735,19 +934,13 @@ class assignmentSubmitAPIFits(assignmentAPIFits):
         self.uploads = uploads
 
     def _make_api_url(self, api_config, api_name)->str|None:
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺少url！")
-            return None
-        
         if api_name == "submissions":
-            return base_api_url.replace("<placeholder>", str(self.assignment_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.assignment_id)
 
         return super()._make_api_url(api_config, api_name)
     
     def _make_api_data(self, api_config, api_name)->dict|None:
-        default_api_data = api_config.get("data")
+        default_api_data = self._endpoint(api_name, api_config).default_data()
 
         if not default_api_data:
             logger.error(f"{api_name} 缺少data！")
@@ -775,7 +968,7 @@ class assignmentSubmitAPIFits(assignmentAPIFits):
             logger.error(f"{api_name}不存在！")
             return False
             
-        if not self.check_api_method(api_config, "POST"):
+        if not self.check_api_method(api_name, api_config, "POST"):
             logger.error("该方法只适用POST请求！")
             return False
         
@@ -795,8 +988,11 @@ class assignmentSubmitAPIFits(assignmentAPIFits):
             return False
 
         try:
-            response = await self.login_session.post(
-                url=api_url,
+            response = await request_policy.request(
+                self.login_session,
+                "POST",
+                api_url,
+                api_config,
                 json=api_data
             )
 
@@ -841,7 +1037,7 @@ class resourcesListAPIFits(resourcesAPIFits):
         self.file_type = file_type
 
     def _make_api_params(self, api_config: str, api_name: str):
-        api_params: dict = api_config.get("params")
+        api_params: dict = self._endpoint(api_name, api_config).default_params()
 
         if api_params == None:
             logger.error(f"{api_name}缺乏params参数配置！")
@@ -855,6 +1051,102 @@ class resourcesListAPIFits(resourcesAPIFits):
         api_params["page_size"] = self.show_amount
         return api_params
     
+class downloadJournal:
+    """断点续传记录，以 json 形式保存在`<文件名>.part.json`中
+
+    记录下载地址、服务器返回的 ETag/Last-Modified 以及已写入`.part`文件的字节数
+    """
+    PART_SUFFIX    = ".part"
+    JOURNAL_SUFFIX = ".part.json"
+    # 每写入这么多字节记录一次进度
+    SAVE_INTERVAL  = 4 * 1024 * 1024
+
+    def __init__(self,
+                 file_path: Path,
+                 url: str,
+                 etag: str|None = None,
+                 last_modified: str|None = None,
+                 total_size: int = 0,
+                 bytes_written: int = 0):
+        self.file_path     = Path(file_path)
+        self.url           = url
+        self.etag          = etag
+        self.last_modified = last_modified
+        self.total_size    = total_size
+        self.bytes_written = bytes_written
+
+    @property
+    def part_path(self)->Path:
+        return self.file_path.with_name(self.file_path.name + self.PART_SUFFIX)
+
+    @property
+    def journal_path(self)->Path:
+        return self.file_path.with_name(self.file_path.name + self.JOURNAL_SUFFIX)
+
+    @classmethod
+    def find(cls, output_path: Path, url: str)->"downloadJournal|None":
+        """在下载目录中查找指定下载地址的未完成记录
+        """
+        for journal_path in Path(output_path).glob(f"*{cls.JOURNAL_SUFFIX}"):
+            try:
+                with open(journal_path, encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"断点续传记录 {journal_path.name} 读取失败: {e}")
+                continue
+
+            if record.get("url") != url:
+                continue
+
+            file_name = journal_path.name[:-len(cls.JOURNAL_SUFFIX)]
+            return cls(
+                file_path     = journal_path.with_name(file_name),
+                url           = url,
+                etag          = record.get("etag"),
+                last_modified = record.get("last_modified"),
+                total_size    = record.get("total_size", 0),
+                bytes_written = record.get("bytes_written", 0)
+            )
+
+        return None
+
+    def resumable_size(self)->int:
+        """可以直接续传的字节数，以记录值与`.part`文件实际大小中的较小者为准
+        """
+        if not self.part_path.exists():
+            return 0
+
+        return min(self.bytes_written, self.part_path.stat().st_size)
+
+    def save(self):
+        record = {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "total_size": self.total_size,
+            "bytes_written": self.bytes_written
+        }
+        # 先写临时文件再替换，避免中断时留下损坏的记录
+        tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, self.journal_path)
+
+    def update(self, bytes_written: int):
+        self.bytes_written = bytes_written
+        self.save()
+
+    def complete(self):
+        """下载完成，将`.part`文件重命名为目标文件并删除记录
+        """
+        os.replace(self.part_path, self.file_path)
+        self.remove()
+
+    def remove(self, remove_part: bool = False):
+        self.journal_path.unlink(missing_ok=True)
+        if remove_part:
+            self.part_path.unlink(missing_ok=True)
+
 class resourcesDownloadAPIFits(resourcesAPIFits):
     def __init__(self, 
                  login_session, 
@@ -862,6 +1154,8 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
                  resource_id: int|None = None,
                  resources_id: List[int]|None = None,
                  basename: str|None = None,
+                 segments: int = 1,
+                 save_as: str|None = None,
                  apis_name=None
                 ):
         if apis_name is None:
@@ -875,20 +1169,21 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
         self.resource_id = resource_id
         self.resources_id = resources_id
         self.basename = basename
+        self.segments = max(1, segments)
+        # 指定保存的文件名，为 None 时从响应中解析
+        self.save_as = save_as
+        # 最近一次下载的文件名与失败原因，供上层汇总
+        self.filename: str|None = None
+        self.last_error: str|None = None
 
     def _make_api_url(self, api_config, api_name):    
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-
         if api_name == "download": 
-            return base_api_url.replace("<placeholder>", str(self.resource_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.resource_id)
         
         return super()._make_api_url(api_config, api_name)
     
     def _make_api_params(self, api_config, api_name):
-        api_params: dict = api_config.get("params", None)
+        api_params: dict = self._endpoint(api_name, api_config).default_params()
         if not api_params:
             logger.error(f"{api_name}参数url缺失！")
             return None
@@ -899,18 +1194,92 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
         
         return super()._make_api_params(api_config, api_name)
     
+    async def resolve_host(self)->str:
+        """以不跟随重定向的 HEAD 请求获取下载接口重定向到的主机，即实际传输文件的主机
+
+        接口未重定向或请求失败时返回接口自身的主机
+        """
+        if self.apis_name == None or self.apis_config == None:
+            self._load_api_config()
+
+        api_config: dict = self.apis_config.get("download") or {}
+        api_url = self._make_api_url(api_config, "download")
+        if not api_url:
+            return ""
+
+        try:
+            response = await request_policy.request(self.login_session, "HEAD", api_url, api_config, follow_redirects=False)
+        except HTTPError as e:
+            logger.warning(f"获取文件 {self.resource_id} 的下载地址失败: {e}")
+            return httpx.URL(api_url).host
+
+        if response.is_redirect and response.next_request is not None:
+            return response.next_request.url.host
+
+        return httpx.URL(api_url).host
+
+    def _parse_filename(self, response: httpx.Response)->str:
+        """从响应头 Content-Disposition 或 url 中解析文件名，指定了`save_as`时直接使用
+        """
+        if self.save_as:
+            return self.save_as
+
+        filename = None
+        content_disposition = response.headers.get('Content-Disposition')
+        if content_disposition:
+            logger.info(f"获取到'content_disposition': {content_disposition}")
+            fn_match = re.search(r'filename\*\s*=\s*utf-?8''([^;]+)', content_disposition)
+            
+            if fn_match:
+                potential_filename = fn_match.group(1).strip('"')
+                filename = unquote(potential_filename)
+            # 如果没有找到 filename*，再尝试匹配非标准的 filename="..."
+            else:
+                fn_match = re.search(r'filename="?(.+)"', content_disposition)
+                if fn_match:
+                    try:
+                        filename = fn_match.group(1).encode('latin-1').decode('utf-8')
+                    except UnicodeError:
+                        filename = fn_match.group(1) # 如果解码失败，使用原始字符串
+        else:
+            logger.warning("未获取到content_disposition")
+        
+        if not filename:
+            response_url = Path(str(response.url))
+            filename = unquote(response_url.name)
+
+        if not filename:
+            filename = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        if self.basename:
+            filename = f"{self.basename}_{filename}"
+
+        return filename
+
     async def download(self, 
-                 progress_callback: Optional[Callable[[int, int, str], None]] = None
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 probe: bool = True
                  )->bool:
-        
+        """下载单个文件，支持断点续传
+
+        下载过程中数据写入`<文件名>.part`，进度记录在`<文件名>.part.json`中；
+        再次下载同一文件时会以 Range 请求从中断处继续，服务器不支持时回退为完整下载。
+
+        启用分段下载时，首个请求只请求第一个字节（`Range: bytes=0-0`），以此获取文件大小并确认服务器支持 Range；
+        服务器忽略 Range 时直接使用该响应完整下载，文件过小时以`probe=False`重新请求完整下载
+        """
         if self.apis_name == None or self.apis_config == None:
             self._load_api_config()
 
         if not self.output_path.exists():
             Path(self.output_path).mkdir()
 
+        self.filename   = None
+        self.last_error = None
+
         if not self.output_path.is_dir():
             logger.error(f"{self.output_path} 不是一个文件夹路径！")
+            self.last_error = f"{self.output_path} 不是一个文件夹路径"
             return False
 
         api_name = "download"
@@ -921,77 +1290,232 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
         api_url = self._make_api_url(api_config, api_name)
         if not api_url:
             logger.error(f"{api_name}的{api_url}不存在！")
+            self.last_error = f"{api_name} 缺少url"
             return None 
 
+        # 查找未完成的下载记录
+        journal = downloadJournal.find(self.output_path, api_url)
+        resume_from = journal.resumable_size() if journal else 0
+
+        request_headers = {}
+        # 探测请求不会读取完整的响应体
+        probe = probe and self.segments > 1 and resume_from == 0
+        if probe:
+            request_headers["Range"] = "bytes=0-0"
+        elif resume_from > 0:
+            request_headers["Range"] = f"bytes={resume_from}-"
+            # 文件在服务器上发生变化时，服务器会忽略 Range 返回完整文件
+            validator = journal.etag or journal.last_modified
+            if validator:
+                request_headers["If-Range"] = validator
+
         try:
             # 鉴于启用 stream 模式，使用上下文管理器来管理 TCP 连接
-            async with self.login_session.stream("GET", api_url, timeout=20, follow_redirects=True) as response:
+            async with self.login_session.stream("GET", api_url, headers=request_headers, timeout=make_timeout(api_config.get("timeout")), follow_redirects=True) as response:
+                if response.status_code == 416 and journal:
+                    # 记录的进度已超出文件范围，丢弃后重新下载
+                    logger.warning(f"{journal.file_path.name} 的续传范围无效，重新下载")
+                    journal.remove(remove_part=True)
+                    return await self.download(progress_callback)
+
                 response.raise_for_status()
 
-                # 获取文件名
-                filename = None
-                content_disposition = response.headers.get('Content-Disposition')
-                if content_disposition:
-                    logger.info(f"获取到'content_disposition': {content_disposition}")
-                    fn_match = re.search(r'filename\*\s*=\s*utf-?8''([^;]+)', content_disposition)
-                    
-                    if fn_match:
-                        potential_filename = fn_match.group(1).strip('"')
-                        filename = unquote(potential_filename)
-                    # 如果没有找到 filename*，再尝试匹配非标准的 filename="..."
-                    else:
-                        fn_match = re.search(r'filename="?(.+)"', content_disposition)
-                        if fn_match:
-                            try:
-                                filename = fn_match.group(1).encode('latin-1').decode('utf-8')
-                            except UnicodeError:
-                                filename = fn_match.group(1) # 如果解码失败，使用原始字符串
+                if probe and response.status_code == 206:
+                    total_size = content_range_total(response.headers.get("Content-Range"))
+                    if total_size < self.segments * MIN_SEGMENT_SIZE:
+                        # 文件过小时分段的额外请求得不偿失
+                        logger.info(f"文件大小 {total_size} 字节，不分段下载")
+                        await response.aclose()
+                        return await self.download(progress_callback, probe=False)
+
+                    if journal:
+                        journal.remove(remove_part=True)
+
+                    filename = self._parse_filename(response)
+                    logger.info(f"获取到文件名: {filename}")
+                    self.filename = filename
+                    journal = downloadJournal(
+                        file_path     = self.output_path / filename,
+                        url           = api_url,
+                        etag          = response.headers.get("ETag"),
+                        last_modified = response.headers.get("Last-Modified"),
+                        total_size    = total_size
+                    )
+                    journal.save()
+
+                    # 各段直接请求重定向后的地址
+                    segment_url = str(response.url)
+                    await response.aclose()
+                    return await self._segmented_download(segment_url, journal, total_size, progress_callback)
+
+                if probe:
+                    logger.info("服务器不支持 Range 请求，使用单连接下载")
+
+                resumed = response.status_code == 206 and resume_from > 0
+                if resumed:
+                    filename = journal.file_path.name
+                    total_size = resume_from + int(response.headers.get('content-length', 0))
+                    logger.info(f"继续下载文件: {filename}，已下载 {resume_from} 字节")
                 else:
-                    logger.warning("未获取到content_disposition")
-                
-                if not filename:
-                    response_url = Path(str(response.url))
-                    filename = unquote(response_url.name)
-
-                if not filename:
-                    filename = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                if self.basename:
-                    filename = f"{self.basename}_{filename}"
+                    if journal:
+                        logger.info(f"服务器未接受 Range 请求，{journal.file_path.name} 将重新下载")
+                        journal.remove(remove_part=True)
+                        resume_from = 0
+
+                    filename = self._parse_filename(response)
+                    total_size = int(response.headers.get('content-length', 0))
+                    journal = downloadJournal(
+                        file_path     = self.output_path / filename,
+                        url           = api_url,
+                        etag          = response.headers.get("ETag"),
+                        last_modified = response.headers.get("Last-Modified"),
+                        total_size    = total_size
+                    )
+                    journal.save()
 
                 logger.info(f"获取到文件名: {filename}")
+                self.filename = filename
 
-                file_path = self.output_path / filename
-
-                # 获取文件大小
-                total_size = int(response.headers.get('content-length', 0))
-                download_size = 0
+                download_size = resume_from
+                journaled_size = download_size
 
                 logger.info(f"开始下载文件: {filename}")
-                # 分块读取
-                async with aiofiles.open(file_path, 'wb') as f:
-                    async for chunk in response.aiter_bytes(chunk_size=8192):
-                        if chunk:
-                            await f.write(chunk)
-                            download_size += len(chunk)
-
-                            # 如果上层提供了进度回调，则通知状态
-                            if progress_callback:
-                                try:
-                                    progress_callback(download_size, total_size, filename)
-                                except Exception as e:
-                                    logger.warning(f"进度回调函数出错: {e}")
-
+                # 分块读取，续传时先截断到已确认写入的位置再追加
+                if resumed:
+                    os.truncate(journal.part_path, resume_from)
+                async with aiofiles.open(journal.part_path, 'ab' if resumed else 'wb') as f:
+                    try:
+                        async for chunk in response.aiter_bytes(chunk_size=8192):
+                            if chunk:
+                                await f.write(chunk)
+                                download_size += len(chunk)
+
+                                # 定期记录进度，中断后可以从这里继续
+                                if download_size - journaled_size >= downloadJournal.SAVE_INTERVAL:
+                                    await f.flush()
+                                    journal.update(download_size)
+                                    journaled_size = download_size
+
+                                # 如果上层提供了进度回调，则通知状态
+                                if progress_callback:
+                                    try:
+                                        progress_callback(download_size, total_size, filename)
+                                    except Exception as e:
+                                        logger.warning(f"进度回调函数出错: {e}")
+                    finally:
+                        await f.flush()
+                        journal.update(download_size)
+
+                if total_size and download_size != total_size:
+                    logger.error(f"{filename} 下载不完整，已下载 {download_size}/{total_size} 字节")
+                    self.last_error = f"下载不完整 {download_size}/{total_size}"
+                    return False
+
+                journal.complete()
                 logger.info(f"{filename} 下载完成")
                 return True
 
         except HTTPError as e:
             logger.error(f"请求过程中发生 HTTP 错误！错误原因: {e}")
+            self.last_error = f"HTTP 错误: {e}"
             return False
         except Exception as e:
             logger.error(f"请求过程中发生未知错误！错误原因: {e}")
+            self.last_error = f"未知错误: {e}"
             return False
             
+    async def _segmented_download(self,
+                                  url: str,
+                                  journal: "downloadJournal",
+                                  total_size: int,
+                                  progress_callback: Optional[Callable[[int, int, str], None]] = None
+                                  )->bool:
+        """将文件切分为`self.segments`段，并发下载并以定位写入预分配的`.part`文件
+
+        分段写入不连续，因此不记录续传进度，任一段失败时删除`.part`文件与进度记录，下次重新完整下载
+        """
+        filename     = journal.file_path.name
+        segment_size = -(-total_size // self.segments)
+        ranges       = [(start, min(start + segment_size, total_size) - 1) for start in range(0, total_size, segment_size)]
+        downloaded   = [0] * len(ranges)
+
+        logger.info(f"开始分段下载文件: {filename}，共 {len(ranges)} 段")
+
+        try:
+            await self._write_segments(url, journal, total_size, ranges, downloaded, progress_callback)
+        except BaseException:
+            journal.remove(remove_part=True)
+            raise
+
+        part_size = journal.part_path.stat().st_size
+        if part_size != total_size or sum(downloaded) != total_size:
+            logger.error(f"{filename} 分段下载校验失败，文件大小 {part_size}，已下载 {sum(downloaded)}，应为 {total_size}")
+            self.last_error = f"分段下载校验失败 {sum(downloaded)}/{total_size}"
+            journal.remove(remove_part=True)
+            return False
+
+        journal.complete()
+        logger.info(f"{filename} 分段下载完成")
+        return True
+
+    async def _write_segments(self,
+                              url: str,
+                              journal: "downloadJournal",
+                              total_size: int,
+                              ranges: list[tuple[int, int]],
+                              downloaded: list[int],
+                              progress_callback: Optional[Callable[[int, int, str], None]] = None
+                              ):
+        """并发下载各段并写入预分配的`.part`文件，`downloaded`记录各段已下载的字节数
+        """
+        filename = journal.file_path.name
+        timeout  = make_timeout(self.apis_config.get("download", {}).get("timeout"))
+
+        fd = os.open(journal.part_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            # 预分配文件空间，各段直接写入各自的位置
+            try:
+                os.posix_fallocate(fd, 0, total_size)
+            except (AttributeError, OSError):
+                os.ftruncate(fd, total_size)
+
+            async def fetch_segment(index: int, start: int, end: int):
+                headers = {"Range": f"bytes={start}-{end}"}
+                async with self.login_session.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise ValueError(f"第 {index + 1} 段请求未返回部分内容，状态码 {response.status_code}")
+
+                    offset = start
+                    async for chunk in response.aiter_bytes(chunk_size=65536):
+                        if offset + len(chunk) > end + 1:
+                            raise ValueError(f"第 {index + 1} 段返回的数据超出请求范围")
+
+                        positioned_write(fd, chunk, offset)
+                        offset += len(chunk)
+                        downloaded[index] = offset - start
+
+                        if progress_callback:
+                            try:
+                                progress_callback(sum(downloaded), total_size, filename)
+                            except Exception as e:
+                                logger.warning(f"进度回调函数出错: {e}")
+
+                if offset != end + 1:
+                    raise ValueError(f"第 {index + 1} 段不完整，已下载 {offset - start}/{end + 1 - start} 字节")
+
+            tasks = [asyncio.ensure_future(fetch_segment(index, start, end)) for index, (start, end) in enumerate(ranges)]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # 任一段失败时取消其他分段，确保关闭文件前不再有写入
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        finally:
+            os.close(fd)
+
     async def batch_download(self,
                        progress_callback: Optional[Callable[[int, int, str], None]]|None = None
                        )->bool:
@@ -1023,7 +1547,7 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
             logger.error(f"{api_name}缺少 params 参数！")
 
         try:
-            async with self.login_session.stream("GET", api_url, timeout=20, follow_redirects=True) as response:
+            async with self.login_session.stream("GET", api_url, timeout=make_timeout(api_config.get("timeout")), follow_redirects=True) as response:
                 response.raise_for_status()
 
                 # 获取文件名
@@ -1081,6 +1605,117 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
             logger.error(f"请求过程中发生未知错误！错误原因: {e}")
             return False
 
+class downloadResult:
+    """单个文件的下载结果"""
+    def __init__(self, resource_id: int, success: bool, filename: str|None = None, error: str|None = None):
+        self.resource_id = resource_id
+        self.success     = success
+        self.filename    = filename
+        self.error       = error
+
+class resourcesDownloadScheduler:
+    """多文件并发下载调度器
+
+    同时进行的下载数不超过`concurrency`。设置了`per_host_limit`时，来自同一文件服务器（下载接口重定向到的主机）
+    的下载数也不超过该值：每个文件先以 HEAD 请求获取主机，等到该主机的名额后再占用全局名额，
+    等待繁忙主机的文件不会占住其他主机可用的全局名额。
+    单个文件的失败不会中断其他文件的下载，失败原因记录在返回的`downloadResult`中。
+    """
+    def __init__(self,
+                 login_session: httpx.AsyncClient,
+                 output_path: Path,
+                 concurrency: int = 4,
+                 per_host_limit: int|None = None,
+                 basename: str|None = None,
+                 segments: int = 1
+                 ):
+        self.login_session  = login_session
+        self.output_path    = output_path
+        self.concurrency    = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit) if per_host_limit else None
+        self.basename       = basename
+        self.segments       = segments
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def _host_slot(self, downloader: resourcesDownloadAPIFits):
+        """占用文件所在主机的下载名额，未设置`per_host_limit`时不限制，也不发起 HEAD 请求"""
+        if self.per_host_limit is None:
+            yield
+            return
+
+        # 下载接口会重定向至文件存储服务器，按实际传输数据的主机限制并发
+        host = await downloader.resolve_host()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+
+        async with self._host_semaphores[host]:
+            yield
+
+    async def download(self,
+                       resources_id: List[int],
+                       progress_callback: Optional[Callable[[int, int, int, str], None]] = None,
+                       done_callback: Optional[Callable[[downloadResult], None]] = None,
+                       output_paths: dict[int, Path]|None = None,
+                       save_as: dict[int, str]|None = None
+                       )->List[downloadResult]:
+        """并发下载多个文件
+
+        Parameters
+        ----------
+        resources_id : List[int]
+            需下载文件的id
+        progress_callback : Callable[[int, int, int, str], None], optional
+            进度回调，参数依次为文件id、已下载字节数、总字节数、文件名
+        done_callback : Callable[[downloadResult], None], optional
+            单个文件下载结束（无论成败）时的回调
+        output_paths : dict[int, Path], optional
+            为指定文件单独设置下载目录，未设置的文件下载至`self.output_path`
+        save_as : dict[int, str], optional
+            为指定文件设置保存的文件名，未设置的文件使用服务器返回的文件名
+
+        Returns
+        -------
+        List[downloadResult]
+            与`resources_id`顺序一致的下载结果
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def download_one(resource_id: int)->downloadResult:
+            output_path = (output_paths or {}).get(resource_id, self.output_path)
+            downloader = resourcesDownloadAPIFits(
+                self.login_session,
+                output_path=output_path,
+                resource_id=resource_id,
+                basename=self.basename,
+                segments=self.segments,
+                save_as=(save_as or {}).get(resource_id)
+            )
+
+            def sub_progress_callback(downloaded: int, total_size: int, filename: str):
+                progress_callback(resource_id, downloaded, total_size, filename)
+
+            try:
+                async with self._host_slot(downloader), semaphore:
+                    success = await downloader.download(sub_progress_callback if progress_callback else None)
+            except Exception as e:
+                logger.error(f"下载文件 {resource_id} 时发生错误！{e}")
+                downloader.last_error = f"{e}"
+                success = False
+
+            result = downloadResult(resource_id, bool(success), downloader.filename, downloader.last_error)
+            if done_callback:
+                try:
+                    done_callback(result)
+                except Exception as e:
+                    logger.warning(f"下载完成回调函数出错: {e}")
+
+            return result
+
+        results = await asyncio.gather(*(download_one(resource_id) for resource_id in resources_id))
+        logger.info(f"并发下载结束，成功 {sum(result.success for result in results)} 个，失败 {sum(not result.success for result in results)} 个")
+        return list(results)
+
 class resourcesRemoveAPIFits(resourcesAPIFits):
     def __init__(self, 
                  login_session,
@@ -1095,7 +1730,7 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
         self.resources_id = resources_id
 
     def _make_api_params(self, api_config, api_name):
-        api_params = api_config.get("params")
+        api_params = self._endpoint(api_name, api_config).default_params()
 
         if api_params == None:
             logger.error(f"{api_name}缺乏params参数配置！")
@@ -1108,12 +1743,8 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
 
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url = api_config.get("url")
-        if base_api_url == None:
-            logger.error(f"{api_name}参数url缺失！")
-            return None 
         if api_name == "remove":
-            return base_api_url.replace("<placeholder>", str(self.resource_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.resource_id)
         return super()._make_api_url(api_config, api_name)
 
     async def delete(self)->bool:
@@ -1123,7 +1754,7 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
         api_name = "remove"
         api_config: dict = self.apis_config.get(api_name, None)
 
-        if not self.check_api_method(api_config, "DELETE"):
+        if not self.check_api_method(api_name, api_config, "DELETE"):
             logger.error("该方法只适用DELET请求！")
             raise RuntimeError
 
@@ -1137,7 +1768,7 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
             return False
         
         try:
-            api_respone = await self.login_session.delete(url=api_url, follow_redirects=True)
+            api_respone = await request_policy.request(self.login_session, "DELETE", api_url, api_config, follow_redirects=True)
             api_respone.raise_for_status()
             logger.info("删除成功")
             return True
@@ -1159,7 +1790,7 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
         api_name = "batch_remove"
         api_config: dict = self.apis_config.get(api_name, None)
 
-        if not self.check_api_method(api_config, "DELETE"):
+        if not self.check_api_method(api_name, api_config, "DELETE"):
             logger.error("该方法只适用DELET请求！")
             raise RuntimeError
         
@@ -1175,7 +1806,7 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
         api_params = self._make_api_params(api_config, api_name)
         
         try:
-            api_respone = await self.login_session.delete(url=api_url, json=api_params, follow_redirects=True)
+            api_respone = await request_policy.request(self.login_session, "DELETE", api_url, api_config, json=api_params, follow_redirects=True)
             api_respone.raise_for_status()
             logger.info("删除成功")
             return True
@@ -1231,13 +1862,17 @@ class resourceUploadAPIFits(resourcesAPIFits):
         upload_data    = self._make_api_data(api_config, api_name)
 
         logger.info(f"请求上传文件 {self.file_name} 中...")
-        progress_callback(0, self.file_size, self.file_name)
+        if progress_callback:
+            progress_callback(0, self.file_size, self.file_name)
 
         # --- 申请阶段 ---
         # POST文件上传请求，以获得文件上传的实际位置
         try:
-            upload_response = await self.login_session.post(
-                url     = api_url,
+            upload_response = await request_policy.request(
+                self.login_session,
+                "POST",
+                api_url,
+                api_config,
                 json    = upload_data,
                 headers = self.upload_headers,
                 follow_redirects=True
@@ -1256,22 +1891,23 @@ class resourceUploadAPIFits(resourcesAPIFits):
 
         try:
             with open(self.file_path, 'rb') as f:
-                # # 适配上层需求文件名
-                # def sub_progress_callback(uploaded: int, total: int):
-                #     progress_callback(uploaded, total, self.file_name)
+                # 适配上层需求文件名
+                def sub_progress_callback(uploaded: int, total: int):
+                    progress_callback(uploaded, total, self.file_name)
                
-                # 包装文件
-                # uploader = fileUploadProgressWrapper(f, sub_progress_callback)
-                file_bytes = f.read()
+                # 包装文件，httpx 会按块读取，不会将整个文件载入内存
+                uploader = fileUploadProgressWrapper(f, sub_progress_callback if progress_callback else None)
 
                 # 构建payload
                 file_payload = {
-                    "file": (self.file_name, file_bytes, file_mimetype)
+                    "file": (self.file_name, uploader, file_mimetype)
                 }
 
+                # 文件上传不重试，仅使用接口配置的超时
                 response = await self.login_session.put(
                     url = upload_url,
                     files = file_payload,
+                    timeout = make_timeout(api_config.get("timeout")),
                     follow_redirects=True
                 )
             logger.info(f"{response.cookies}")
@@ -1280,12 +1916,13 @@ class resourceUploadAPIFits(resourcesAPIFits):
             logger.error(f"向服务器上传文件 {self.file_name} 时候发生错误！{e}")
             return False
         
-        progress_callback(self.file_size, self.file_size, self.file_name)
+        if progress_callback:
+            progress_callback(self.file_size, self.file_size, self.file_name)
         logger.info(f"文件 {self.file_name} 上传成功！")
         return True
 
     def _make_api_data(self, api_config, api_name):
-        api_data = api_config.get("params", {})
+        api_data = self._endpoint(api_name, api_config).default_params() or {}
 
         if api_name == "upload":
             api_data["name"] = self.file_name
@@ -1364,6 +2001,7 @@ class rollcallListAPIFits(rollcallAPIFits):
         if apis_name is None:
             apis_name = ["rollcall"]
         super().__init__(login_session, apis_name)
+        self.response_schemas = {"rollcall": Rollcall.page_schema("rollcalls")}
 
 class rollcallAnswerRadarAPIFits(rollcallAPIFits):
     def __init__(self, 
@@ -1377,13 +2015,8 @@ class rollcallAnswerRadarAPIFits(rollcallAPIFits):
         self.rollcall_id = rollcall_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
         if api_name == "answer_radar":
-            return base_api_url.replace("<placeholder>", str(self.rollcall_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.rollcall_id)
         
         return super()._make_api_url(api_config, api_name)
 
@@ -1400,11 +2033,6 @@ class rollcallAnswerNumberAPIFits(rollcallAPIFits):
         self.rollcall_id = rollcall_id
 
     def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
         if api_name == "answer_number":
-            return base_api_url.replace("<placeholder>", str(self.rollcall_id))
+            return self._render_api_url(api_config, api_name, placeholder=self.rollcall_id)
         return None
\ No newline at end of file